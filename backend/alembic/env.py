@@ -14,12 +14,14 @@ from sqlalchemy import pool
 from pathlib import Path
 
 from alembic import context
+from app.core.config import DATABASE_URL
 from app.core.db import Base
 # 👇 IMPORT ALL MODELS HERE (NOT in db.py)
 from app.procurement.models.purchase_order import PurchaseOrder
 from app.procurement.models.purchase_order_line import PurchaseOrderLine
 from app.contractors import models as contractor_models
 from app.procurement.models.item import Item
+from app.procurement.models.po_line_balance import POLineBalance
 
 from app.quality.models.material_receipt import MaterialReceipt, MaterialReceiptLine
 from app.quality.models.inspection import QualityInspection, QualityInspectionLine
@@ -37,6 +39,9 @@ from app.store.models.inventory_transaction import InventoryTransaction
 # access to the values within the .ini file in use.
 config = context.config
 
+# The application DATABASE_URL wins over the placeholder in alembic.ini
+config.set_main_option("sqlalchemy.url", DATABASE_URL)
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
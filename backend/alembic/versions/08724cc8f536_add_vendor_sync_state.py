@@ -0,0 +1,34 @@
+"""add_vendor_sync_state
+
+Revision ID: 08724cc8f536
+Revises: 5b3da81a59fa
+Create Date: 2026-10-18 15:21:09.448512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '08724cc8f536'
+down_revision: Union[str, Sequence[str], None] = '5b3da81a59fa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Empty until the next sync completes, so that sync re-reads every vendor
+    op.create_table('vendor_sync_state',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('watermark', sa.DateTime(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('vendor_sync_state')
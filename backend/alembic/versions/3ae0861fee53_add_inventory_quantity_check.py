@@ -0,0 +1,40 @@
+"""add_inventory_quantity_check
+
+Revision ID: 3ae0861fee53
+Revises: 7ed74b6951e6
+Create Date: 2026-10-18 13:05:41.220318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3ae0861fee53'
+down_revision: Union[str, Sequence[str], None] = '7ed74b6951e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    negative = op.get_bind().execute(
+        sa.text("SELECT COUNT(*) FROM inventory_items WHERE quantity < 0")
+    ).scalar()
+    if negative:
+        raise RuntimeError(
+            f"{negative} inventory_items rows have negative quantity; "
+            "correct them before adding ck_inventory_quantity_non_negative"
+        )
+
+    # batch mode: SQLite can only add constraints by recreating the table
+    with op.batch_alter_table('inventory_items') as batch_op:
+        batch_op.create_check_constraint('ck_inventory_quantity_non_negative', 'quantity >= 0')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('inventory_items') as batch_op:
+        batch_op.drop_constraint('ck_inventory_quantity_non_negative', type_='check')
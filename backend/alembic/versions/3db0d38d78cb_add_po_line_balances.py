@@ -0,0 +1,88 @@
+"""add_po_line_balances
+
+Revision ID: 3db0d38d78cb
+Revises: ec46da8b0da4
+Create Date: 2026-10-18 10:12:44.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3db0d38d78cb'
+down_revision: Union[str, Sequence[str], None] = 'ec46da8b0da4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('po_line_balances',
+    sa.Column('po_line_id', sa.Integer(), nullable=False),
+    sa.Column('po_id', sa.Integer(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('ordered_qty', sa.Integer(), nullable=False),
+    sa.Column('received_qty', sa.Integer(), nullable=False),
+    sa.Column('accepted_qty', sa.Integer(), nullable=False),
+    sa.Column('rejected_qty', sa.Integer(), nullable=False),
+    sa.Column('gate_passed_qty', sa.Integer(), nullable=False),
+    sa.Column('dispatched_qty', sa.Numeric(precision=12, scale=3), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['po_line_id'], ['purchase_order_lines.id'], ),
+    sa.PrimaryKeyConstraint('po_line_id')
+    )
+    op.create_index(op.f('ix_po_line_balances_po_id'), 'po_line_balances', ['po_id'], unique=False)
+
+    # Backfill from the existing documents (same rules as POLineLedger.compute)
+    op.execute("""
+        INSERT INTO po_line_balances (
+            po_line_id, po_id, item_id, ordered_qty, received_qty, accepted_qty,
+            rejected_qty, gate_passed_qty, dispatched_qty, updated_at
+        )
+        SELECT
+            l.id, l.po_id, l.item_id, l.quantity,
+            COALESCE((
+                SELECT SUM(mrl.received_quantity)
+                FROM material_receipt_lines mrl
+                JOIN material_receipts mr ON mr.id = mrl.mr_id
+                WHERE mrl.po_line_id = l.id
+            ), 0),
+            COALESCE((
+                SELECT SUM(qil.accepted_quantity)
+                FROM quality_inspection_lines qil
+                JOIN material_receipt_lines mrl ON mrl.id = qil.mr_line_id
+                WHERE mrl.po_line_id = l.id
+            ), 0),
+            COALESCE((
+                SELECT SUM(qil.rejected_quantity)
+                FROM quality_inspection_lines qil
+                JOIN material_receipt_lines mrl ON mrl.id = qil.mr_line_id
+                WHERE mrl.po_line_id = l.id
+            ), 0),
+            COALESCE((
+                SELECT SUM(gpi.accepted_quantity)
+                FROM gate_pass_items gpi
+                JOIN gate_passes gp ON gp.id = gpi.gate_pass_id
+                WHERE gp.po_id = l.po_id AND gpi.item_id = l.item_id
+            ), 0),
+            COALESCE((
+                SELECT SUM(dli.quantity_dispatched)
+                FROM material_dispatch_line_items dli
+                JOIN material_dispatches d ON d.id = dli.dispatch_id
+                WHERE d.reference_type = 'PO'
+                  AND d.dispatch_status = 'DISPATCHED'
+                  AND d.reference_id = CAST(l.po_id AS VARCHAR(50))
+                  AND dli.item_id = l.item_id
+            ), 0),
+            CURRENT_TIMESTAMP
+        FROM purchase_order_lines l
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_po_line_balances_po_id'), table_name='po_line_balances')
+    op.drop_table('po_line_balances')
@@ -0,0 +1,41 @@
+"""add_vendors_mirror
+
+Revision ID: 5b3da81a59fa
+Revises: 3ae0861fee53
+Create Date: 2026-10-18 15:02:37.184206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b3da81a59fa'
+down_revision: Union[str, Sequence[str], None] = '3ae0861fee53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled by python -m app.procurement.sync_vendors --full
+    op.create_table('vendors',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('contact', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('portal_updated_at', sa.DateTime(), nullable=True),
+    sa.Column('synced_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vendors_name'), 'vendors', ['name'], unique=False)
+    op.create_index(op.f('ix_vendors_portal_updated_at'), 'vendors', ['portal_updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_vendors_portal_updated_at'), table_name='vendors')
+    op.drop_index(op.f('ix_vendors_name'), table_name='vendors')
+    op.drop_table('vendors')
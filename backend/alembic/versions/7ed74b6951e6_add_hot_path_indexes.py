@@ -0,0 +1,62 @@
+"""add_hot_path_indexes
+
+Revision ID: 7ed74b6951e6
+Revises: 3db0d38d78cb
+Create Date: 2026-10-18 11:40:02.914377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7ed74b6951e6'
+down_revision: Union[str, Sequence[str], None] = '3db0d38d78cb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Store gate-pass screens: status filter + issued_at ordering, MR join by store
+    op.create_index('idx_gate_pass_status_issued', 'gate_passes', ['store_status', 'issued_at'], unique=False)
+    op.drop_index('idx_gate_pass_store_status', table_name='gate_passes')
+    op.create_index('idx_gate_pass_mr', 'gate_passes', ['mr_id'], unique=False)
+    op.create_index('idx_gate_pass_po', 'gate_passes', ['po_id'], unique=False)
+    op.create_index(op.f('ix_material_receipts_store_id'), 'material_receipts', ['store_id'], unique=False)
+
+    # Child-table foreign keys
+    op.create_index(op.f('ix_material_receipt_lines_mr_id'), 'material_receipt_lines', ['mr_id'], unique=False)
+    op.create_index(op.f('ix_material_receipt_lines_po_line_id'), 'material_receipt_lines', ['po_line_id'], unique=False)
+    op.create_index(op.f('ix_gate_pass_items_gate_pass_id'), 'gate_pass_items', ['gate_pass_id'], unique=False)
+    op.create_index(op.f('ix_quality_inspection_lines_inspection_id'), 'quality_inspection_lines', ['inspection_id'], unique=False)
+    op.create_index(op.f('ix_quality_inspection_lines_mr_line_id'), 'quality_inspection_lines', ['mr_line_id'], unique=False)
+    op.create_index(op.f('ix_material_dispatch_line_items_dispatch_id'), 'material_dispatch_line_items', ['dispatch_id'], unique=False)
+    op.create_index(op.f('ix_inventory_transactions_inventory_item_id'), 'inventory_transactions', ['inventory_item_id'], unique=False)
+
+    # Dispatches by reference (PO pending quantities, ledger rebuild)
+    op.create_index('idx_dispatch_reference', 'material_dispatches', ['reference_type', 'reference_id', 'dispatch_status'], unique=False)
+
+    # Inventory listings by store/bin; (item_id, store_id, bin_id) lookups
+    # already use the prefix of uq_inventory_gate_pass
+    op.create_index('idx_inventory_store_bin', 'inventory_items', ['store_id', 'bin_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_inventory_store_bin', table_name='inventory_items')
+    op.drop_index('idx_dispatch_reference', table_name='material_dispatches')
+    op.drop_index(op.f('ix_inventory_transactions_inventory_item_id'), table_name='inventory_transactions')
+    op.drop_index(op.f('ix_material_dispatch_line_items_dispatch_id'), table_name='material_dispatch_line_items')
+    op.drop_index(op.f('ix_quality_inspection_lines_mr_line_id'), table_name='quality_inspection_lines')
+    op.drop_index(op.f('ix_quality_inspection_lines_inspection_id'), table_name='quality_inspection_lines')
+    op.drop_index(op.f('ix_gate_pass_items_gate_pass_id'), table_name='gate_pass_items')
+    op.drop_index(op.f('ix_material_receipt_lines_po_line_id'), table_name='material_receipt_lines')
+    op.drop_index(op.f('ix_material_receipt_lines_mr_id'), table_name='material_receipt_lines')
+    op.drop_index(op.f('ix_material_receipts_store_id'), table_name='material_receipts')
+    op.drop_index('idx_gate_pass_po', table_name='gate_passes')
+    op.drop_index('idx_gate_pass_mr', table_name='gate_passes')
+    op.create_index('idx_gate_pass_store_status', 'gate_passes', ['store_status'], unique=False)
+    op.drop_index('idx_gate_pass_status_issued', table_name='gate_passes')
@@ -0,0 +1,32 @@
+"""add_list_order_indexes
+
+Revision ID: a41c6e2d9b07
+Revises: 08724cc8f536
+Create Date: 2026-10-18 16:02:44.517302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c6e2d9b07'
+down_revision: Union[str, Sequence[str], None] = '08724cc8f536'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset-ordered lists (found by tests/test_query_plans.py): without
+    # these every page read and sorted the whole table
+    op.create_index('idx_po_created', 'purchase_orders', ['created_at', 'id'], unique=False)
+    op.create_index('idx_dispatch_active_created', 'material_dispatches', ['is_active', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_dispatch_active_created', table_name='material_dispatches')
+    op.drop_index('idx_po_created', table_name='purchase_orders')
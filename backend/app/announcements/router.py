@@ -1,15 +1,29 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.db import get_db
+from app.core.db import get_async_read_db, get_db
 from app.announcements import schemas, service
+from app.utils.pagination import CountMode, set_page_headers
 
 router = APIRouter(tags=["Announcements"])
 
 
 @router.get("/events", response_model=list[schemas.EventOut])
-def get_events(db: Session = Depends(get_db)):
-    return service.get_events(db)
+async def get_events(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    count: CountMode = Query(CountMode.NONE, description="Report total in X-Total-Count"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    try:
+        page = await db.run_sync(service.get_events, cursor=cursor, limit=limit, count_mode=count)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    set_page_headers(response, page)
+    return page["items"]
 
 
 @router.post("/events", response_model=schemas.EventOut)
@@ -27,8 +41,8 @@ def delete_event(event_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/trainings", response_model=list[schemas.TrainingOut])
-def get_trainings(db: Session = Depends(get_db)):
-    return service.get_trainings(db)
+async def get_trainings(db: AsyncSession = Depends(get_async_read_db)):
+    return await db.run_sync(service.get_trainings)
 
 
 @router.post("/trainings", response_model=schemas.TrainingOut)
@@ -45,8 +59,8 @@ def delete_training(training_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/meetings", response_model=list[schemas.MeetingOut])
-def get_meetings(db: Session = Depends(get_db)):
-    return service.get_meetings(db)
+async def get_meetings(db: AsyncSession = Depends(get_async_read_db)):
+    return await db.run_sync(service.get_meetings)
 
 
 @router.post("/meetings", response_model=schemas.MeetingOut)
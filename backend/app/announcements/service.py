@@ -7,14 +7,15 @@ from app.announcements.schemas import (
     TrainingIn, TrainingUpdate,
     MeetingIn, MeetingUpdate
 )
+from app.utils.pagination import CountMode, paginate
 
 # ===================== EVENTS =====================
 
-def get_events(db: Session):
-    return db.query(Event)\
-        .filter(~Event.description.like("[DELETED]%"))\
-        .order_by(Event.event_date.desc())\
-        .all()
+def get_events(db: Session, cursor: str | None = None, limit: int = 100,
+               count_mode: CountMode = CountMode.NONE):
+    # event_date is nullable, so page newest-created first by id alone
+    query = db.query(Event).filter(~Event.description.like("[DELETED]%"))
+    return paginate(query, None, Event.id, cursor=cursor, limit=limit, count_mode=count_mode)
 
 
 
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ..services.attendance_service import AttendanceService
 from ..schemas.attendance import (
@@ -8,7 +9,7 @@ from ..schemas.attendance import (
     TodayAttendanceResponse,
     AttendanceHistoryResponse
 )
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db, get_read_db
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,7 +21,6 @@ def check_in(
     db: Session = Depends(get_db)
 ):
     """Check in user for today."""
-    print(f"[CONTROLLER HIT] Check-in endpoint called for user {request.user_id}")
     logger.info(f"[API] Check-in request for user {request.user_id}")
     
     try:
@@ -56,9 +56,9 @@ def check_out(
 
 
 @router.get("/today/{user_id}", response_model=TodayAttendanceResponse)
-def get_today_attendance(
+async def get_today_attendance(
     user_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get today's attendance summary for user."""
     logger.info(f"[API] Today attendance request for user {user_id}")
@@ -67,7 +67,7 @@ def get_today_attendance(
         if user_id <= 0:
             raise HTTPException(status_code=400, detail="User ID must be positive")
         
-        summary = AttendanceService.get_today_attendance(db, user_id)
+        summary = await db.run_sync(AttendanceService.get_today_attendance, user_id)
         logger.info(f"[API] Today attendance retrieved for user {user_id}")
         return summary
     except HTTPException:
@@ -81,7 +81,7 @@ def get_today_attendance(
 def get_attendance_history(
     user_id: int,
     limit: int = 30,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get attendance history for user."""
     logger.info(f"[API] History request for user {user_id}, limit {limit}")
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime, date
 from ..models.attendance import Attendance, AttendanceStatus
 from ..schemas.attendance import CheckInRequest, CheckOutRequest
+from app.core.transactions import transactional_retry
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,6 +12,7 @@ class AttendanceService:
     """Service for handling attendance operations."""
     
     @staticmethod
+    @transactional_retry("check_in")
     def check_in(db: Session, user_id: int) -> Attendance:
         """
         Check in user for today.
@@ -50,6 +52,7 @@ class AttendanceService:
         return attendance
     
     @staticmethod
+    @transactional_retry("check_out")
     def check_out(db: Session, user_id: int) -> Attendance:
         """
         Check out user for today.
@@ -100,7 +103,8 @@ class AttendanceService:
     def get_today_attendance(db: Session, user_id: int) -> dict:
         """Get today's attendance summary for user."""
         logger.info(f"[TODAY] Fetching today's attendance for user {user_id}")
-        AttendanceService.auto_close_previous_attendance(db, user_id)
+        if AttendanceService.auto_close_previous_attendance(db, user_id):
+            db.commit()
 
         
         today = datetime.utcnow().date().isoformat()
@@ -155,10 +159,14 @@ class AttendanceService:
         }
 
     @staticmethod
-    def auto_close_previous_attendance(db: Session, user_id: int):
+    def auto_close_previous_attendance(db: Session, user_id: int) -> int:
         """
         Auto-checkout any IN_PROGRESS attendance from previous days.
-        Called before any attendance operation.
+        Called before any attendance operation; only flushes, so check-in
+        and check-out still commit once, at the end of their unit of work.
+
+        Returns:
+            Number of records closed
         """
         today = datetime.utcnow().date()
 
@@ -184,4 +192,5 @@ class AttendanceService:
             record.status = AttendanceStatus.COMPLETED
 
         if open_records:
-            db.commit()
+            db.flush()
+        return len(open_records)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
-from app.core.db import get_db
+from app.core.db import get_db, get_read_db
 from app.contractors.models import Contractor
 from app.contractors.schemas import ContractorCreate, ContractorOut, ContractorUpdate
+from app.utils.pagination import CountMode, paginate, set_page_headers
 
 
 router = APIRouter(
@@ -13,11 +14,30 @@ router = APIRouter(
 
 
 @router.get("/", response_model=list[ContractorOut])
-def list_contractors(db: Session = Depends(get_db)):
-    return db.query(Contractor).all()
+def list_contractors(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    count: CountMode = Query(CountMode.NONE, description="Report total in X-Total-Count"),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        page = paginate(
+            db.query(Contractor),
+            None,
+            Contractor.id,
+            cursor=cursor,
+            limit=limit,
+            count_mode=count,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    set_page_headers(response, page)
+    return page["items"]
 
 @router.get("/{contractor_id}", response_model=ContractorOut)
-def get_contractor(contractor_id: int, db: Session = Depends(get_db)):
+def get_contractor(contractor_id: int, db: Session = Depends(get_read_db)):
     contractor = db.query(Contractor).filter(Contractor.id == contractor_id).first()
     if not contractor:
         raise HTTPException(status_code=404, detail="Contractor not found")
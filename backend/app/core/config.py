@@ -1,3 +1,89 @@
 import os
+from pathlib import Path
 
 DEBUG = os.getenv("DEBUG", "true").lower() == "true"
+
+# PROJECT ROOT → backend/
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+# Database
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR / 'app.db'}")
+
+# Optional read replica for GET endpoints (falls back to the primary when unset)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL", "")
+# Default replica lag tolerance in seconds; unset means "do not check"
+_replica_max_lag = os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "")
+DB_REPLICA_MAX_LAG_SECONDS = float(_replica_max_lag) if _replica_max_lag else None
+
+# Connection pool (PostgreSQL / server databases)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+
+# SQLite tuning (applied as PRAGMAs on every new connection)
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Item master cache (process-local, read-through)
+ITEM_CACHE_TTL_SECONDS = int(os.getenv("ITEM_CACHE_TTL_SECONDS", "300"))
+
+# Bulk purchase-order import
+PO_BULK_IMPORT_CHUNK_SIZE = int(os.getenv("PO_BULK_IMPORT_CHUNK_SIZE", "500"))
+# Uploads larger than this spill from memory to a temporary file
+PO_BULK_IMPORT_SPOOL_BYTES = int(os.getenv("PO_BULK_IMPORT_SPOOL_BYTES", str(8 * 1024 * 1024)))
+
+# Transient lock / serialization errors (SQLite busy, PG 40001/40P01/55P03)
+DB_RETRY_ATTEMPTS = int(os.getenv("DB_RETRY_ATTEMPTS", "3"))
+DB_RETRY_BASE_DELAY_MS = int(os.getenv("DB_RETRY_BASE_DELAY_MS", "50"))
+DB_RETRY_MAX_DELAY_MS = int(os.getenv("DB_RETRY_MAX_DELAY_MS", "1000"))
+
+# Per-request SQL instrumentation: Server-Timing header + N+1 warnings
+SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "true").lower() == "true"
+# Warn when one statement fingerprint runs more than this many times per request
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "10"))
+
+# Logging: queue-backed handler writing JSON (or text) lines to stdout
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+# Per-logger sampling of INFO/DEBUG records, e.g. "app.access=0.1,app.store=0.5"
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")
+
+# On-demand request profiling (app/diagnostics/profiler.py)
+# Requests sending X-Profile-Token: <token> are profiled; empty disables it
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+# Fraction of all requests profiled automatically (0 = only on demand)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", str(BASE_DIR / "profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+# speedscope (JSON for https://www.speedscope.app) or collapsed (flamegraph.pl)
+PROFILE_FORMAT = os.getenv("PROFILE_FORMAT", "speedscope").lower()
+
+# Vendor portal client (app/procurement/services/vendor_client.py)
+VENDOR_PORTAL_URL = os.getenv("VENDOR_PORTAL_URL", "http://localhost:9000/api/vendors")
+VENDOR_PORTAL_TIMEOUT_SECONDS = float(os.getenv("VENDOR_PORTAL_TIMEOUT_SECONDS", "2"))
+VENDOR_PORTAL_MAX_CONNECTIONS = int(os.getenv("VENDOR_PORTAL_MAX_CONNECTIONS", "20"))
+# Fresh for TTL, then served stale (and refreshed in the background) for STALE more seconds
+VENDOR_CACHE_TTL_SECONDS = int(os.getenv("VENDOR_CACHE_TTL_SECONDS", "300"))
+VENDOR_CACHE_STALE_SECONDS = int(os.getenv("VENDOR_CACHE_STALE_SECONDS", "3600"))
+# Vendors kept per worker; least recently used are evicted first
+VENDOR_CACHE_MAX_ENTRIES = int(os.getenv("VENDOR_CACHE_MAX_ENTRIES", "10000"))
+# How long a 404 from the portal is remembered
+VENDOR_NEGATIVE_CACHE_SECONDS = int(os.getenv("VENDOR_NEGATIVE_CACHE_SECONDS", "60"))
+# Consecutive failures that open the circuit, and how long it stays open
+VENDOR_BREAKER_FAILURES = int(os.getenv("VENDOR_BREAKER_FAILURES", "5"))
+VENDOR_BREAKER_RESET_SECONDS = float(os.getenv("VENDOR_BREAKER_RESET_SECONDS", "30"))
+
+# Vendor master mirror (vendors table), synced from VENDOR_PORTAL_URL
+# Seconds between incremental syncs in each app worker; 0 (default) disables them:
+# run python -m app.procurement.sync_vendors from cron on one host instead
+VENDOR_SYNC_INTERVAL_SECONDS = int(os.getenv("VENDOR_SYNC_INTERVAL_SECONDS", "0"))
+VENDOR_SYNC_PAGE_SIZE = int(os.getenv("VENDOR_SYNC_PAGE_SIZE", "500"))
+# Incremental syncs re-read this much before the last complete sync started
+VENDOR_SYNC_OVERLAP_SECONDS = int(os.getenv("VENDOR_SYNC_OVERLAP_SECONDS", "300"))
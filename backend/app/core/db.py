@@ -1,18 +1,116 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from pathlib import Path
+from typing import AsyncIterator, Optional
 
-# PROJECT ROOT → backend/
-BASE_DIR = Path(__file__).resolve().parents[2]
-DB_PATH = BASE_DIR / "app.db"
+from fastapi import Header
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from app.core import config
 
-DATABASE_URL = f"sqlite:///{DB_PATH}"
+DATABASE_URL = config.DATABASE_URL
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection for concurrent web workers.
+
+    WAL lets readers run alongside a writer, busy_timeout makes writers
+    wait for the lock instead of failing with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={config.SQLITE_BUSY_TIMEOUT_MS}")
+        # Negative cache_size is expressed in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{config.SQLITE_CACHE_SIZE_KB}")
+        cursor.execute(f"PRAGMA mmap_size={config.SQLITE_MMAP_SIZE}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def build_engine(url: str) -> Engine:
+    """
+    Create an engine for the given DATABASE_URL.
+
+    - SQLite: WAL-tuned profile configured through connect-event PRAGMAs
+    - Anything else (PostgreSQL): pooled connections with pre-ping/recycle
+    """
+    backend = make_url(url).get_backend_name()
+
+    if backend == "sqlite":
+        engine = create_engine(
+            url,
+            echo=config.DB_ECHO,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            },
+        )
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+        return engine
+
+    return create_engine(
+        url,
+        echo=config.DB_ECHO,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+    )
+
+
+# asyncio driver per backend, used by the async engines below
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+
+def async_url(url: str) -> URL:
+    """DATABASE_URL with its DBAPI driver swapped for the asyncio one."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for {backend}")
+    return parsed.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}")
+
+
+def build_async_engine(url: str) -> AsyncEngine:
+    """
+    Async counterpart of build_engine (aiosqlite / asyncpg), same tuning.
+
+    Used by `async def` endpoints: while a query is in flight the request
+    only holds a coroutine on the event loop, not a threadpool slot.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        # aiosqlite defaults to NullPool (a new connection and thread per
+        # session); pool connections like the sync engine's QueuePool does
+        engine = create_async_engine(
+            async_url(url),
+            echo=config.DB_ECHO,
+            poolclass=AsyncAdaptedQueuePool,
+            connect_args={"timeout": config.SQLITE_BUSY_TIMEOUT_MS / 1000},
+        )
+        event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        return engine
+
+    return create_async_engine(
+        async_url(url),
+        echo=config.DB_ECHO,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+    )
+
+
+engine = build_engine(DATABASE_URL)
+
+# Read replica: reuses the primary engine when DATABASE_READ_URL is not set
+read_engine = build_engine(config.DATABASE_READ_URL) if config.DATABASE_READ_URL else engine
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -20,6 +118,22 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine
+)
+
+async_engine = build_async_engine(DATABASE_URL)
+async_read_engine = (
+    build_async_engine(config.DATABASE_READ_URL) if config.DATABASE_READ_URL else async_engine
+)
+
+# expire_on_commit=False: attributes cannot be lazily refreshed outside
+# run_sync/await, so keep them loaded after a commit
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -29,6 +143,93 @@ def get_db():
     finally:
         db.close()
 
+
+def replica_lag_seconds(db: Session) -> Optional[float]:
+    """
+    Return the replay lag of a PostgreSQL standby in seconds.
+
+    Returns None when the lag cannot be measured (SQLite file copies).
+    A standby that has replayed everything it received reports 0.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+
+    return db.execute(text(
+        "SELECT CASE "
+        "WHEN NOT pg_is_in_recovery() "
+        "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+        "END"
+    )).scalar()
+
+
+def get_read_db(
+    x_max_replica_lag: Optional[float] = Header(
+        None,
+        ge=0,
+        description="Max tolerated replica lag in seconds; 0 forces the primary (read-your-writes)",
+    ),
+):
+    """
+    Session for read-only endpoints, served from the read replica.
+
+    Falls back to the primary when no replica is configured, when the
+    client sends `X-Max-Replica-Lag: 0`, or when the replica is further
+    behind than the requested (or configured default) tolerance.
+    """
+    max_lag = x_max_replica_lag
+    if max_lag is None:
+        max_lag = config.DB_REPLICA_MAX_LAG_SECONDS
+
+    if read_engine is engine or max_lag == 0:
+        yield from get_db()
+        return
+
+    db = ReadSessionLocal()
+    try:
+        if max_lag is not None:
+            lag = replica_lag_seconds(db)
+            if lag is not None and lag > max_lag:
+                db.close()
+                yield from get_db()
+                return
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(
+    x_max_replica_lag: Optional[float] = Header(
+        None,
+        ge=0,
+        description="Max tolerated replica lag in seconds; 0 forces the primary (read-your-writes)",
+    ),
+) -> AsyncIterator[AsyncSession]:
+    """Async counterpart of get_read_db, with the same replica fallback rules."""
+    max_lag = x_max_replica_lag
+    if max_lag is None:
+        max_lag = config.DB_REPLICA_MAX_LAG_SECONDS
+
+    if async_read_engine is async_engine or max_lag == 0:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    async with AsyncReadSessionLocal() as db:
+        lag = await db.run_sync(replica_lag_seconds) if max_lag is not None else None
+        if lag is None or lag <= max_lag:
+            yield db
+            return
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def create_tables():
     Base.metadata.create_all(bind=engine)
 
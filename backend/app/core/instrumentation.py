@@ -0,0 +1,111 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import config
+
+logger = logging.getLogger(__name__)
+
+# Expanded IN lists and multi-row VALUES render a different number of
+# placeholders per call; collapse them so they share one fingerprint.
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|\$\d+|:\w+))*\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalise a SQL statement so repeats with different values compare equal."""
+    statement = _PLACEHOLDER_LIST.sub("(?)", statement)
+    statement = _LITERAL.sub("?", statement)
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+class RequestSQLStats:
+    """SQL activity of one request: statement count, DB time and repeats."""
+
+    __slots__ = ("query_count", "db_seconds", "fingerprints", "started_at")
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.fingerprints: Counter = Counter()
+        self.started_at = time.perf_counter()
+
+    def repeated(self, threshold: int):
+        """(fingerprint, count) pairs executed more than `threshold` times."""
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n > threshold]
+
+    def server_timing(self) -> str:
+        """Value for the Server-Timing response header."""
+        total_ms = (time.perf_counter() - self.started_at) * 1000
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.query_count} queries", '
+            f"app;dur={total_ms:.1f}"
+        )
+
+
+# Mutable stats object per request. Sync endpoints run in a worker thread
+# with a copy of the context, which still points at the same object.
+_current: ContextVar[Optional[RequestSQLStats]] = ContextVar("request_sql_stats", default=None)
+
+
+# A connection runs one statement at a time, so a single start time per
+# connection is enough; it is cleared on success and on failure.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_start", None)
+    stats = _current.get()
+    if stats is None:
+        return
+
+    if started is not None:
+        stats.db_seconds += time.perf_counter() - started
+    stats.query_count += 1
+    stats.fingerprints[fingerprint(statement)] += 1
+
+
+def _handle_error(exception_context):
+    """after_cursor_execute does not run for a failed statement: clean up here."""
+    conn = exception_context.connection
+    if conn is not None:
+        conn.info.pop("query_start", None)
+
+
+def install() -> None:
+    """Register the cursor hooks on every Engine (idempotent)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+def start_request() -> Optional[RequestSQLStats]:
+    """Begin collecting SQL stats for the current request (None when disabled)."""
+    if not config.SQL_INSTRUMENTATION:
+        return None
+    stats = RequestSQLStats()
+    _current.set(stats)
+    return stats
+
+
+def finish_request(stats: Optional[RequestSQLStats], method: str, path: str) -> None:
+    """Stop collecting and warn about N+1 patterns."""
+    if stats is None:
+        return
+    _current.set(None)
+
+    for statement, count in stats.repeated(config.SQL_N_PLUS_ONE_THRESHOLD):
+        logger.warning(
+            f"[N+1] {method} {path} ran the same statement {count}x "
+            f"({stats.query_count} queries total): {statement[:300]}"
+        )
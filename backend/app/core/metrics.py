@@ -0,0 +1,127 @@
+"""
+Prometheus metrics.
+
+Single process (uvicorn): metrics live in the default registry.
+Multiple workers (gunicorn): set PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py
+does this) so every worker writes its samples to that directory and
+GET /metrics aggregates all of them, whichever worker serves the scrape.
+"""
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+# Buckets tuned for an API whose requests mostly take 5ms - 2s
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ---------- HTTP ----------
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request duration by route template and status code",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum",
+)
+
+# ---------- Database ----------
+
+DB_QUERIES = Counter(
+    "db_queries_total",
+    "SQL statements executed while handling requests",
+    ["method", "route"],
+)
+DB_QUERY_SECONDS = Counter(
+    "db_query_seconds_total",
+    "Time spent in SQL statements while handling requests",
+    ["method", "route"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections opened beyond pool_size",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_TRANSACTION_RETRIES = Counter(
+    "db_transaction_retries_total",
+    "Transaction reruns after transient lock/serialization errors",
+    ["operation", "outcome"],
+)
+
+# ---------- External services ----------
+
+VENDOR_LOOKUPS = Counter(
+    "vendor_lookups_total",
+    "Vendor portal lookups by cache / fetch outcome",
+    ["result"],
+)
+VENDOR_BREAKER_OPEN = Gauge(
+    "vendor_portal_breaker_open",
+    "1 while a vendor portal circuit breaker (lookup or list) is open",
+    ["breaker"],
+    multiprocess_mode="livemax",
+)
+VENDOR_SYNC_LAST_SUCCESS = Gauge(
+    "vendor_sync_last_success_timestamp_seconds",
+    "Unix time of the last successful vendor mirror sync",
+    multiprocess_mode="max",
+)
+
+# ---------- Business ----------
+
+PURCHASE_ORDERS_CREATED = Counter(
+    "purchase_orders_created_total",
+    "Purchase orders created",
+    ["source"],
+)
+GATE_PASSES_RECEIVED = Counter(
+    "gate_passes_received_total",
+    "Gate passes received into store",
+)
+DISPATCHES_ISSUED = Counter(
+    "dispatches_issued_total",
+    "Material dispatches issued",
+)
+
+
+def route_label(scope) -> str:
+    """Route template (/api/v1/procurement/{po_id}) to keep label cardinality bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def observe_pools(pools) -> None:
+    """Record checked-out/overflow connections of {name: engine.pool}."""
+    for name, pool in pools.items():
+        if hasattr(pool, "checkedout"):
+            DB_POOL_CHECKED_OUT.labels(name).set(pool.checkedout())
+        if hasattr(pool, "overflow"):
+            DB_POOL_OVERFLOW.labels(name).set(max(0, pool.overflow()))
+
+
+def render():
+    """(body, content type) for GET /metrics."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,79 @@
+import logging
+import time
+from typing import Dict
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import instrumentation, metrics
+from app.core.log import new_request_id
+
+access_logger = logging.getLogger("app.access")
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware for request id propagation, SQL instrumentation,
+    Prometheus request metrics and the access log.
+
+    Unlike @app.middleware("http") (BaseHTTPMiddleware) it runs the app in
+    the same task and passes response messages straight through, so there
+    is no extra task or body re-streaming per request and streaming
+    responses are not buffered. Response headers (X-Request-ID,
+    Server-Timing) are added to the http.response.start message.
+    """
+
+    def __init__(self, app: ASGIApp, pools: Dict[str, object]):
+        self.app = app
+        self.pools = pools
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        request_id = new_request_id(Headers(scope=scope).get("x-request-id"))
+        sql_stats = instrumentation.start_request()
+        status_code = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                if sql_stats is not None:
+                    headers["Server-Timing"] = sql_stats.server_timing()
+            await send(message)
+
+        metrics.REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            process_time = time.perf_counter() - start_time
+            method, path = scope["method"], scope["path"]
+            instrumentation.finish_request(sql_stats, method, path)
+
+            metrics.REQUESTS_IN_PROGRESS.dec()
+            route = metrics.route_label(scope)
+            metrics.REQUEST_DURATION.labels(method, route, str(status_code)).observe(process_time)
+            if sql_stats:
+                metrics.DB_QUERIES.labels(method, route).inc(sql_stats.query_count)
+                metrics.DB_QUERY_SECONDS.labels(method, route).inc(sql_stats.db_seconds)
+            metrics.observe_pools(self.pools)
+
+            access_logger.log(
+                logging.WARNING if status_code >= 500 else logging.INFO,
+                f"{method} {path} {status_code} {process_time * 1000:.1f}ms",
+                extra={
+                    "method": method,
+                    "path": path,
+                    "query": scope.get("query_string", b"").decode("latin-1") or None,
+                    "route": route,
+                    "status": status_code,
+                    "duration_ms": round(process_time * 1000, 2),
+                    "db_queries": sql_stats.query_count if sql_stats else None,
+                    "db_ms": round(sql_stats.db_seconds * 1000, 2) if sql_stats else None,
+                },
+            )
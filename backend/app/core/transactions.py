@@ -0,0 +1,139 @@
+import functools
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core import config, metrics
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL SQLSTATEs worth retrying: serialization_failure, deadlock_detected,
+# lock_not_available (lock_timeout / NOWAIT)
+RETRYABLE_PG_CODES = {"40001", "40P01", "55P03"}
+
+# sqlite3.OperationalError messages raised while another connection holds the lock
+RETRYABLE_SQLITE_MESSAGES = ("database is locked", "database table is locked", "database is busy")
+
+_stats_lock = threading.Lock()
+_stats: Counter = Counter()
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True for transient lock/serialization errors that a rerun can fix."""
+    if not isinstance(exc, DBAPIError) or exc.connection_invalidated:
+        return False
+
+    orig = exc.orig
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    if code:
+        return code in RETRYABLE_PG_CODES
+
+    message = str(orig).lower()
+    return any(text in message for text in RETRYABLE_SQLITE_MESSAGES)
+
+
+def _record(operation: str, outcome: str) -> None:
+    with _stats_lock:
+        _stats[(operation, outcome)] += 1
+    metrics.DB_TRANSACTION_RETRIES.labels(operation, outcome).inc()
+
+
+def retry_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Retry counters since process start:
+    {operation: {"retries": n, "recovered": n, "exhausted": n}}
+    """
+    with _stats_lock:
+        snapshot = dict(_stats)
+
+    result: Dict[str, Dict[str, int]] = {}
+    for (operation, outcome), count in sorted(snapshot.items()):
+        result.setdefault(operation, {"retries": 0, "recovered": 0, "exhausted": 0})[outcome] = count
+    return result
+
+
+def _backoff(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff in seconds."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _find_session(args, kwargs) -> Optional[Session]:
+    db = kwargs.get("db")
+    if isinstance(db, Session):
+        return db
+    return next((arg for arg in args if isinstance(arg, Session)), None)
+
+
+def transactional_retry(
+    operation: Optional[str] = None,
+    attempts: Optional[int] = None,
+    base_delay: Optional[float] = None,
+    max_delay: Optional[float] = None,
+) -> Callable:
+    """
+    Rerun a service unit of work when the database reports a transient
+    lock conflict (SQLite busy / locked, PostgreSQL 40001, 40P01, 55P03).
+
+    The wrapped function receives the Session as `db` (positional or
+    keyword) and must do all of its work in one transaction, committing
+    once as its last database write; helpers it calls flush instead of
+    committing. Only then does a rerun after rollback start from scratch.
+    Between attempts the session is rolled back and the caller sleeps for a
+    jittered, exponentially growing delay. Non-retryable errors and the
+    last failed attempt are re-raised unchanged.
+
+    Usage:
+
+        @staticmethod
+        @transactional_retry("issue_material_dispatch")
+        def issue_material_dispatch(db: Session, dispatch_id: int): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        name = operation or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            max_attempts = max(1, attempts or config.DB_RETRY_ATTEMPTS)
+            base = config.DB_RETRY_BASE_DELAY_MS / 1000 if base_delay is None else base_delay
+            cap = config.DB_RETRY_MAX_DELAY_MS / 1000 if max_delay is None else max_delay
+
+            for attempt in range(max_attempts):
+                try:
+                    result = func(*args, **kwargs)
+                except DBAPIError as e:
+                    if not is_retryable(e):
+                        raise
+
+                    db = _find_session(args, kwargs)
+                    if db is not None:
+                        db.rollback()
+
+                    if attempt + 1 >= max_attempts:
+                        _record(name, "exhausted")
+                        logger.warning(
+                            f"[RETRY] {name} failed after {max_attempts} attempts: {e.orig}"
+                        )
+                        raise
+
+                    delay = _backoff(attempt, base, cap)
+                    _record(name, "retries")
+                    logger.info(
+                        f"[RETRY] {name} attempt {attempt + 1} hit {e.orig}; "
+                        f"retrying in {delay * 1000:.0f}ms"
+                    )
+                    time.sleep(delay)
+                    continue
+
+                if attempt:
+                    _record(name, "recovered")
+                return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,231 @@
+"""
+Per-request sampling profiler.
+
+A request is profiled when it carries `X-Profile-Token: <PROFILE_ADMIN_TOKEN>`
+or when the PROFILE_SAMPLE_RATE dice roll fires. A background thread then
+samples, every PROFILE_INTERVAL_MS, the stacks of the threads currently
+running that request: the event-loop thread while it executes the request's
+task and the threadpool worker running its sync endpoint / dependencies.
+Both run inside a copy of the request's contextvars Context, which is how
+the sampler tells them apart from other requests.
+
+Profiles are written to PROFILE_DIR as speedscope JSON
+(https://www.speedscope.app) or collapsed stacks (flamegraph.pl /
+inferno), newest PROFILE_KEEP files are kept.
+"""
+import json
+import logging
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import Context, ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import config
+
+logger = logging.getLogger(__name__)
+
+PROFILE_EXTENSIONS = {"speedscope": ".speedscope.json", "collapsed": ".folded"}
+
+Frame = Tuple[str, str, int]        # (function, file, first line)
+
+_session: ContextVar[Optional["ProfileSession"]] = ContextVar("profile_session", default=None)
+
+
+def _stack_context(frame) -> Optional[Context]:
+    """
+    The contextvars Context a thread is running under, found on its stack:
+    anyio worker threads hold it in a `context` local, asyncio.Handle._run
+    (event loop executing a task step) in `self._context`.
+    """
+    while frame is not None:
+        local_vars = frame.f_locals
+        context = local_vars.get("context")
+        if isinstance(context, Context):
+            return context
+        context = getattr(local_vars.get("self"), "_context", None)
+        if isinstance(context, Context):
+            return context
+        frame = frame.f_back
+    return None
+
+
+def _frames(frame) -> List[Frame]:
+    """Stack from root to leaf."""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+class ProfileSession:
+    """Sampler thread collecting the stacks of one request."""
+
+    def __init__(self, name: str, interval: float):
+        self.name = name
+        self.interval = interval
+        self.samples: Counter = Counter()     # stack -> seconds
+        self.started_at = time.perf_counter()
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"profiler-{name}", daemon=True)
+
+    def start(self) -> None:
+        _session.set(self)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _run(self) -> None:
+        own_thread = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            # Weight by the real time since the last pass: the sampler waits
+            # for the GIL, so passes are often further apart than `interval`
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                context = _stack_context(frame)
+                if context is not None and context.get(_session) is self:
+                    self.samples[tuple(_frames(frame))] += elapsed
+
+    # ---------- Output ----------
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format: `root;child;leaf microseconds`."""
+        return "".join(
+            ";".join(f"{fn} ({Path(file).name}:{line})" for fn, file, line in stack)
+            + f" {max(1, round(seconds * 1_000_000))}\n"
+            for stack, seconds in self.samples.most_common()
+        )
+
+    def speedscope(self, title: str) -> dict:
+        """speedscope 'sampled' profile; weights are in milliseconds."""
+        frame_index: Dict[Frame, int] = {}
+        frames, samples, weights = [], [], []
+        for stack, seconds in self.samples.items():
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indexes.append(frame_index[frame])
+            samples.append(indexes)
+            weights.append(round(seconds * 1000, 3))
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": title,
+            "exporter": "procurement-quality-portal",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": title,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(self.duration * 1000, 3),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+def profile_dir() -> Path:
+    return Path(config.PROFILE_DIR)
+
+
+def list_profiles() -> List[dict]:
+    """Stored profiles, newest first."""
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+
+    profiles = []
+    for path in directory.iterdir():
+        if path.is_file() and path.name.endswith(tuple(PROFILE_EXTENSIONS.values())):
+            stat = path.stat()
+            profiles.append({
+                "name": path.name,
+                "size": stat.st_size,
+                "created_at": datetime.utcfromtimestamp(stat.st_mtime).isoformat() + "Z",
+            })
+    profiles.sort(key=lambda p: p["created_at"], reverse=True)
+    return profiles
+
+
+def _write(session: ProfileSession, method: str, path: str, status: int) -> None:
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    title = f"{method} {path} {status} {session.duration * 1000:.0f}ms"
+    target = directory / session.name
+    if config.PROFILE_FORMAT == "collapsed":
+        target.write_text(session.collapsed())
+    else:
+        target.write_text(json.dumps(session.speedscope(title)))
+
+    for old in list_profiles()[max(1, config.PROFILE_KEEP):]:
+        (directory / old["name"]).unlink(missing_ok=True)
+
+    logger.info(
+        f"[PROFILE] {title}: {len(session.samples)} distinct stacks -> {target}",
+        extra={"profile": session.name},
+    )
+
+
+def _should_profile(scope: Scope) -> bool:
+    token = config.PROFILE_ADMIN_TOKEN
+    if token and Headers(scope=scope).get("x-profile-token") == token:
+        return True
+    return config.PROFILE_SAMPLE_RATE > 0 and random.random() < config.PROFILE_SAMPLE_RATE
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware attaching a ProfileSession to selected requests."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        extension = PROFILE_EXTENSIONS.get(config.PROFILE_FORMAT, PROFILE_EXTENSIONS["speedscope"])
+        name = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}{extension}"
+        session = ProfileSession(name, max(0.001, config.PROFILE_INTERVAL_MS / 1000))
+        status_code = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = name
+            await send(message)
+
+        session.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            session.stop()
+            _session.set(None)
+            try:
+                _write(session, scope["method"], scope["path"], status_code)
+            except OSError as e:
+                logger.warning(f"[PROFILE] Could not write {name}: {e}")
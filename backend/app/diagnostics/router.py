@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from app.core import config
+from app.diagnostics import profiler
+
+router = APIRouter(prefix="/diagnostics", tags=["Diagnostics"])
+
+
+def require_profile_admin(x_profile_token: str = Header(None)):
+    """Profiles expose code paths and timings: require PROFILE_ADMIN_TOKEN."""
+    if not config.PROFILE_ADMIN_TOKEN or x_profile_token != config.PROFILE_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Profiling is not enabled for this client")
+
+
+@router.get("/profiles", dependencies=[Depends(require_profile_admin)])
+def list_profiles():
+    """Recent request profiles, newest first."""
+    return profiler.list_profiles()
+
+
+@router.get("/profiles/{name}", dependencies=[Depends(require_profile_admin)])
+def download_profile(name: str):
+    """Download one profile (open .speedscope.json files in https://www.speedscope.app)."""
+    if name not in {p["name"] for p in profiler.list_profiles()}:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(profiler.profile_dir() / name, filename=name)
@@ -1,17 +1,28 @@
+import asyncio
 import sys
 from pathlib import Path
+from typing import Optional
 import os
 
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-import time
+import logging
 
 # Import database
 from app.core.db import create_tables
+from app.core.config import VENDOR_SYNC_INTERVAL_SECONDS
+from app.core import instrumentation, metrics
+from app.core.transactions import retry_stats
+from app.core.log import setup_logging
+from app.core.middleware import RequestContextMiddleware
+from app.diagnostics.profiler import ProfilingMiddleware
+
+setup_logging()
+logger = logging.getLogger(__name__)
 
 
 # Import routers
@@ -24,19 +35,25 @@ from app.quality.routers import (
 from app.store.routers.store import router as store_router
 from app.attendance.routers.attendance import router as attendance_router
 from app.store.services.store_service import StoreService
+from app.procurement.services import vendor_client
+from app.procurement.sync_vendors import run_periodic_sync
 from app.store.routers.material_dispatch import router as material_dispatch_router
 from app.contractors import models as contractor_models
 from app.announcements.router import router as announcements_router
 from app.contractors.router import router as contractor_router
 from app.user.routers.user import router as user_router
+from app.diagnostics.router import router as diagnostics_router
 
 
 
 # Create all tables
 if os.getenv("AUTO_CREATE_DB", "false").lower() == "true":
-    print("⚠️ AUTO_CREATE_DB enabled → creating tables")
+    logger.warning("AUTO_CREATE_DB enabled → creating tables")
     create_tables()
 
+# Per-request SQL counters / Server-Timing (SQL_INSTRUMENTATION)
+instrumentation.install()
+
 # Initialize FastAPI application
 app = FastAPI(
     title="Procurement Quality Portal",
@@ -45,9 +62,39 @@ app = FastAPI(
 )
 
 
-from app.core.db import Base, engine
+from app.core.db import Base, async_engine, async_read_engine, engine, read_engine
 Base.metadata.create_all(bind=engine)
 
+DB_POOLS = {"primary": engine.pool, "primary_async": async_engine.pool}
+if read_engine is not engine:
+    DB_POOLS["replica"] = read_engine.pool
+if async_read_engine is not async_engine:
+    DB_POOLS["replica_async"] = async_read_engine.pool
+
+
+@app.on_event("shutdown")
+async def dispose_async_engines():
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
+
+_vendor_sync_task: Optional[asyncio.Task] = None
+
+
+@app.on_event("startup")
+async def start_vendor_sync():
+    global _vendor_sync_task
+    if VENDOR_SYNC_INTERVAL_SECONDS > 0:
+        _vendor_sync_task = asyncio.create_task(run_periodic_sync(VENDOR_SYNC_INTERVAL_SECONDS))
+
+
+@app.on_event("shutdown")
+async def close_vendor_client():
+    if _vendor_sync_task is not None:
+        _vendor_sync_task.cancel()
+    await vendor_client.aclose()
+
 
 # Add CORS middleware
 app.add_middleware(
@@ -66,22 +113,15 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Total-Count-Approximate", "Server-Timing", "X-Request-ID", "X-Profile-Id"],
 )
 
 
-# Global request logger middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    print(f"\n🔵 [INCOMING] {request.method} {request.url.path}")
-
-    response = await call_next(request)
+# On-demand per-request profiler (X-Profile-Token / PROFILE_SAMPLE_RATE)
+app.add_middleware(ProfilingMiddleware)
 
-    process_time = time.time() - start_time
-    status_emoji = "✅" if response.status_code < 400 else "❌"
-    print(f"{status_emoji} [{response.status_code}] {process_time:.3f}s\n")
-
-    return response
+# Request id / SQL stats / metrics / access log (pure ASGI, outermost)
+app.add_middleware(RequestContextMiddleware, pools=DB_POOLS)
 
 # Include routers
 app.include_router(procurement_router, prefix="/api/v1")
@@ -97,6 +137,7 @@ app.include_router(user_router, prefix="/api/v1")
 
 app.include_router(attendance_router, prefix="/api/v1/attendance")
 app.include_router(announcements_router, prefix="/api/v1/announcements")
+app.include_router(diagnostics_router, prefix="/api/v1")
 
 
 
@@ -148,6 +189,17 @@ def health_check():
         }
     }
 
+# Prometheus metrics (aggregated across gunicorn workers, see gunicorn.conf.py)
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+# Transaction retry counters
+@app.get("/health/db-retries")
+def db_retry_stats():
+    return {"operations": retry_stats()}
+
 if __name__ == "__main__":
     print("\n" + "=" * 80)
     print("PROCUREMENT QUALITY PORTAL - STARTING SERVER")
@@ -1,6 +1,8 @@
 from .item import Base, Item
 from .purchase_order import PurchaseOrder, POStatus
 from .purchase_order_line import PurchaseOrderLine
+from .po_line_balance import POLineBalance
+from .vendor import Vendor, VendorSyncState
 
 __all__ = [
     "Base",
@@ -8,4 +10,7 @@ __all__ = [
     "PurchaseOrder",
     "POStatus",
     "PurchaseOrderLine",
+    "POLineBalance",
+    "Vendor",
+    "VendorSyncState",
 ]
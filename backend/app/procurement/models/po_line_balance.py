@@ -0,0 +1,35 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, DateTime
+from app.core.db import Base
+
+
+
+class POLineBalance(Base):
+    """
+    Running quantity counters for a PO line.
+
+    Maintained in the same transaction as the documents that move
+    material (MR, inspection, gate pass, dispatch), so pending quantities
+    are read from here instead of being re-aggregated on every request.
+    """
+    
+    __tablename__ = "po_line_balances"
+    
+    po_line_id = Column(Integer, ForeignKey("purchase_order_lines.id"), primary_key=True)
+    po_id = Column(Integer, nullable=False, index=True)
+    item_id = Column(Integer, nullable=False)
+
+    ordered_qty = Column(Integer, nullable=False, default=0)
+    received_qty = Column(Integer, nullable=False, default=0)
+    accepted_qty = Column(Integer, nullable=False, default=0)
+    rejected_qty = Column(Integer, nullable=False, default=0)
+    gate_passed_qty = Column(Integer, nullable=False, default=0)
+    dispatched_qty = Column(Numeric(12, 3), nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return (
+            f"<POLineBalance(po_line_id={self.po_line_id}, ordered={self.ordered_qty}, "
+            f"received={self.received_qty}, dispatched={self.dispatched_qty})>"
+        )
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.db import Base
 
@@ -27,12 +27,26 @@ class PurchaseOrder(Base):
     po_sent_at = Column(DateTime, nullable=True)
     
     # Relationship to PurchaseOrderLine
+    # selectin: lists fetch lines in one extra IN query instead of a PO x line
+    # join; single-PO reads can still opt into joinedload per query.
     lines = relationship(
         "PurchaseOrderLine",
         back_populates="purchase_order",
         cascade="all, delete-orphan",
-        lazy="joined"
+        lazy="selectin"
+    )
+
+    # Mirrored vendor master row; no FK since the portal owns vendor ids and
+    # a PO may reference a vendor that has not been synced yet
+    vendor = relationship(
+        "Vendor",
+        primaryjoin="foreign(PurchaseOrder.vendor_id) == Vendor.id",
+        viewonly=True,
     )
     
     def __repr__(self):
         return f"<PurchaseOrder(id={self.id}, po_number={self.po_number}, status={self.status})>"
+
+
+# PO list: keyset order (created_at, id), newest first
+Index("idx_po_created", PurchaseOrder.created_at, PurchaseOrder.id)
@@ -0,0 +1,46 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+from app.core.db import Base
+
+
+
+class Vendor(Base):
+    """
+    Local mirror of the Vendor Portal's vendor master.
+
+    Only written by the vendor sync (app/procurement/sync_vendors.py); `id`
+    is the portal's vendor id, which PurchaseOrder.vendor_id and
+    MaterialReceipt.vendor_id reference.
+    """
+    
+    __tablename__ = "vendors"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(255), nullable=False, index=True)
+    contact = Column(String(255), nullable=True)
+    status = Column(String(50), nullable=False, default="ACTIVE")
+
+    # Last change on the portal side; drives incremental syncs
+    portal_updated_at = Column(DateTime, nullable=True, index=True)
+    synced_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<Vendor(id={self.id}, name={self.name}, status={self.status})>"
+
+
+class VendorSyncState(Base):
+    """
+    Progress of the vendor sync: a single row (id=1).
+
+    `watermark` is the start time of the last sync that read every page;
+    the next incremental sync asks the portal for changes since then.
+    """
+
+    __tablename__ = "vendor_sync_state"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    watermark = Column(DateTime, nullable=False)
+    completed_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<VendorSyncState(watermark={self.watermark})>"
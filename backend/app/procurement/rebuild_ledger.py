@@ -0,0 +1,82 @@
+"""
+Rebuild or verify the PO line ledger (po_line_balances).
+
+    python -m app.procurement.rebuild_ledger              # rebuild every PO
+    python -m app.procurement.rebuild_ledger --verify     # report drift, exit 1 if any
+    python -m app.procurement.rebuild_ledger --po 12 --po 15
+"""
+import argparse
+import sys
+
+from app.core.db import SessionLocal
+from app.procurement.models import PurchaseOrder
+from app.procurement.services.po_line_ledger import POLineLedger
+
+BATCH_SIZE = 500
+
+
+def _po_id_batches(db, po_ids):
+    if po_ids:
+        yield sorted(set(po_ids))
+        return
+
+    last_id = 0
+    while True:
+        batch = [
+            po_id for (po_id,) in
+            db.query(PurchaseOrder.id)
+            .filter(PurchaseOrder.id > last_id)
+            .order_by(PurchaseOrder.id)
+            .limit(BATCH_SIZE)
+        ]
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]
+
+
+def rebuild_ledger(po_ids=None):
+    db = SessionLocal()
+    total = 0
+    try:
+        for batch in _po_id_batches(db, po_ids):
+            total += POLineLedger.rebuild(db, batch)
+            db.commit()
+        print(f"✅ Rebuilt {total} PO line balances")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def verify_ledger(po_ids=None) -> int:
+    db = SessionLocal()
+    problems = 0
+    try:
+        for batch in _po_id_batches(db, po_ids):
+            for p in POLineLedger.verify(db, batch):
+                problems += 1
+                print(
+                    f"❌ PO {p['po_id']} line {p['po_line_id']}: "
+                    f"{p['counter'] or 'row'} stored={p['stored']} actual={p['actual']}"
+                )
+    finally:
+        db.close()
+
+    if problems:
+        print(f"⚠️ {problems} ledger mismatches (run without --verify to rebuild)")
+    else:
+        print("✅ Ledger matches source documents")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or verify po_line_balances")
+    parser.add_argument("--verify", action="store_true", help="only compare, do not write")
+    parser.add_argument("--po", type=int, action="append", help="limit to these PO ids")
+    args = parser.parse_args()
+
+    if args.verify:
+        sys.exit(1 if verify_ledger(args.po) else 0)
+    rebuild_ledger(args.po)
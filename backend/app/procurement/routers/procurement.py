@@ -1,11 +1,14 @@
+import tempfile
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
-from app.core.config import DEBUG
+from app.core.config import DEBUG, PO_BULK_IMPORT_SPOOL_BYTES
 
 
-from app.core.db import get_db
+from app.core.db import get_async_read_db, get_db, get_read_db
 from app.procurement.schemas import (
     PurchaseOrderCreate,
     PurchaseOrderRead,
@@ -14,10 +17,11 @@ from app.procurement.schemas import (
 )
 from app.procurement.schemas import VendorRead
 from app.procurement.schemas import PurchaseOrderTracking
-from app.procurement.services import ProcurementService
+from app.procurement.services import ProcurementService, BulkImportService, VendorService
 from app.procurement.schemas.purchase_order import PurchaseOrderDetailRead
 from app.procurement.models import Item
 from app.procurement.schemas.item import ItemRead, ItemCreate
+from app.utils.pagination import CountMode, set_page_headers
 
 router = APIRouter(prefix="/procurement", tags=["Procurement"])
 
@@ -49,7 +53,7 @@ def create_item_api(
 
 @router.get("/items", response_model=List[ItemRead])
 def list_items_api(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     return ProcurementService.get_all_items(db)
 
@@ -68,29 +72,125 @@ def create_purchase_order(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+BULK_IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/json-lines": "jsonl",
+}
+
+
+@router.post("/bulk", summary="Bulk Import Purchase Orders")
+async def bulk_import_purchase_orders(
+    request: Request,
+    format: Optional[str] = Query(
+        None,
+        pattern="^(csv|jsonl)$",
+        description="Upload format; defaults to the request Content-Type",
+    ),
+):
+    """
+    Import many purchase orders from a raw CSV or JSON-Lines request body.
+
+    The upload is spooled (memory, then a temporary file) as it arrives and
+    imported in chunked transactions. The response is an NDJSON stream with
+    one result per PO and a final summary line.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    file_format = format or BULK_IMPORT_CONTENT_TYPES.get(content_type)
+    if not file_format:
+        raise HTTPException(
+            status_code=415,
+            detail="Send text/csv or application/x-ndjson, or pass ?format=csv|jsonl",
+        )
+
+    spool = tempfile.SpooledTemporaryFile(max_size=PO_BULK_IMPORT_SPOOL_BYTES)
+    try:
+        async for chunk in request.stream():
+            spool.write(chunk)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+
+    return StreamingResponse(
+        BulkImportService.import_stream(spool, file_format),
+        media_type="application/x-ndjson",
+    )
+
+
+# Registered before /{po_id} so "vendors" is not taken for a PO id
+@router.get("/vendors", response_model=List[VendorRead], summary="Search Vendors")
+async def search_vendors(
+    response: Response,
+    q: Optional[str] = Query(None, description="Part of the vendor name"),
+    vendor_status: Optional[str] = Query(None, alias="status", description="ACTIVE, INACTIVE, ..."),
+    ids: List[int] = Query([], description="Restrict to these vendor ids, e.g. ?ids=1&ids=2"),
+    limit: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    count: CountMode = Query(CountMode.NONE, description="Report total in X-Total-Count"),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> list:
+    """
+    Search vendors by name, ordered by name, with cursor pagination.
+    Served entirely from the local vendor mirror (see sync_vendors).
+    """
+    try:
+        result = await db.run_sync(
+            VendorService.search_vendors,
+            q=q, status=vendor_status, ids=ids, cursor=cursor, limit=limit, count_mode=count,
+        )
+        set_page_headers(response, result)
+        return result["items"]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/vendors/{vendor_id}", response_model=VendorRead, summary="Get Vendor")
+async def get_vendor_details(
+    vendor_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+) -> VendorRead:
+    """
+    Vendor data is owned by the Vendor Portal and mirrored locally; vendors
+    not synced yet are looked up on the portal. Unknown or unreachable
+    vendors come back as "Unknown Vendor".
+    """
+    vendor = await db.run_sync(VendorService.get_vendor, vendor_id)
+    return vendor or await ProcurementService.get_vendor_details(vendor_id)
+
+
 @router.get("/", response_model=list[PurchaseOrderRead], summary="List Purchase Orders")
-def list_purchase_orders(
-    skip: int = Query(0, ge=0),
+async def list_purchase_orders(
+    response: Response,
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    count: CountMode = Query(CountMode.NONE, description="Report total in X-Total-Count"),
+    db: AsyncSession = Depends(get_async_read_db),
 ) -> list:
-    """List all purchase orders with pagination."""
+    """List purchase orders, newest first, with cursor pagination."""
     try:
-        page = (skip // limit) + 1 if limit > 0 else 1
-        result = ProcurementService.get_purchase_orders(db, status=None, page=page, page_size=limit)
+        result = await db.run_sync(
+            ProcurementService.get_purchase_orders,
+            status=None, cursor=cursor, limit=limit, count_mode=count,
+        )
+        set_page_headers(response, result)
         return result["items"]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{po_id}", response_model=PurchaseOrderDetailRead, summary="Get Purchase Order Details")
-def get_purchase_order(
+async def get_purchase_order(
     po_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ) -> dict:
     """Get details of a specific purchase order."""
     try:
-        po = ProcurementService.get_purchase_order(db, po_id)
+        po = await db.run_sync(ProcurementService.get_purchase_order, po_id)
         if not po:
             raise HTTPException(status_code=404, detail="Purchase order not found")
         return po
@@ -151,36 +251,29 @@ def send_purchase_order(
 @router.get("/vendor/{vendor_id}", response_model=list[PurchaseOrderRead], summary="Get POs by Vendor")
 def get_pos_by_vendor(
     vendor_id: int,
-    skip: int = Query(0, ge=0),
+    response: Response,
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    count: CountMode = Query(CountMode.NONE, description="Report total in X-Total-Count"),
+    db: Session = Depends(get_read_db),
 ) -> list:
-    """Get all purchase orders for a specific vendor."""
+    """Get purchase orders for a specific vendor, newest first."""
     try:
-        return ProcurementService.get_purchase_orders_by_vendor(db, vendor_id, skip, limit)
+        result = ProcurementService.get_purchase_orders_by_vendor(
+            db, vendor_id, cursor=cursor, limit=limit, count_mode=count
+        )
+        set_page_headers(response, result)
+        return result["items"]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/vendors/{vendor_id}", response_model=VendorRead)
-def get_vendor_details(vendor_id: int):
-    """
-    TEMP: Vendor data is owned by Vendor Service.
-    Procurement only references vendor_id.
-    """
-    return {
-        "id": vendor_id,
-        "name": f"Vendor #{vendor_id}",
-        "contact": None,
-        "status": "ACTIVE"
-    }
-
-
-
 @router.get("/{po_id}/tracking", response_model=PurchaseOrderTracking, summary="Track Purchase Order")
 def get_po_tracking(
     po_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> dict:
     """Get tracking information for a purchase order."""
     try:
@@ -195,7 +288,7 @@ def get_po_tracking(
 @router.get("/{po_id}/pending-items")
 def get_po_pending_items(
     po_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     try:
         return ProcurementService.get_po_items_with_pending_qty(db, po_id)
@@ -58,6 +58,7 @@ class PurchaseOrderRead(BaseModel):
     id: int
     po_number: str
     vendor_id: int
+    vendor_name: Optional[str] = None
     status: POStatus
     created_at: datetime
     po_sent_at: Optional[datetime] = None 
@@ -100,6 +101,7 @@ class PurchaseOrderDetailRead(BaseModel):
     id: int
     po_number: str
     vendor_id: int
+    vendor_name: Optional[str] = None
     status: POStatus
     created_at: datetime
     po_sent_at: Optional[datetime] = None
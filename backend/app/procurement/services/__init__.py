@@ -1,3 +1,19 @@
-from .procurement_service import ProcurementService
+from .procurement_service import ProcurementService, LineLoading
+from .bulk_import_service import BulkImportService
+from .po_line_ledger import POLineLedger
+from .item_cache import item_cache, CachedItem
+from .vendor_client import vendor_client, VendorClient, CircuitBreaker
+from .vendor_service import VendorService
 
-__all__ = ["ProcurementService"]
+__all__ = [
+    "ProcurementService",
+    "LineLoading",
+    "BulkImportService",
+    "POLineLedger",
+    "item_cache",
+    "CachedItem",
+    "vendor_client",
+    "VendorClient",
+    "CircuitBreaker",
+    "VendorService",
+]
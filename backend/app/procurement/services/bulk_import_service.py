@@ -0,0 +1,296 @@
+import csv
+import io
+import json
+from typing import IO, Iterator, List, NamedTuple, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core import config, metrics
+from app.core.db import SessionLocal
+from app.procurement.models import Item, POStatus, PurchaseOrder, PurchaseOrderLine
+from app.procurement.schemas import PurchaseOrderCreate
+from app.procurement.services.procurement_service import ProcurementService
+from app.procurement.services.po_line_ledger import POLineLedger
+
+CSV_COLUMNS = ("po_ref", "vendor_id", "item_id", "quantity", "price")
+
+
+class ParsedPO(NamedTuple):
+    """One purchase order read from an import file."""
+    ref: str
+    row: int            # first CSV row / JSONL line of the PO (1-based, header excluded)
+    data: Optional[dict]
+    error: Optional[str]
+
+
+class BulkImportService:
+    """
+    Import purchase orders in bulk from CSV or JSON-Lines.
+
+    Rows are parsed lazily from the upload, validated against the Item
+    master (loaded once as a set of ids) and inserted in chunks, one
+    transaction per chunk. Results are yielded as NDJSON lines as soon
+    as each PO is rejected or its chunk commits.
+    """
+
+    # ---------- Parsing ----------
+
+    @staticmethod
+    def _iter_csv(stream: IO[bytes]) -> Iterator[ParsedPO]:
+        """
+        CSV with one row per PO line; rows of the same PO share a po_ref
+        and must be contiguous:
+
+            po_ref,vendor_id,item_id,quantity,price
+            ERP-1001,12,5,100,42.50
+            ERP-1001,12,9,20,7.00
+        """
+        reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+
+        missing = [c for c in CSV_COLUMNS if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+
+        current = None
+        for row_number, row in enumerate(reader, start=1):
+            ref = (row["po_ref"] or "").strip()
+            if current is not None and ref == current.ref:
+                if row["vendor_id"] != current.data["vendor_id"]:
+                    current = current._replace(error="All rows of a PO must have the same vendor_id")
+                current.data["lines"].append({
+                    "item_id": row["item_id"],
+                    "quantity": row["quantity"],
+                    "price": row["price"],
+                })
+                continue
+
+            if current is not None:
+                yield current
+
+            current = ParsedPO(
+                ref=ref,
+                row=row_number,
+                data={
+                    "vendor_id": row["vendor_id"],
+                    "lines": [{
+                        "item_id": row["item_id"],
+                        "quantity": row["quantity"],
+                        "price": row["price"],
+                    }],
+                },
+                error=None if ref else "po_ref is required",
+            )
+
+        if current is not None:
+            yield current
+
+    @staticmethod
+    def _iter_jsonl(stream: IO[bytes]) -> Iterator[ParsedPO]:
+        """
+        JSON-Lines with one PO per line:
+
+            {"po_ref": "ERP-1001", "vendor_id": 12, "lines": [{"item_id": 5, "quantity": 100, "price": "42.50"}]}
+        """
+        for line_number, raw in enumerate(io.TextIOWrapper(stream, encoding="utf-8-sig"), start=1):
+            if not raw.strip():
+                continue
+
+            try:
+                record = json.loads(raw)
+            except json.JSONDecodeError as e:
+                yield ParsedPO(f"line {line_number}", line_number, None, f"Invalid JSON: {e.msg}")
+                continue
+
+            if not isinstance(record, dict):
+                yield ParsedPO(f"line {line_number}", line_number, None, "Each line must be a JSON object")
+                continue
+
+            ref = str(record.pop("po_ref", "") or f"line {line_number}")
+            yield ParsedPO(ref, line_number, record, None)
+
+    # ---------- Validation ----------
+
+    @staticmethod
+    def _validate(parsed: ParsedPO, item_ids: set) -> PurchaseOrderCreate:
+        """
+        Validate one parsed PO the same way create_purchase_order does.
+
+        Raises:
+            ValueError: With a readable reason when the PO is rejected
+        """
+        if parsed.error:
+            raise ValueError(parsed.error)
+
+        try:
+            po = PurchaseOrderCreate.model_validate(parsed.data)
+        except ValidationError as e:
+            raise ValueError("; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+            ))
+
+        line_item_ids = [line.item_id for line in po.lines]
+        ProcurementService._validate_no_duplicate_items(line_item_ids)
+
+        missing = sorted(set(line_item_ids) - item_ids)
+        if missing:
+            raise ValueError(f"Items with IDs {missing} do not exist")
+
+        return po
+
+    # ---------- Persistence ----------
+
+    @staticmethod
+    def _insert_chunk(db: Session, chunk: List[tuple]) -> List[dict]:
+        """
+        Insert a chunk of validated POs and their lines in one transaction.
+
+        One executemany for the POs (ids come back through RETURNING where
+        supported, otherwise via their generated po_numbers) and one for
+        all of their lines.
+        """
+        po_numbers = set()
+        po_rows = []
+        for _, _, po in chunk:
+            po_number = ProcurementService._generate_po_number()
+            while po_number in po_numbers:
+                po_number = ProcurementService._generate_po_number()
+            po_numbers.add(po_number)
+            po_rows.append({
+                "po_number": po_number,
+                "vendor_id": po.vendor_id,
+                "status": POStatus.DRAFT,
+            })
+
+        if db.get_bind().dialect.insert_executemany_returning:
+            inserted = db.execute(
+                insert(PurchaseOrder).returning(
+                    PurchaseOrder.id, PurchaseOrder.po_number, sort_by_parameter_order=True
+                ),
+                po_rows,
+            ).all()
+        else:
+            db.execute(insert(PurchaseOrder), po_rows)
+            ids = dict(
+                db.query(PurchaseOrder.po_number, PurchaseOrder.id)
+                .filter(PurchaseOrder.po_number.in_(po_numbers))
+                .all()
+            )
+            inserted = [(ids[row["po_number"]], row["po_number"]) for row in po_rows]
+
+        db.execute(insert(PurchaseOrderLine), [
+            {
+                "po_id": po_id,
+                "item_id": line.item_id,
+                "quantity": line.quantity,
+                "price": line.price,
+            }
+            for (po_id, _), (_, _, po) in zip(inserted, chunk)
+            for line in po.lines
+        ])
+        POLineLedger.init_pos(db, [po_id for po_id, _ in inserted])
+
+        db.commit()
+        metrics.PURCHASE_ORDERS_CREATED.labels("bulk_import").inc(len(inserted))
+
+        return [
+            {
+                "po_ref": ref,
+                "row": row,
+                "status": "created",
+                "po_id": po_id,
+                "po_number": po_number,
+                "lines": len(po.lines),
+            }
+            for (po_id, po_number), (ref, row, po) in zip(inserted, chunk)
+        ]
+
+    @staticmethod
+    def _flush_chunk(db: Session, chunk: List[tuple]) -> List[dict]:
+        """
+        Commit a chunk; if it fails, retry its POs one by one so a single
+        bad PO does not reject the whole chunk.
+        """
+        try:
+            return BulkImportService._insert_chunk(db, chunk)
+        except Exception:
+            db.rollback()
+
+        results = []
+        for entry in chunk:
+            try:
+                results.extend(BulkImportService._insert_chunk(db, [entry]))
+            except Exception as e:
+                db.rollback()
+                ref, row, _ = entry
+                results.append({"po_ref": ref, "row": row, "status": "error", "errors": [str(e)]})
+        return results
+
+    # ---------- Entry point ----------
+
+    @staticmethod
+    def import_stream(stream: IO[bytes], file_format: str) -> Iterator[str]:
+        """
+        Import purchase orders from a CSV or JSONL byte stream.
+
+        Yields one NDJSON result per PO followed by a summary line. Uses its
+        own session because it runs while the response is being streamed.
+        """
+        chunk_size = max(1, config.PO_BULK_IMPORT_CHUNK_SIZE)
+        summary = {"received": 0, "created": 0, "failed": 0, "chunks": 0}
+
+        db = SessionLocal()
+        try:
+            # One set query for the whole import instead of one per PO
+            item_ids = {item_id for (item_id,) in db.query(Item.id)}
+
+            parser = (
+                BulkImportService._iter_csv if file_format == "csv"
+                else BulkImportService._iter_jsonl
+            )
+
+            seen_refs = set()
+            chunk = []
+
+            def flush():
+                summary["chunks"] += 1
+                for result in BulkImportService._flush_chunk(db, chunk):
+                    summary["created" if result["status"] == "created" else "failed"] += 1
+                    yield json.dumps(result) + "\n"
+                chunk.clear()
+
+            try:
+                for parsed in parser(stream):
+                    summary["received"] += 1
+                    try:
+                        if parsed.ref in seen_refs:
+                            raise ValueError(f"Duplicate po_ref {parsed.ref!r} in upload")
+                        seen_refs.add(parsed.ref)
+                        po = BulkImportService._validate(parsed, item_ids)
+                    except ValueError as e:
+                        summary["failed"] += 1
+                        yield json.dumps({
+                            "po_ref": parsed.ref,
+                            "row": parsed.row,
+                            "status": "error",
+                            "errors": [str(e)],
+                        }) + "\n"
+                        continue
+
+                    chunk.append((parsed.ref, parsed.row, po))
+                    if len(chunk) >= chunk_size:
+                        yield from flush()
+
+            except (ValueError, UnicodeDecodeError, csv.Error) as e:
+                # Unreadable file: keep what was parsed before the failure
+                summary["error"] = str(e)
+
+            if chunk:
+                yield from flush()
+
+            yield json.dumps({"summary": summary}) + "\n"
+
+        finally:
+            db.close()
+            stream.close()
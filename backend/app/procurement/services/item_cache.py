@@ -0,0 +1,75 @@
+import threading
+import time
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import ITEM_CACHE_TTL_SECONDS
+from app.procurement.models.item import Item
+
+
+class CachedItem(NamedTuple):
+    """Immutable snapshot of an Item master row."""
+    id: int
+    code: str
+    name: str
+    unit: str
+    description: Optional[str]
+
+
+class ItemCache:
+    """
+    Process-local, read-through cache of the Item master.
+
+    Item master rows are effectively immutable reference data, so PO detail,
+    pending-quantity and inventory listings resolve item code/name/unit from
+    here instead of joining (or querying) `items` for every line. Misses are
+    loaded with a single `IN` query per call.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self._ttl = ttl_seconds
+        self._entries: Dict[int, Tuple[float, CachedItem]] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, db: Session, item_ids: Iterable[int]) -> Dict[int, CachedItem]:
+        """Return {item_id: CachedItem} for the ids that exist in the master."""
+        wanted = set(item_ids)
+        now = time.monotonic()
+        found: Dict[int, CachedItem] = {}
+
+        with self._lock:
+            for item_id in wanted:
+                entry = self._entries.get(item_id)
+                if entry and entry[0] > now:
+                    found[item_id] = entry[1]
+
+        missing = wanted - found.keys()
+        if missing:
+            rows = (
+                db.query(Item.id, Item.code, Item.name, Item.unit, Item.description)
+                .filter(Item.id.in_(missing))
+                .all()
+            )
+            expires_at = now + self._ttl
+            with self._lock:
+                for row in rows:
+                    cached = CachedItem(*row)
+                    self._entries[cached.id] = (expires_at, cached)
+                    found[cached.id] = cached
+
+        return found
+
+    def get(self, db: Session, item_id: int) -> Optional[CachedItem]:
+        return self.get_many(db, [item_id]).get(item_id)
+
+    def invalidate(self, item_id: Optional[int] = None) -> None:
+        """Drop one item (or the whole cache when item_id is None)."""
+        with self._lock:
+            if item_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(item_id, None)
+
+
+item_cache = ItemCache(ttl_seconds=ITEM_CACHE_TTL_SECONDS)
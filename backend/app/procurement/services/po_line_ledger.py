@@ -0,0 +1,338 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.procurement.models import POLineBalance, PurchaseOrderLine
+from app.quality.models.material_receipt import MaterialReceipt, MaterialReceiptLine
+from app.quality.models.inspection import QualityInspectionLine
+from app.quality.models.gate_pass import GatePass, GatePassItem
+from app.store.models.material_dispatch import (
+    MaterialDispatch,
+    MaterialDispatchLineItem,
+    DispatchStatus,
+    ReferenceType,
+)
+
+COUNTERS = (
+    "ordered_qty",
+    "received_qty",
+    "accepted_qty",
+    "rejected_qty",
+    "gate_passed_qty",
+    "dispatched_qty",
+)
+
+_balances = POLineBalance.__table__
+
+
+class POLineLedger:
+    """
+    Per-PO-line quantity counters (po_line_balances).
+
+    Writers call `add` / `add_for_items` inside their own transaction, so
+    the counters commit or roll back together with the document. Readers
+    get one indexed lookup per PO instead of aggregating MR, inspection,
+    gate pass and dispatch tables.
+    """
+
+    # ---------- Writes ----------
+
+    @staticmethod
+    def init_pos(db: Session, po_ids: Iterable[int]) -> None:
+        """Create zeroed balances (ordered = line quantity) for new POs."""
+        po_ids = list(po_ids)
+        if not po_ids:
+            return
+
+        db.execute(
+            insert(POLineBalance).from_select(
+                ["po_line_id", "po_id", "item_id", "ordered_qty", "received_qty",
+                 "accepted_qty", "rejected_qty", "gate_passed_qty", "dispatched_qty",
+                 "updated_at"],
+                select(
+                    PurchaseOrderLine.id,
+                    PurchaseOrderLine.po_id,
+                    PurchaseOrderLine.item_id,
+                    PurchaseOrderLine.quantity,
+                    literal(0), literal(0), literal(0), literal(0), literal(0),
+                    literal(datetime.utcnow()),
+                ).where(PurchaseOrderLine.po_id.in_(po_ids)),
+            )
+        )
+
+    @staticmethod
+    def delete_pos(db: Session, po_ids: Iterable[int]) -> None:
+        po_ids = list(po_ids)
+        if po_ids:
+            db.execute(delete(POLineBalance).where(POLineBalance.po_id.in_(po_ids)))
+
+    @staticmethod
+    def add(db: Session, po_id: int, counter: str, deltas: Dict[int, object]) -> None:
+        """
+        Atomically add {po_line_id: quantity} to one counter of a PO.
+
+        Runs `UPDATE ... SET counter = counter + :delta` as one executemany,
+        so concurrent writers never overwrite each other. Call it after the
+        source rows of the change have been added to the session: if the PO
+        has no balances yet (created before the ledger existed) they are
+        rebuilt from the flushed documents instead.
+        """
+        if counter not in COUNTERS:
+            raise ValueError(f"Unknown ledger counter: {counter}")
+
+        deltas = {line_id: qty for line_id, qty in deltas.items() if qty}
+        if not deltas:
+            return
+
+        db.flush()
+        if not POLineLedger._has_balances(db, po_id):
+            POLineLedger.rebuild(db, [po_id])
+            return
+
+        column = _balances.c[counter]
+        db.execute(
+            update(_balances)
+            .where(_balances.c.po_line_id == bindparam("b_line_id"))
+            .values({counter: column + bindparam("b_delta"), "updated_at": bindparam("b_now")}),
+            [
+                {"b_line_id": line_id, "b_delta": qty, "b_now": datetime.utcnow()}
+                for line_id, qty in deltas.items()
+            ],
+        )
+
+    @staticmethod
+    def add_for_items(db: Session, po_id: int, counter: str, deltas: Dict[int, object]) -> None:
+        """Like `add`, keyed by item_id (a PO holds each item on one line only)."""
+        deltas = {item_id: qty for item_id, qty in deltas.items() if qty}
+        if not deltas:
+            return
+
+        line_ids = dict(
+            db.query(PurchaseOrderLine.item_id, PurchaseOrderLine.id)
+            .filter(
+                PurchaseOrderLine.po_id == po_id,
+                PurchaseOrderLine.item_id.in_(deltas),
+            )
+            .all()
+        )
+        POLineLedger.add(
+            db,
+            po_id,
+            counter,
+            {line_ids[item_id]: qty for item_id, qty in deltas.items() if item_id in line_ids},
+        )
+
+    # ---------- Reads ----------
+
+    @staticmethod
+    def get_po_balances(db: Session, po_id: int, for_update: bool = False) -> List[POLineBalance]:
+        """
+        Balances of every line of a PO, ordered by line id.
+
+        With for_update=True the rows are locked until the transaction ends
+        (used to validate and consume pending quantities atomically). POs
+        without ledger rows are rebuilt (for_update) or computed on the fly.
+        """
+        query = (
+            db.query(POLineBalance)
+            .filter(POLineBalance.po_id == po_id)
+            .order_by(POLineBalance.po_line_id)
+            .populate_existing()
+        )
+        if for_update:
+            query = query.with_for_update()
+
+        balances = query.all()
+        if balances:
+            return balances
+
+        if for_update:
+            POLineLedger.rebuild(db, [po_id])
+            return query.all()
+
+        return [
+            POLineBalance(po_line_id=line_id, **values)
+            for line_id, values in sorted(POLineLedger.compute(db, [po_id]).items())
+        ]
+
+    # ---------- Rebuild / verify ----------
+
+    @staticmethod
+    def compute(db: Session, po_ids: Optional[List[int]] = None) -> Dict[int, dict]:
+        """
+        Recompute balances from the source documents.
+
+        Returns:
+            {po_line_id: {po_id, item_id, <counters>}} for the given POs
+            (all POs when po_ids is None)
+        """
+        def scoped(query, po_column):
+            return query if po_ids is None else query.filter(po_column.in_(po_ids))
+
+        lines = scoped(
+            db.query(
+                PurchaseOrderLine.id,
+                PurchaseOrderLine.po_id,
+                PurchaseOrderLine.item_id,
+                PurchaseOrderLine.quantity,
+            ),
+            PurchaseOrderLine.po_id,
+        ).all()
+
+        result = {
+            line.id: {
+                "po_id": line.po_id,
+                "item_id": line.item_id,
+                "ordered_qty": line.quantity,
+                "received_qty": 0,
+                "accepted_qty": 0,
+                "rejected_qty": 0,
+                "gate_passed_qty": 0,
+                "dispatched_qty": Decimal(0),
+            }
+            for line in lines
+        }
+        by_item = {(v["po_id"], v["item_id"]): line_id for line_id, v in result.items()}
+
+        received = scoped(
+            db.query(
+                MaterialReceiptLine.po_line_id,
+                func.sum(MaterialReceiptLine.received_quantity),
+            )
+            .join(MaterialReceipt, MaterialReceipt.id == MaterialReceiptLine.mr_id)
+            .group_by(MaterialReceiptLine.po_line_id),
+            MaterialReceipt.po_id,
+        )
+        for line_id, qty in received:
+            if line_id in result:
+                result[line_id]["received_qty"] = int(qty or 0)
+
+        inspected = scoped(
+            db.query(
+                MaterialReceiptLine.po_line_id,
+                func.sum(QualityInspectionLine.accepted_quantity),
+                func.sum(QualityInspectionLine.rejected_quantity),
+            )
+            .join(MaterialReceiptLine, MaterialReceiptLine.id == QualityInspectionLine.mr_line_id)
+            .join(MaterialReceipt, MaterialReceipt.id == MaterialReceiptLine.mr_id)
+            .group_by(MaterialReceiptLine.po_line_id),
+            MaterialReceipt.po_id,
+        )
+        for line_id, accepted, rejected in inspected:
+            if line_id in result:
+                result[line_id]["accepted_qty"] = int(accepted or 0)
+                result[line_id]["rejected_qty"] = int(rejected or 0)
+
+        gate_passed = scoped(
+            db.query(
+                GatePass.po_id,
+                GatePassItem.item_id,
+                func.sum(GatePassItem.accepted_quantity),
+            )
+            .join(GatePass, GatePass.id == GatePassItem.gate_pass_id)
+            .group_by(GatePass.po_id, GatePassItem.item_id),
+            GatePass.po_id,
+        )
+        for po_id, item_id, qty in gate_passed:
+            line_id = by_item.get((po_id, item_id))
+            if line_id is not None:
+                result[line_id]["gate_passed_qty"] = int(qty or 0)
+
+        dispatched = db.query(
+            MaterialDispatch.reference_id,
+            MaterialDispatchLineItem.item_id,
+            func.sum(MaterialDispatchLineItem.quantity_dispatched),
+        ).join(
+            MaterialDispatch, MaterialDispatch.id == MaterialDispatchLineItem.dispatch_id
+        ).filter(
+            MaterialDispatch.reference_type == ReferenceType.PO,
+            MaterialDispatch.dispatch_status == DispatchStatus.DISPATCHED,
+        ).group_by(MaterialDispatch.reference_id, MaterialDispatchLineItem.item_id)
+        if po_ids is not None:
+            dispatched = dispatched.filter(
+                MaterialDispatch.reference_id.in_([str(po_id) for po_id in po_ids])
+            )
+        for reference_id, item_id, qty in dispatched:
+            try:
+                line_id = by_item.get((int(reference_id), item_id))
+            except (TypeError, ValueError):
+                continue
+            if line_id is not None:
+                result[line_id]["dispatched_qty"] = Decimal(qty or 0)
+
+        return result
+
+    @staticmethod
+    def rebuild(db: Session, po_ids: Optional[List[int]] = None) -> int:
+        """
+        Replace the balances of the given POs (all when None) with values
+        recomputed from the source documents. Does not commit.
+
+        Returns:
+            Number of balance rows written
+        """
+        computed = POLineLedger.compute(db, po_ids)
+
+        if po_ids is None:
+            db.execute(delete(POLineBalance))
+        else:
+            POLineLedger.delete_pos(db, po_ids)
+
+        if computed:
+            now = datetime.utcnow()
+            db.execute(insert(POLineBalance), [
+                {"po_line_id": line_id, **values, "updated_at": now}
+                for line_id, values in computed.items()
+            ])
+
+        return len(computed)
+
+    @staticmethod
+    def verify(db: Session, po_ids: Optional[List[int]] = None) -> List[dict]:
+        """
+        Compare stored balances with recomputed ones.
+
+        Returns:
+            One entry per drifted/missing/orphaned row:
+            {po_line_id, po_id, counter, stored, actual}
+        """
+        computed = POLineLedger.compute(db, po_ids)
+
+        stored_query = db.query(POLineBalance)
+        if po_ids is not None:
+            stored_query = stored_query.filter(POLineBalance.po_id.in_(po_ids))
+        stored = {row.po_line_id: row for row in stored_query}
+
+        problems = []
+        for line_id, actual in computed.items():
+            row = stored.pop(line_id, None)
+            if row is None:
+                problems.append({
+                    "po_line_id": line_id, "po_id": actual["po_id"],
+                    "counter": None, "stored": None, "actual": "missing row",
+                })
+                continue
+
+            for counter in COUNTERS:
+                if Decimal(getattr(row, counter) or 0) != Decimal(actual[counter]):
+                    problems.append({
+                        "po_line_id": line_id, "po_id": actual["po_id"], "counter": counter,
+                        "stored": getattr(row, counter), "actual": actual[counter],
+                    })
+
+        for line_id, row in stored.items():
+            problems.append({
+                "po_line_id": line_id, "po_id": row.po_id,
+                "counter": None, "stored": "orphaned row", "actual": None,
+            })
+
+        return problems
+
+    @staticmethod
+    def _has_balances(db: Session, po_id: int) -> bool:
+        return db.query(POLineBalance.po_line_id).filter(
+            POLineBalance.po_id == po_id
+        ).first() is not None
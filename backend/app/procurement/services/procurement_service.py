@@ -1,21 +1,23 @@
 import random
 import string
 from datetime import datetime
+from enum import Enum
 from typing import List, Optional
-import os
 
-import requests
-
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, lazyload, selectinload
+from sqlalchemy import and_, delete, insert
+from app.core.transactions import transactional_retry
+from app.core import metrics
 from sqlalchemy.exc import IntegrityError
 from app.procurement.models import PurchaseOrder, Item
 from app.procurement.schemas.purchase_order import (PurchaseOrderDetailRead, PurchaseOrderLineDetailRead,)
 from app.procurement.schemas.item import ItemCreate, ItemRead
 from app.store.models.material_dispatch import MaterialDispatch, MaterialDispatchLineItem
-from app.quality.models.material_receipt import MaterialReceipt, MaterialReceiptLine
 from app.store.models.material_dispatch import DispatchStatus, ReferenceType
+from app.procurement.services.item_cache import item_cache
+from app.procurement.services.vendor_client import vendor_client
+from app.procurement.services.po_line_ledger import POLineLedger
+from app.utils.pagination import CountMode, paginate
 
 
 from app.procurement.models import (
@@ -34,9 +36,51 @@ from app.procurement.schemas import (
 )
 
 
+class LineLoading(str, Enum):
+    """How PurchaseOrder.lines is loaded for a query."""
+    JOINED = "joined"      # single query with LEFT OUTER JOIN (single-PO detail)
+    SELECTIN = "selectin"  # one extra SELECT ... WHERE po_id IN (...) (lists)
+    LAZY = "lazy"          # load on first access, one query per PO
+
+
+_LINE_LOADERS = {
+    LineLoading.JOINED: joinedload,
+    LineLoading.SELECTIN: selectinload,
+    LineLoading.LAZY: lazyload,
+}
+
+
 class ProcurementService:
     """Service for procurement-related business logic."""
 
+    @staticmethod
+    def _with_lines(query, line_loading: LineLoading):
+        """Apply the requested loader strategy for PurchaseOrder.lines."""
+        loader = _LINE_LOADERS[LineLoading(line_loading)]
+        return query.options(loader(PurchaseOrder.lines))
+
+    @staticmethod
+    def _to_po_read(po: PurchaseOrder) -> PurchaseOrderRead:
+        return PurchaseOrderRead.model_validate({
+            "id": po.id,
+            "po_number": po.po_number,
+            "vendor_id": po.vendor_id,
+            "vendor_name": po.vendor.name if po.vendor else None,
+            "status": po.status,
+            "created_at": po.created_at,
+            "po_sent_at": po.po_sent_at,
+            "lines": [
+                {
+                    "id": line.id,
+                    "po_id": line.po_id,
+                    "item_id": line.item_id,
+                    "quantity": line.quantity,
+                    "price": line.price,
+                }
+                for line in po.lines
+            ]
+        })
+
     @staticmethod
     def create_item(db: Session, item_data: ItemCreate):
         """
@@ -112,6 +156,52 @@ class ProcurementService:
 # Item name, unit, and description are always derived from Item Master.
 
     @staticmethod
+    def _insert_lines(db: Session, po_id: int, lines) -> List[dict]:
+        """
+        Insert all lines of a PO in one executemany and return them as dicts.
+
+        Uses INSERT ... RETURNING where the backend can combine it with
+        executemany (PostgreSQL, SQLite >= 3.35); otherwise inserts in bulk
+        and reads the new rows back with a single SELECT.
+        """
+        rows = [
+            {
+                "po_id": po_id,
+                "item_id": line.item_id,
+                "quantity": line.quantity,
+                "price": line.price,
+            }
+            for line in lines
+        ]
+        if not rows:
+            return []
+
+        columns = (
+            PurchaseOrderLine.id,
+            PurchaseOrderLine.po_id,
+            PurchaseOrderLine.item_id,
+            PurchaseOrderLine.quantity,
+            PurchaseOrderLine.price,
+        )
+
+        if db.get_bind().dialect.insert_executemany_returning:
+            result = db.execute(
+                insert(PurchaseOrderLine).returning(*columns, sort_by_parameter_order=True),
+                rows,
+            )
+        else:
+            db.execute(insert(PurchaseOrderLine), rows)
+            result = db.execute(
+                db.query(*columns)
+                .filter(PurchaseOrderLine.po_id == po_id)
+                .order_by(PurchaseOrderLine.id)
+                .statement
+            )
+
+        return [dict(row._mapping) for row in result]
+
+    @staticmethod
+    @transactional_retry("create_purchase_order")
     def create_purchase_order(
         db: Session,
         po_create: PurchaseOrderCreate
@@ -155,27 +245,12 @@ class ProcurementService:
             po_id = db_po.id
             po_created_at = db_po.created_at
             
-            # Create purchase order lines
-            lines_data = []
-            for line_create in po_create.lines:
-                db_line = PurchaseOrderLine(
-                    po_id=po_id,
-                    item_id=line_create.item_id,
-                    quantity=line_create.quantity,
-                    price=line_create.price
-                )
-                db.add(db_line)
-                # Capture line data before it gets expired
-                db.flush()
-                lines_data.append({
-                    "id": db_line.id,
-                    "po_id": db_line.po_id,
-                    "item_id": db_line.item_id,
-                    "quantity": db_line.quantity,
-                    "price": db_line.price,
-                })
+            # Create purchase order lines in bulk
+            lines_data = ProcurementService._insert_lines(db, po_id, po_create.lines)
+            POLineLedger.init_pos(db, [po_id])
             
             db.commit()
+            metrics.PURCHASE_ORDERS_CREATED.labels("api").inc()
             
             # Build response dict from captured data
             po_dict = {
@@ -235,25 +310,29 @@ class ProcurementService:
     def get_purchase_orders(
         db: Session,
         status: Optional[POStatus] = None,
-        page: int = 1,
-        page_size: int = 25
+        cursor: Optional[str] = None,
+        limit: int = 25,
+        count_mode: CountMode = CountMode.NONE,
+        line_loading: LineLoading = LineLoading.SELECTIN,
     ) -> dict:
         """
-        Get purchase orders with pagination and optional status filtering.
+        Get purchase orders, newest first, with keyset pagination and
+        optional status filtering.
         
         Args:
             db: Database session
             status: Optional status filter
-            page: Page number (1-indexed)
-            page_size: Number of items per page
+            cursor: Opaque cursor of the previous page (None for the first page)
+            limit: Number of items per page
+            count_mode: Whether to report an exact/approximate total
+            line_loading: Loader strategy for PO lines (selectin by default,
+                so LIMIT applies to POs rather than PO x line rows)
             
         Returns:
             Dictionary with items and pagination metadata
         """
-        if page < 1:
-            page = 1
-        if page_size < 1:
-            page_size = 25
+        if limit < 1:
+            limit = 25
         
         query = db.query(PurchaseOrder)
         
@@ -261,40 +340,17 @@ class ProcurementService:
         if status:
             query = query.filter(PurchaseOrder.status == status)
         
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        offset = (page - 1) * page_size
-        purchase_orders = query.order_by(PurchaseOrder.created_at.desc()).offset(offset).limit(page_size).all()
+        page = paginate(
+            ProcurementService._with_lines(query, line_loading).options(joinedload(PurchaseOrder.vendor)),
+            PurchaseOrder.created_at,
+            PurchaseOrder.id,
+            cursor=cursor,
+            limit=limit,
+            count_mode=count_mode,
+        )
         
-        return {
-            "items": [
-                PurchaseOrderRead.model_validate({
-                    "id": po.id,
-                    "po_number": po.po_number,
-                    "vendor_id": po.vendor_id,
-                    "status": po.status,
-                    "created_at": po.created_at,
-                    "po_sent_at": po.po_sent_at,
-                    "lines": [
-                        {
-                            "id": line.id,
-                            "po_id": line.po_id,
-                            "item_id": line.item_id,
-                            "quantity": line.quantity,
-                            "price": line.price,
-                        }
-                        for line in po.lines
-                    ]
-                })
-                for po in purchase_orders
-            ],
-            "total": total,
-            "page": page,
-            "page_size": page_size,
-            "total_pages": (total + page_size - 1) // page_size
-        }
+        page["items"] = [ProcurementService._to_po_read(po) for po in page["items"]]
+        return page
 
 
     @staticmethod
@@ -312,53 +368,29 @@ class ProcurementService:
         if po.status == POStatus.CANCELLED:
             return []
 
-        # 2️⃣ Subquery: total received per PO line
-        received_subq = (
-            db.query(
-                MaterialReceiptLine.po_line_id.label("po_line_id"),
-                func.coalesce(
-                    func.sum(MaterialReceiptLine.received_quantity), 0
-                ).label("received_qty")
-            )
-            .join(MaterialReceipt, MaterialReceipt.id == MaterialReceiptLine.mr_id)
-            .filter(MaterialReceipt.po_id == po_id)
-            .group_by(MaterialReceiptLine.po_line_id)
-            .subquery()
-        )
+        # 2️⃣ Ordered / received quantities from the PO line ledger
+        balances = POLineLedger.get_po_balances(db, po_id)
 
-        # 3️⃣ Main query: PO lines + received qty
-        results = (
-            db.query(
-                PurchaseOrderLine.id.label("po_line_id"),
-                PurchaseOrderLine.item_id,
-                Item.code.label("item_code"),
-                Item.description.label("item_description"),
-                Item.unit,
-                PurchaseOrderLine.quantity.label("ordered_quantity"),
-                func.coalesce(received_subq.c.received_qty, 0).label("received_quantity"),
-            )
-            .join(Item, Item.id == PurchaseOrderLine.item_id)
-            .outerjoin(
-                received_subq,
-                received_subq.c.po_line_id == PurchaseOrderLine.id
-            )
-            .filter(PurchaseOrderLine.po_id == po_id)
-            .all()
-        )
+        # Item code/description/unit come from the Item master cache
+        items = item_cache.get_many(db, (b.item_id for b in balances))
 
-        # 4️⃣ Build response
+        # 3️⃣ Build response
         response = []
-        for r in results:
-            remaining = r.ordered_quantity - r.received_quantity
+        for b in balances:
+            item = items.get(b.item_id)
+            if not item:
+                continue
+
+            remaining = b.ordered_qty - b.received_qty
             if remaining > 0:
                 response.append({
-                    "po_line_id": r.po_line_id,
-                    "item_id": r.item_id,
-                    "item_code": r.item_code,
-                    "item_description": r.item_description,
-                    "unit": r.unit,
-                    "ordered_quantity": r.ordered_quantity,
-                    "received_quantity": r.received_quantity,
+                    "po_line_id": b.po_line_id,
+                    "item_id": b.item_id,
+                    "item_code": item.code,
+                    "item_description": item.description,
+                    "unit": item.unit,
+                    "ordered_quantity": b.ordered_qty,
+                    "received_quantity": b.received_qty,
                     "remaining_quantity": remaining,
                 })
 
@@ -367,15 +399,33 @@ class ProcurementService:
 
 
     @staticmethod
-    def get_purchase_order(db: Session, po_id: int):
-        db_po = db.query(PurchaseOrder).filter(PurchaseOrder.id == po_id).first()
+    def get_purchase_order(
+        db: Session,
+        po_id: int,
+        line_loading: LineLoading = LineLoading.JOINED,
+    ):
+        """
+        Get PO detail with item master data for every line.
+
+        The PO, its lines and its mirrored vendor load in one joined query;
+        item data is resolved in bulk through the Item master cache, so
+        latency does not grow with the number of lines.
+        """
+        db_po = (
+            ProcurementService._with_lines(db.query(PurchaseOrder), line_loading)
+            .options(joinedload(PurchaseOrder.vendor))
+            .filter(PurchaseOrder.id == po_id)
+            .first()
+        )
 
         if not db_po:
             raise ValueError(f"Purchase order with ID {po_id} not found")
 
+        items = item_cache.get_many(db, (line.item_id for line in db_po.lines))
+
         line_items = []
         for line in db_po.lines:
-            item = db.query(Item).filter(Item.id == line.item_id).first()
+            item = items.get(line.item_id)
 
             line_items.append(
                 PurchaseOrderLineDetailRead(
@@ -393,6 +443,7 @@ class ProcurementService:
             id=db_po.id,
             po_number=db_po.po_number,
             vendor_id=db_po.vendor_id,
+            vendor_name=db_po.vendor.name if db_po.vendor else None,
             status=db_po.status,
             created_at=db_po.created_at,
             po_sent_at=db_po.po_sent_at,
@@ -439,6 +490,7 @@ class ProcurementService:
 
 
     @staticmethod
+    @transactional_retry("update_purchase_order")
     def update_purchase_order(db: Session, po_id: int, po_update: PurchaseOrderUpdate) -> PurchaseOrderRead:
         """
         Update a purchase order. Only allowed when status == DRAFT.
@@ -467,26 +519,15 @@ class ProcurementService:
                 ProcurementService._validate_no_duplicate_items(item_ids)
                 ProcurementService._validate_items_exist(db, item_ids)
 
-                # Clear existing lines through relationship (cascade will delete)
-                db_po.lines.clear()
-                db.flush()
-
-                for line_create in po_update.lines:
-                    db_line = PurchaseOrderLine(
-                        po_id=db_po.id,
-                        item_id=line_create.item_id,
-                        quantity=line_create.quantity,
-                        price=line_create.price,
-                    )
-                    db.add(db_line)
-                    db.flush()
-                    lines_data.append({
-                        "id": db_line.id,
-                        "po_id": db_line.po_id,
-                        "item_id": db_line.item_id,
-                        "quantity": db_line.quantity,
-                        "price": db_line.price,
-                    })
+                # Full replace: one DELETE and one bulk INSERT
+                POLineLedger.delete_pos(db, [db_po.id])
+                db.execute(
+                    delete(PurchaseOrderLine).where(PurchaseOrderLine.po_id == db_po.id)
+                )
+                db.expire(db_po, ["lines"])
+
+                lines_data = ProcurementService._insert_lines(db, db_po.id, po_update.lines)
+                POLineLedger.init_pos(db, [db_po.id])
             else:
                 # Keep existing lines
                 lines_data = [
@@ -518,38 +559,12 @@ class ProcurementService:
             raise e
 
     @staticmethod
-    def get_vendor_details(db: Session, vendor_id: int) -> VendorRead:
+    async def get_vendor_details(vendor_id: int) -> VendorRead:
         """
-        Retrieve vendor details from external Vendor Portal.
-        Falls back safely if service is unavailable.
+        Retrieve vendor details from the external Vendor Portal.
+        Cached and circuit-broken; falls back safely if the portal is unavailable.
         """
-
-        base_url = os.getenv("VENDOR_PORTAL_URL", "http://localhost:9000/api/vendors")
-        url = f"{base_url}/{vendor_id}"
-
-        try:
-            resp = requests.get(url, timeout=2)
-
-            if resp.status_code == 200:
-                data = resp.json()
-                return VendorRead.model_validate({
-                    "id": int(data.get("id", vendor_id)),
-                    "name": data.get("name", "Unknown Vendor"),
-                    "contact": data.get("contact"),
-                    "status": data.get("status", "ACTIVE"),
-                })
-
-        except Exception:
-            pass  # swallow vendor service errors
-
-        # ✅ SAFE FALLBACK — NEVER THROW 500
-        return VendorRead.model_validate({
-            "id": vendor_id,
-            "name": "Unknown Vendor",
-            "contact": None,
-            "status": "UNKNOWN",
-        })
-
+        return await vendor_client.get_vendor(vendor_id)
 
     @staticmethod
     def get_po_tracking_summary(db: Session, po_id: int) -> PurchaseOrderTracking:
@@ -609,50 +624,46 @@ class ProcurementService:
         return PurchaseOrderTracking.model_validate(tracking)
 
     @staticmethod
-    def get_purchase_orders_by_vendor(db: Session, vendor_id: int) -> dict:
+    def get_purchase_orders_by_vendor(
+        db: Session,
+        vendor_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 25,
+        count_mode: CountMode = CountMode.NONE,
+        line_loading: LineLoading = LineLoading.SELECTIN,
+    ) -> dict:
         """
-        Get all purchase orders for a specific vendor.
+        Get purchase orders for a specific vendor, newest first.
         
         Args:
             db: Database session
             vendor_id: Vendor ID
+            cursor: Opaque cursor of the previous page (None for the first page)
+            limit: Number of items per page
+            count_mode: Whether to report an exact/approximate total
+            line_loading: Loader strategy for PO lines
             
         Returns:
-            Dictionary with purchase orders for the vendor
+            Dictionary with the vendor id, items and pagination metadata
             
         Raises:
-            ValueError: If vendor_id is invalid
+            ValueError: If vendor_id or the cursor is invalid
         """
         ProcurementService._validate_vendor_id(vendor_id)
         
-        purchase_orders = db.query(PurchaseOrder).filter(
+        query = db.query(PurchaseOrder).filter(
             PurchaseOrder.vendor_id == vendor_id
-        ).order_by(PurchaseOrder.created_at.desc()).all()
+        )
         
-        return {
-            "vendor_id": vendor_id,
-            "items": [
-                PurchaseOrderRead.model_validate({
-                    "id": po.id,
-                    "po_number": po.po_number,
-                    "vendor_id": po.vendor_id,
-                    "status": po.status,
-                    "created_at": po.created_at,
-                    "po_sent_at": po.po_sent_at,
-                    "lines": [
-                        {
-                            "id": line.id,
-                            "po_id": line.po_id,
-                            "item_id": line.item_id,
-                            "quantity": line.quantity,
-                            "price": line.price,
-                        }
-                        for line in po.lines
-                    ]
-                })
-                for po in purchase_orders
-            ],
-            "total": len(purchase_orders)
-        }
-
-   
\ No newline at end of file
+        page = paginate(
+            ProcurementService._with_lines(query, line_loading).options(joinedload(PurchaseOrder.vendor)),
+            PurchaseOrder.created_at,
+            PurchaseOrder.id,
+            cursor=cursor,
+            limit=limit,
+            count_mode=count_mode,
+        )
+        
+        page["vendor_id"] = vendor_id
+        page["items"] = [ProcurementService._to_po_read(po) for po in page["items"]]
+        return page
@@ -0,0 +1,401 @@
+"""
+Vendor Portal client.
+
+Vendor master data is owned by the Vendor Portal (VENDOR_PORTAL_URL);
+procurement only stores vendor_id. PO screens resolve the same vendors over
+and over, so lookups go through:
+
+- one pooled httpx.AsyncClient per process (keep-alive, bounded connections)
+- a TTL cache served stale-while-revalidate: after VENDOR_CACHE_TTL_SECONDS
+  a vendor is still answered from cache for VENDOR_CACHE_STALE_SECONDS while
+  a single background request refreshes it
+- negative caching of 404s for VENDOR_NEGATIVE_CACHE_SECONDS
+- at most VENDOR_CACHE_MAX_ENTRIES vendors, least recently used evicted
+  first; entries past their stale window are dropped
+- a circuit breaker: after VENDOR_BREAKER_FAILURES consecutive failures the
+  portal is left alone for VENDOR_BREAKER_RESET_SECONDS, then one trial
+  request decides whether it is called again. The vendor list used by the
+  mirror sync has a breaker of its own, so a failing bulk sync does not
+  switch lookups to the fallback (nor the other way round)
+
+Concurrent lookups of the same vendor share one request. Lookups never
+raise: when the portal cannot answer, the last known vendor is returned,
+or the "Unknown Vendor" fallback when there is none.
+
+The client belongs to the event loop it is first used on (uvicorn/gunicorn
+workers run one loop each); main.py closes it on shutdown.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import httpx
+
+from app.core import metrics
+from app.core.config import (
+    VENDOR_BREAKER_FAILURES,
+    VENDOR_BREAKER_RESET_SECONDS,
+    VENDOR_CACHE_MAX_ENTRIES,
+    VENDOR_CACHE_STALE_SECONDS,
+    VENDOR_CACHE_TTL_SECONDS,
+    VENDOR_NEGATIVE_CACHE_SECONDS,
+    VENDOR_PORTAL_MAX_CONNECTIONS,
+    VENDOR_PORTAL_TIMEOUT_SECONDS,
+    VENDOR_PORTAL_URL,
+)
+from app.procurement.schemas.vendor import VendorRead
+
+logger = logging.getLogger(__name__)
+
+
+class VendorPortalError(Exception):
+    """The portal could not be reached or gave an unusable answer."""
+
+
+class CircuitOpenError(VendorPortalError):
+    """The portal was not called because the circuit breaker is open."""
+
+
+def fallback_vendor(vendor_id: int) -> VendorRead:
+    return VendorRead(id=vendor_id, name="Unknown Vendor", contact=None, status="UNKNOWN")
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    CLOSED: calls go through. After `failure_threshold` failures in a row it
+    turns OPEN and rejects calls for `reset_timeout` seconds, then HALF_OPEN
+    lets exactly one trial call through: success closes it, failure opens it
+    for another `reset_timeout`. Not thread-safe; used from one event loop.
+    """
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+        name: str = "lookup",
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info(f"[VENDOR] Portal recovered, {self.name} circuit closed")
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        metrics.VENDOR_BREAKER_OPEN.labels(self.name).set(0)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning(
+                    f"[VENDOR] {self._failures} consecutive portal failures, "
+                    f"{self.name} circuit open for {self.reset_timeout:g}s"
+                )
+            self._opened_at = self._clock()
+            self._trial_in_flight = False
+            metrics.VENDOR_BREAKER_OPEN.labels(self.name).set(1)
+
+    def release(self) -> None:
+        """A call ended without an outcome (cancelled): free the trial slot."""
+        self._trial_in_flight = False
+
+
+class VendorPage(NamedTuple):
+    """One page of the portal's vendor list."""
+    vendors: List[dict]                 # id, name, contact, status, portal_updated_at
+    next_cursor: Optional[str]
+
+
+class _Entry(NamedTuple):
+    vendor: Optional[VendorRead]        # None: the portal answered 404
+    fresh_until: float
+    stale_until: float
+
+
+class VendorClient:
+    """Cached, circuit-broken lookups against the Vendor Portal."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float,
+        max_connections: int,
+        ttl_seconds: int,
+        stale_seconds: int,
+        negative_ttl_seconds: int,
+        breaker: CircuitBreaker,
+        list_breaker: Optional[CircuitBreaker] = None,
+        max_entries: int = 10000,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.ttl = ttl_seconds
+        self.stale = stale_seconds
+        self.negative_ttl = negative_ttl_seconds
+        self.breaker = breaker
+        self.list_breaker = list_breaker or CircuitBreaker(
+            breaker.failure_threshold, breaker.reset_timeout, name="list"
+        )
+        self._http: Optional[httpx.AsyncClient] = None
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()     # least recently used first
+        self._inflight: Dict[int, asyncio.Task] = {}
+
+    # ---------- Public API ----------
+
+    async def get_vendor(self, vendor_id: int) -> VendorRead:
+        now = time.monotonic()
+        entry = self._cached(vendor_id, now)
+
+        if entry and now < entry.fresh_until:
+            metrics.VENDOR_LOOKUPS.labels("fresh" if entry.vendor else "negative").inc()
+            return entry.vendor or fallback_vendor(vendor_id)
+
+        if entry and entry.vendor and now < entry.stale_until:
+            metrics.VENDOR_LOOKUPS.labels("stale").inc()
+            self._load(vendor_id)               # refresh in the background
+            return entry.vendor
+
+        try:
+            # shield: a cancelled caller must not cancel the shared request
+            vendor = await asyncio.shield(self._load(vendor_id))
+        except VendorPortalError as e:
+            if entry and entry.vendor:
+                metrics.VENDOR_LOOKUPS.labels("stale_on_error").inc()
+                return entry.vendor
+            metrics.VENDOR_LOOKUPS.labels("fallback").inc()
+            logger.debug(f"[VENDOR] Fallback for vendor {vendor_id}: {e}")
+            return fallback_vendor(vendor_id)
+
+        metrics.VENDOR_LOOKUPS.labels("fetched" if vendor else "not_found").inc()
+        return vendor or fallback_vendor(vendor_id)
+
+    async def get_vendors(self, vendor_ids: Iterable[int]) -> Dict[int, VendorRead]:
+        """Look several vendors up concurrently; returns {vendor_id: VendorRead}."""
+        ids = list(dict.fromkeys(vendor_ids))
+        vendors = await asyncio.gather(*(self.get_vendor(vendor_id) for vendor_id in ids))
+        return dict(zip(ids, vendors))
+
+    async def list_vendors(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        updated_since: Optional[datetime] = None,
+    ) -> VendorPage:
+        """
+        One page of GET VENDOR_PORTAL_URL?limit=&cursor=&updated_since=.
+
+        The portal answers {"items": [...], "next_cursor": ...}; a plain JSON
+        list is taken as the only page. A portal that ignores updated_since
+        just returns everything. Not cached; goes through list_breaker.
+
+        Raises:
+            VendorPortalError: If the portal fails or the breaker is open
+        """
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        if updated_since:
+            params["updated_since"] = updated_since.replace(tzinfo=timezone.utc).isoformat()
+
+        async def request() -> VendorPage:
+            try:
+                resp = await self._client().get(self.base_url, params=params)
+            except httpx.HTTPError as e:
+                raise VendorPortalError(f"{type(e).__name__}: {e}") from e
+            if resp.status_code != 200:
+                raise VendorPortalError(f"HTTP {resp.status_code}")
+
+            try:
+                data = resp.json()
+                if isinstance(data, list):
+                    items, next_cursor = data, None
+                else:
+                    items, next_cursor = data["items"], data.get("next_cursor")
+                return VendorPage([_parse_vendor(item) for item in items], next_cursor or None)
+            except (ValueError, TypeError, KeyError) as e:
+                raise VendorPortalError(f"Invalid vendor list payload: {e!r}") from e
+
+        return await self._guarded(request, self.list_breaker)
+
+    def invalidate(self, vendor_id: Optional[int] = None) -> None:
+        """Drop one vendor (or the whole cache when vendor_id is None)."""
+        if vendor_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(vendor_id, None)
+
+    async def aclose(self) -> None:
+        for task in list(self._inflight.values()):
+            task.cancel()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    # ---------- Internals ----------
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._http
+
+    def _cached(self, vendor_id: int, now: float) -> Optional[_Entry]:
+        """The cache entry, marked as recently used; None once past stale_until."""
+        entry = self._entries.get(vendor_id)
+        if entry is None:
+            return None
+        if now >= entry.stale_until:
+            del self._entries[vendor_id]
+            return None
+        self._entries.move_to_end(vendor_id)
+        return entry
+
+    def _store(self, vendor_id: int, entry: _Entry, now: float) -> None:
+        self._entries[vendor_id] = entry
+        self._entries.move_to_end(vendor_id)
+
+        # Expired entries that are also the least recently used go first,
+        # then the size bound
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if now < oldest.stale_until:
+                break
+            self._entries.popitem(last=False)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, vendor_id: int) -> asyncio.Task:
+        """The in-flight request for this vendor, started if there is none."""
+        task = self._inflight.get(vendor_id)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(vendor_id))
+            self._inflight[vendor_id] = task
+            task.add_done_callback(lambda done: self._finish(vendor_id, done))
+        return task
+
+    def _finish(self, vendor_id: int, task: asyncio.Task) -> None:
+        if self._inflight.get(vendor_id) is task:
+            del self._inflight[vendor_id]
+        if not task.cancelled():
+            task.exception()                    # background refreshes: mark as retrieved
+
+    async def _guarded(self, call: Callable[[], Awaitable], breaker: CircuitBreaker):
+        """Run one portal request through a circuit breaker."""
+        if not breaker.allow():
+            raise CircuitOpenError(f"vendor portal {breaker.name} circuit is open")
+
+        try:
+            result = await call()
+        except VendorPortalError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_success()
+        return result
+
+    async def _fetch(self, vendor_id: int) -> Optional[VendorRead]:
+        vendor = await self._guarded(lambda: self._request(vendor_id), self.breaker)
+
+        now = time.monotonic()
+        if vendor is None:
+            expires_at = now + self.negative_ttl
+            self._store(vendor_id, _Entry(None, expires_at, expires_at), now)
+        else:
+            self._store(vendor_id, _Entry(vendor, now + self.ttl, now + self.ttl + self.stale), now)
+        return vendor
+
+    async def _request(self, vendor_id: int) -> Optional[VendorRead]:
+        try:
+            resp = await self._client().get(f"{self.base_url}/{vendor_id}")
+        except httpx.HTTPError as e:
+            raise VendorPortalError(f"{type(e).__name__}: {e}") from e
+
+        if resp.status_code == 404:
+            return None
+        if resp.status_code != 200:
+            raise VendorPortalError(f"HTTP {resp.status_code}")
+
+        try:
+            data = resp.json()
+            if not isinstance(data, dict):
+                raise ValueError("expected a JSON object")
+            return VendorRead.model_validate({
+                "id": int(data.get("id", vendor_id)),
+                "name": data.get("name", "Unknown Vendor"),
+                "contact": data.get("contact"),
+                "status": data.get("status", "ACTIVE"),
+            })
+        except ValueError as e:
+            raise VendorPortalError(f"Invalid vendor payload: {e}") from e
+
+
+def _parse_vendor(item: dict) -> dict:
+    """Vendor list item -> vendors row values (timestamps as naive UTC)."""
+    updated_at = item.get("updated_at")
+    if updated_at:
+        updated_at = datetime.fromisoformat(updated_at)
+        if updated_at.tzinfo is not None:
+            updated_at = updated_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return {
+        "id": int(item["id"]),
+        "name": item.get("name") or f"Vendor #{item['id']}",
+        "contact": item.get("contact"),
+        "status": item.get("status") or "ACTIVE",
+        "portal_updated_at": updated_at,
+    }
+
+
+vendor_client = VendorClient(
+    base_url=VENDOR_PORTAL_URL,
+    timeout=VENDOR_PORTAL_TIMEOUT_SECONDS,
+    max_connections=VENDOR_PORTAL_MAX_CONNECTIONS,
+    ttl_seconds=VENDOR_CACHE_TTL_SECONDS,
+    stale_seconds=VENDOR_CACHE_STALE_SECONDS,
+    negative_ttl_seconds=VENDOR_NEGATIVE_CACHE_SECONDS,
+    max_entries=VENDOR_CACHE_MAX_ENTRIES,
+    breaker=CircuitBreaker(VENDOR_BREAKER_FAILURES, VENDOR_BREAKER_RESET_SECONDS),
+    list_breaker=CircuitBreaker(VENDOR_BREAKER_FAILURES, VENDOR_BREAKER_RESET_SECONDS, name="list"),
+)
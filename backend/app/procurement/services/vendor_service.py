@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.procurement.models import Vendor, VendorSyncState
+from app.procurement.schemas import VendorRead
+from app.utils.pagination import CountMode, paginate
+
+# Vendor ids per GET /procurement/vendors?ids=... request
+MAX_VENDOR_IDS = 100
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+_SYNCED_COLUMNS = ("name", "contact", "status", "portal_updated_at", "synced_at")
+_SYNC_STATE_ID = 1
+
+
+class VendorService:
+    """Reads and sync writes of the local vendor master mirror."""
+
+    @staticmethod
+    def get_vendor(db: Session, vendor_id: int) -> Optional[VendorRead]:
+        vendor = db.get(Vendor, vendor_id)
+        return VendorRead.model_validate(vendor) if vendor else None
+
+    @staticmethod
+    def get_vendor_name(db: Session, vendor_id: int) -> Optional[str]:
+        vendor = db.get(Vendor, vendor_id)
+        return vendor.name if vendor else None
+
+    @staticmethod
+    def search_vendors(
+        db: Session,
+        q: Optional[str] = None,
+        status: Optional[str] = None,
+        ids: Optional[List[int]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 25,
+        count_mode: CountMode = CountMode.NONE,
+    ) -> dict:
+        """
+        Search the vendor mirror, ordered by name, with keyset pagination.
+
+        Args:
+            db: Database session
+            q: Case-insensitive part of the vendor name
+            status: Optional status filter (ACTIVE, INACTIVE, ...)
+            ids: Optional vendor ids to restrict the search to
+            cursor: Opaque cursor of the previous page (None for the first page)
+            limit: Number of items per page
+            count_mode: Whether to report an exact/approximate total
+
+        Returns:
+            Dictionary with items and pagination metadata
+
+        Raises:
+            ValueError: If more than MAX_VENDOR_IDS ids are given or the cursor is invalid
+        """
+        if ids and len(ids) > MAX_VENDOR_IDS:
+            raise ValueError(f"At most {MAX_VENDOR_IDS} vendor ids per request")
+
+        query = db.query(Vendor)
+        if q and q.strip():
+            pattern = q.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            query = query.filter(Vendor.name.ilike(f"%{pattern}%", escape="\\"))
+        if status:
+            query = query.filter(Vendor.status == status.upper())
+        if ids:
+            query = query.filter(Vendor.id.in_(ids))
+
+        page = paginate(
+            query,
+            Vendor.name,
+            Vendor.id,
+            cursor=cursor,
+            limit=limit,
+            count_mode=count_mode,
+            descending=False,
+        )
+        page["items"] = [VendorRead.model_validate(v) for v in page["items"]]
+        return page
+
+    @staticmethod
+    def sync_watermark(db: Session) -> Optional[datetime]:
+        """Start time of the last complete sync (None before the first one)."""
+        state = db.get(VendorSyncState, _SYNC_STATE_ID)
+        return state.watermark if state else None
+
+    @staticmethod
+    def set_sync_watermark(db: Session, watermark: datetime) -> None:
+        """Record a complete sync that started at `watermark`. The caller commits."""
+        db.merge(VendorSyncState(id=_SYNC_STATE_ID, watermark=watermark, completed_at=datetime.utcnow()))
+
+    @staticmethod
+    def upsert_vendors(db: Session, vendors: List[dict]) -> int:
+        """
+        Insert or update one page of vendors from the portal in a single
+        statement (INSERT ... ON CONFLICT on PostgreSQL and SQLite).
+        The caller commits.
+        """
+        if not vendors:
+            return 0
+
+        now = datetime.utcnow()
+        rows = [{**vendor, "synced_at": now} for vendor in vendors]
+
+        upsert = _UPSERTS.get(db.get_bind().dialect.name)
+        if upsert is None:
+            for row in rows:
+                db.merge(Vendor(**row))
+            return len(rows)
+
+        stmt = upsert(Vendor).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Vendor.id],
+            set_={column: stmt.excluded[column] for column in _SYNCED_COLUMNS},
+        )
+        db.execute(stmt)
+        return len(rows)
@@ -0,0 +1,124 @@
+"""
+Synchronize the local vendor master mirror (vendors table) from the Vendor Portal.
+
+    python -m app.procurement.sync_vendors           # incremental (updated_since)
+    python -m app.procurement.sync_vendors --full    # re-read every vendor
+
+Pages of VENDOR_SYNC_PAGE_SIZE vendors are upserted and committed one at a
+time. Only after the last page is the sync watermark (vendor_sync_state)
+moved to the time the run started, so a run that fails part-way is simply
+repeated from the previous watermark. Incremental runs ask the portal for
+vendors updated since the watermark minus VENDOR_SYNC_OVERLAP_SECONDS (for
+clock skew and late portal commits); without a watermark they read every
+vendor. Upserts are idempotent, so overlapping runs are harmless. Vendors
+removed on the portal are not deleted: the portal marks them with a status
+instead.
+
+Run it from cron on one host. For single-worker setups without cron, app
+workers can instead sync every VENDOR_SYNC_INTERVAL_SECONDS (off by default,
+see run_periodic_sync).
+"""
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from app.core import metrics
+from app.core.config import (
+    VENDOR_SYNC_OVERLAP_SECONDS,
+    VENDOR_SYNC_PAGE_SIZE,
+)
+from app.core.db import AsyncSessionLocal, async_engine
+from app.procurement.services.vendor_client import VendorPortalError, vendor_client
+from app.procurement.services.vendor_service import VendorService
+
+logger = logging.getLogger(__name__)
+
+
+async def sync_vendors(full: bool = False, page_size: int = VENDOR_SYNC_PAGE_SIZE) -> int:
+    """
+    Pull the vendor list from the portal into the mirror.
+
+    Returns:
+        Number of vendors upserted
+
+    Raises:
+        VendorPortalError: If the portal fails mid-way (pages already
+            committed are kept; the watermark is not moved, so the next
+            run reads the same changes again)
+    """
+    started = time.perf_counter()
+    run_started_at = datetime.utcnow()
+    upserted = pages = 0
+
+    async with AsyncSessionLocal() as db:
+        since = None if full else await db.run_sync(VendorService.sync_watermark)
+        if since is not None:
+            since -= timedelta(seconds=VENDOR_SYNC_OVERLAP_SECONDS)
+
+        cursor = None
+        while True:
+            page = await vendor_client.list_vendors(page_size, cursor=cursor, updated_since=since)
+            if page.vendors:
+                upserted += await db.run_sync(VendorService.upsert_vendors, page.vendors)
+                await db.commit()
+            pages += 1
+            if not page.next_cursor:
+                break
+            cursor = page.next_cursor
+
+        await db.run_sync(VendorService.set_sync_watermark, run_started_at)
+        await db.commit()
+
+    metrics.VENDOR_SYNC_LAST_SUCCESS.set_to_current_time()
+    logger.info(
+        f"[VENDOR SYNC] {'Incremental' if since else 'Full'} sync: {upserted} vendors "
+        f"in {pages} pages, {time.perf_counter() - started:.1f}s",
+        extra={"vendors": upserted, "since": since.isoformat() if since else None},
+    )
+    return upserted
+
+
+async def run_periodic_sync(interval: float) -> None:
+    """Incremental sync every `interval` seconds until cancelled (app workers)."""
+    # Spread the workers of one deployment over the interval
+    await asyncio.sleep(random.uniform(0, min(interval, 60)))
+    while True:
+        try:
+            await sync_vendors()
+        except asyncio.CancelledError:
+            raise
+        except VendorPortalError as e:
+            logger.warning(f"[VENDOR SYNC] Portal unavailable, retrying in {interval:g}s: {e}")
+        except Exception:
+            logger.exception("[VENDOR SYNC] Sync failed")
+        await asyncio.sleep(interval)
+
+
+async def _main(full: bool, page_size: int) -> int:
+    try:
+        return await sync_vendors(full=full, page_size=page_size)
+    finally:
+        await vendor_client.aclose()
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync the vendor mirror from the Vendor Portal")
+    parser.add_argument("--full", action="store_true", help="re-read every vendor instead of recent changes")
+    parser.add_argument("--page-size", type=int, default=VENDOR_SYNC_PAGE_SIZE)
+    args = parser.parse_args()
+
+    try:
+        upserted = asyncio.run(_main(args.full, args.page_size))
+    except VendorPortalError as e:
+        print(f"❌ Vendor sync failed: {e}")
+        sys.exit(1)
+    print(f"✅ Synced {upserted} vendors")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,15 +30,18 @@ class GatePass(Base):
         cascade="all, delete-orphan"
     )
 
-Index("idx_gate_pass_store_status", GatePass.store_status)
+# (store_status, issued_at) also serves plain store_status filters
+Index("idx_gate_pass_status_issued", GatePass.store_status, GatePass.issued_at)
 Index("idx_gate_pass_inspection", GatePass.inspection_id)
+Index("idx_gate_pass_mr", GatePass.mr_id)
+Index("idx_gate_pass_po", GatePass.po_id)
 
 
 class GatePassItem(Base):
     __tablename__ = "gate_pass_items"
 
     id = Column(Integer, primary_key=True)
-    gate_pass_id = Column(Integer, ForeignKey("gate_passes.id"), nullable=False)
+    gate_pass_id = Column(Integer, ForeignKey("gate_passes.id"), nullable=False, index=True)
 
     item_id = Column(Integer, nullable=False)
     accepted_quantity = Column(Integer, nullable=False)
@@ -32,8 +32,8 @@ class QualityInspectionLine(Base):
 
     id = Column(Integer, primary_key=True, index=True)
 
-    inspection_id = Column(Integer, ForeignKey("quality_inspections.id"))
-    mr_line_id = Column(Integer, nullable=False)
+    inspection_id = Column(Integer, ForeignKey("quality_inspections.id"), index=True)
+    mr_line_id = Column(Integer, nullable=False, index=True)
 
     accepted_quantity = Column(Integer, nullable=False)
     rejected_quantity = Column(Integer, nullable=False)
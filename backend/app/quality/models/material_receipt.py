@@ -26,7 +26,7 @@ class MaterialReceipt(Base):
     vehicle_no = Column(String(50), nullable=True)
     challan_no = Column(String(50), nullable=True)
 
-    store_id = Column(Integer, nullable=True)
+    store_id = Column(Integer, nullable=True, index=True)
     bin_id = Column(Integer, nullable=True)
 
     remarks = Column(String(500), nullable=True)
@@ -47,8 +47,8 @@ class MaterialReceiptLine(Base):
 
     id = Column(Integer, primary_key=True, index=True)
 
-    mr_id = Column(Integer, ForeignKey("material_receipts.id"), nullable=False)
-    po_line_id = Column(Integer, nullable=False)
+    mr_id = Column(Integer, ForeignKey("material_receipts.id"), nullable=False, index=True)
+    po_line_id = Column(Integer, nullable=False, index=True)
 
     ordered_quantity = Column(Integer, nullable=False)
     received_quantity = Column(Integer, nullable=False)
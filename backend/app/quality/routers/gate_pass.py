@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.db import get_db
+from app.core.db import get_async_read_db, get_db, get_read_db
 from app.quality.schemas.gate_pass import GatePassRead
 from app.quality.services.gate_pass_service import GatePassService
 from app.quality.schemas.gate_pass import GatePassCreate
 from app.quality.models.gate_pass import GatePass
+from app.utils.pagination import CountMode, set_page_headers
 
 router = APIRouter(prefix="/gate-pass", tags=["Quality - Gate Pass"])
 
@@ -27,20 +29,33 @@ def generate_gate_pass(
 
 @router.get("/", response_model=list[GatePassRead])
 def list_gate_passes(
+    response: Response,
     store_status: str | None = None,
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    count: CountMode = Query(CountMode.NONE, description="Report total in X-Total-Count"),
+    db: Session = Depends(get_read_db)
 ):
-    return GatePassService.list_gate_passes(
-        db=db,
-        store_status=store_status
-    )
+    try:
+        page = GatePassService.list_gate_passes(
+            db=db,
+            store_status=store_status,
+            cursor=cursor,
+            limit=limit,
+            count_mode=count,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    set_page_headers(response, page)
+    return page["items"]
 
 @router.get(
     "/pending",
     response_model=list[GatePassRead]
 )
 def get_pending_gate_passes_for_store(
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     return db.query(GatePass).filter(
         GatePass.store_status == "PENDING"
@@ -54,7 +69,7 @@ def get_pending_gate_passes_for_store(
 )
 def get_gate_pass_by_inspection(
     inspection_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     gate_pass = db.query(GatePass).filter(
         GatePass.inspection_id == inspection_id
@@ -70,12 +85,16 @@ def get_gate_pass_by_inspection(
 
 
 @router.get("/{gate_pass_id}", response_model=GatePassRead)
-def get_gate_pass(
+async def get_gate_pass(
     gate_pass_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
+    # Serialize inside run_sync: `items` is lazy-loaded
+    def load(session: Session) -> GatePassRead:
+        return GatePassRead.model_validate(GatePassService.get_gate_pass(session, gate_pass_id))
+
     try:
-        return GatePassService.get_gate_pass(db, gate_pass_id)
+        return await db.run_sync(load)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.core.db import get_db
+from app.core.db import get_db, get_read_db
 from app.quality.schemas.inspection import (
     InspectionCreate,
     InspectionRead
@@ -24,7 +24,7 @@ def inspect_material(
 
 
 @router.get("/{inspection_id}", response_model=InspectionRead)
-def get_inspection(inspection_id: int, db: Session = Depends(get_db)):
+def get_inspection(inspection_id: int, db: Session = Depends(get_read_db)):
     inspection = InspectionService.get_inspection(db, inspection_id)
     if not inspection:
         raise HTTPException(status_code=404, detail="Inspection not found")
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.db import get_db
+from app.core.db import get_async_read_db, get_db, get_read_db
 from app.quality.schemas.material_receipt import (
     MaterialReceiptCreate,
     MaterialReceiptRead
 )
 from app.quality.services.material_receipt_service import MaterialReceiptService
+from app.utils.pagination import CountMode, set_page_headers
 
 router = APIRouter(prefix="/material-receipt", tags=["Quality - Material Receipt"])
 
@@ -22,8 +24,23 @@ def create_material_receipt(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/", response_model=list[MaterialReceiptRead])
-def list_material_receipts(db: Session = Depends(get_db)):
-    return MaterialReceiptService.list_material_receipts(db)
+async def list_material_receipts(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    count: CountMode = Query(CountMode.NONE, description="Report total in X-Total-Count"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    try:
+        page = await db.run_sync(
+            MaterialReceiptService.list_material_receipts,
+            limit=limit, cursor=cursor, count_mode=count,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    set_page_headers(response, page)
+    return page["items"]
 
 @router.put("/{mr_id}", response_model=MaterialReceiptRead)
 def update_material_receipt(
@@ -39,7 +56,7 @@ def update_material_receipt(
 
 
 @router.get("/{mr_id}", response_model=MaterialReceiptRead)
-def get_material_receipt(mr_id: int, db: Session = Depends(get_db)):
+def get_material_receipt(mr_id: int, db: Session = Depends(get_read_db)):
     mr = MaterialReceiptService.get_material_receipt(db, mr_id)
     if not mr:
         raise HTTPException(status_code=404, detail="Material Receipt not found")
@@ -1,3 +1,5 @@
+import random
+import string
 from sqlalchemy.orm import Session
 from datetime import datetime
 
@@ -14,10 +16,19 @@ from app.quality.models.gate_pass import (
     GatePassItem
 )
 from app.procurement.models.purchase_order_line import PurchaseOrderLine
+from app.procurement.services.po_line_ledger import POLineLedger
+from app.utils.pagination import CountMode, paginate
 
 
 class GatePassService:
 
+    @staticmethod
+    def _generate_gate_pass_number() -> str:
+        """Generate a unique gate pass number."""
+        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        random_suffix = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+        return f"GP-{timestamp}-{random_suffix}"
+
     @staticmethod
     def generate_gate_pass(db: Session, inspection_id: int, issued_by: str, vendor_name: str | None = None, component_details: str | None = None):
         """
@@ -59,7 +70,7 @@ class GatePassService:
 
         # 6️⃣ Create Gate Pass header
         gate_pass = GatePass(
-            gate_pass_number=f"GP-{int(datetime.utcnow().timestamp())}",
+            gate_pass_number=GatePassService._generate_gate_pass_number(),
             po_id=mr.po_id,
             mr_id=mr.id,
             inspection_id=inspection.id,
@@ -73,6 +84,7 @@ class GatePassService:
         db.flush()  # generate gate_pass.id
 
         # 7️⃣ Create Gate Pass items (accepted quantities only)
+        gate_passed_deltas = {}
         for inspection_line in inspection.lines:
             if inspection_line.accepted_quantity <= 0:
                 continue
@@ -101,10 +113,15 @@ class GatePassService:
             )
 
             db.add(gate_pass_item)
+            gate_passed_deltas[po_line.id] = (
+                gate_passed_deltas.get(po_line.id, 0) + inspection_line.accepted_quantity
+            )
 
         # 9️⃣ Update MR status after gate pass
         mr.status = "GATE_PASSED"
 
+        POLineLedger.add(db, mr.po_id, "gate_passed_qty", gate_passed_deltas)
+
         # 8️⃣ Commit transaction
         db.commit()
         db.refresh(gate_pass)
@@ -125,14 +142,26 @@ class GatePassService:
     @staticmethod
     def list_gate_passes(
         db: Session,
-        store_status: str | None = None
-    ):
+        store_status: str | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+        count_mode: CountMode = CountMode.NONE,
+    ) -> dict:
         query = db.query(GatePass)
 
         if store_status:
             query = query.filter(GatePass.store_status == store_status)
 
-        return query.order_by(GatePass.issued_at.desc()).all()
+        # Paged by id alone: issued_at is nullable, and a NULL cannot be
+        # encoded in a keyset cursor (ids grow with issue time anyway)
+        return paginate(
+            query,
+            None,
+            GatePass.id,
+            cursor=cursor,
+            limit=limit,
+            count_mode=count_mode,
+        )
 
     @staticmethod
     def dispatch_to_store(db: Session, gate_pass_id: int):
@@ -9,6 +9,7 @@ from app.quality.models.inspection import (
     QualityInspection,
     QualityInspectionLine
 )
+from app.procurement.services.po_line_ledger import POLineLedger
 
 
 class InspectionService:
@@ -47,6 +48,8 @@ class InspectionService:
         total_received = 0
         total_accepted = 0
         total_rejected = 0
+        accepted_deltas = {}
+        rejected_deltas = {}
 
         # 4️⃣ Validate & save inspection lines
         for line in data.lines:
@@ -76,6 +79,8 @@ class InspectionService:
             total_received += mr_line.received_quantity
             total_accepted += line.accepted_quantity
             total_rejected += line.rejected_quantity
+            accepted_deltas[mr_line.po_line_id] = accepted_deltas.get(mr_line.po_line_id, 0) + accepted
+            rejected_deltas[mr_line.po_line_id] = rejected_deltas.get(mr_line.po_line_id, 0) + rejected
 
             db.add(inspection_line)
 
@@ -90,6 +95,10 @@ class InspectionService:
         # 6️⃣ Update MR status
         mr.status = "INSPECTED"
 
+        # 7️⃣ Update PO line ledger in the same transaction
+        POLineLedger.add(db, mr.po_id, "accepted_qty", accepted_deltas)
+        POLineLedger.add(db, mr.po_id, "rejected_qty", rejected_deltas)
+
         db.commit()
         db.refresh(inspection)
         return inspection
@@ -1,22 +1,43 @@
+import random
+import string
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 
 from app.quality.models.material_receipt import (
     MaterialReceipt,
     MaterialReceiptLine
 )
 from app.procurement.models.purchase_order import PurchaseOrder
-from app.procurement.models.purchase_order_line import PurchaseOrderLine
+from app.procurement.models.po_line_balance import POLineBalance
+from app.procurement.services.po_line_ledger import POLineLedger
+from app.procurement.services.vendor_service import VendorService
 from app.procurement.schemas.purchase_order import POStatus
 from app.store.models.store import Store, Bin
 from app.quality.schemas.material_receipt import MaterialReceiptRead
+from app.utils.pagination import CountMode, paginate
 
 
 
 class MaterialReceiptService:
 
+    @staticmethod
+    def _generate_mr_number() -> str:
+        """Generate a unique material receipt number."""
+        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        random_suffix = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+        return f"MR-{timestamp}-{random_suffix}"
+
+    @staticmethod
+    def _get_po_receipt_summary(db: Session, po_id: int) -> dict:
+        """Return {po_line_id: total received quantity} across all MRs of a PO."""
+        return dict(
+            db.query(POLineBalance.po_line_id, POLineBalance.received_qty)
+            .filter(POLineBalance.po_id == po_id)
+            .all()
+        )
+
     @staticmethod
     def create_material_receipt(db: Session, data):
         # 1️⃣ Validate PO exists
@@ -35,12 +56,13 @@ class MaterialReceiptService:
 
         # 2️⃣ Create Material Receipt header (UPDATED)
         mr = MaterialReceipt(
-            mr_number=f"MR-{int(datetime.utcnow().timestamp())}",
+            mr_number=MaterialReceiptService._generate_mr_number(),
 
             po_id=data.po_id,
             vendor_id=data.vendor_id,
 
-            vendor_name=data.vendor_name,
+            # Fall back to the vendor mirror when the client sends no name
+            vendor_name=data.vendor_name or VendorService.get_vendor_name(db, data.vendor_id),
             component_details=data.component_details,
 
             bill_no=data.bill_no,
@@ -65,6 +87,7 @@ class MaterialReceiptService:
         po_lines = {line.id: line for line in po.lines}
 
         # 4️⃣ Validate & create MR lines
+        received_deltas = {}
         for item in data.lines:
             po_line = po_lines.get(item.po_line_id)
 
@@ -84,38 +107,22 @@ class MaterialReceiptService:
             )
 
             db.add(mr_line)
-
-        db.commit()
-        db.refresh(mr)
+            received_deltas[po_line.id] = received_deltas.get(po_line.id, 0) + item.received_quantity
 
         # 5️⃣ Update PO status based on cumulative receipts
-        all_po_lines = (
-            db.query(PurchaseOrderLine)
-            .filter(PurchaseOrderLine.po_id == po.id)
-            .all()
-        )
+        # (ledger counters, committed together with the MR)
+        POLineLedger.add(db, po.id, "received_qty", received_deltas)
+        received = MaterialReceiptService._get_po_receipt_summary(db, po.id)
 
         fully_received = True
         partially_received = False
 
-        for po_line in all_po_lines:
-            total_received = (
-                db.query(MaterialReceiptLine)
-                .join(MaterialReceipt)
-                .filter(
-                    MaterialReceipt.po_id == po.id,
-                    MaterialReceiptLine.po_line_id == po_line.id
-                )
-                .with_entities(
-                    func.coalesce(func.sum(MaterialReceiptLine.received_quantity), 0)
-                )
-                .scalar()
-            )
+        for po_line in po.lines:
+            total_received = received.get(po_line.id, 0)
 
-            if total_received == 0:
-                fully_received = False
-            elif total_received < po_line.quantity:
+            if total_received < po_line.quantity:
                 fully_received = False
+            if total_received > 0:
                 partially_received = True
 
         if fully_received:
@@ -124,21 +131,7 @@ class MaterialReceiptService:
             po.status = POStatus.PARTIALLY_RECEIVED
 
         db.commit()
-        db.refresh(po)
-
-        # ADD THIS FUNCTION
-        def _get_po_receipt_summary(db, po_id):
-            results = (
-                db.query(
-                    MaterialReceiptLine.po_line_id,
-                    func.coalesce(func.sum(MaterialReceiptLine.received_quantity), 0).label("received")
-                )
-                .join(MaterialReceipt)
-                .filter(MaterialReceipt.po_id == po_id)
-                .group_by(MaterialReceiptLine.po_line_id)
-                .all()
-            )
-            return {r.po_line_id: r.received for r in results}
+        db.refresh(mr)
 
         return mr
     
@@ -163,6 +156,10 @@ class MaterialReceiptService:
             setattr(mr, field, getattr(data, field))
 
         # 🔥 Replace lines safely
+        received_deltas = {}
+        for line in mr.lines:
+            received_deltas[line.po_line_id] = received_deltas.get(line.po_line_id, 0) - line.received_quantity
+
         mr.lines.clear()
         db.flush()
 
@@ -174,6 +171,9 @@ class MaterialReceiptService:
                     received_quantity=item.received_quantity,
                 )
             )
+            received_deltas[item.po_line_id] = received_deltas.get(item.po_line_id, 0) + item.received_quantity
+
+        POLineLedger.add(db, mr.po_id, "received_qty", received_deltas)
 
         db.commit()
         db.refresh(mr)
@@ -181,34 +181,64 @@ class MaterialReceiptService:
 
 
     @staticmethod
-    def list_material_receipts(db: Session):
-        receipts = (
-            db.query(MaterialReceipt)
-            .order_by(MaterialReceipt.received_at.desc())
-            .all()
+    def _resolve_locations(db: Session, receipts):
+        """
+        Bulk-resolve store names and bin numbers for a set of receipts.
+
+        One IN query per table instead of one query per receipt.
+        """
+        store_ids = {mr.store_id for mr in receipts if mr.store_id}
+        bin_ids = {mr.bin_id for mr in receipts if mr.bin_id}
+
+        stores = (
+            dict(db.query(Store.id, Store.name).filter(Store.id.in_(store_ids)).all())
+            if store_ids else {}
         )
+        bins = (
+            dict(db.query(Bin.id, Bin.bin_no).filter(Bin.id.in_(bin_ids)).all())
+            if bin_ids else {}
+        )
+        return stores, bins
 
-        result = []
+    @staticmethod
+    def list_material_receipts(
+        db: Session,
+        limit: int = 100,
+        cursor: str | None = None,
+        count_mode: CountMode = CountMode.NONE,
+    ) -> dict:
+        """
+        List material receipts, newest first, using keyset pagination.
+
+        Paged by id alone: received_at is nullable, and a NULL cannot be
+        encoded in a keyset cursor.
+
+        Returns:
+            Dictionary with items, next_cursor and the optional total
+        """
+        query = db.query(MaterialReceipt).options(selectinload(MaterialReceipt.lines))
+
+        page = paginate(
+            query,
+            None,
+            MaterialReceipt.id,
+            cursor=cursor,
+            limit=limit,
+            count_mode=count_mode,
+        )
 
-        for mr in receipts:
-            store = (
-                db.query(Store).filter(Store.id == mr.store_id).first()
-                if mr.store_id else None
-            )
-            bin_obj = (
-                db.query(Bin).filter(Bin.id == mr.bin_id).first()
-                if mr.bin_id else None
-            )
+        receipts = page["items"]
+        stores, bins = MaterialReceiptService._resolve_locations(db, receipts)
 
-            result.append(
-                MaterialReceiptRead(
-                    **mr.__dict__,
-                    store_name=store.name if store else None,
-                    bin_no=bin_obj.bin_no if bin_obj else None,
-                )
+        page["items"] = [
+            MaterialReceiptRead(
+                **mr.__dict__,
+                store_name=stores.get(mr.store_id),
+                bin_no=bins.get(mr.bin_id),
             )
-
-        return result
+            for mr in receipts
+        ]
+        return page
 
 
     @staticmethod
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint, Index, CheckConstraint
 from datetime import datetime
 from app.core.db import Base
 
@@ -27,4 +27,8 @@ class InventoryItem(Base):
             "gate_pass_id",
             name="uq_inventory_gate_pass"
         ),
+        # (item_id, store_id, bin_id) lookups use the prefix of the
+        # unique constraint above; this one serves store/bin listings.
+        Index("idx_inventory_store_bin", "store_id", "bin_id"),
+        CheckConstraint("quantity >= 0", name="ck_inventory_quantity_non_negative"),
     )
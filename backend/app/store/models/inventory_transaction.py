@@ -7,7 +7,7 @@ class InventoryTransaction(Base):
 
     id = Column(Integer, primary_key=True, index=True)
 
-    inventory_item_id = Column(Integer, ForeignKey("inventory_items.id"), nullable=False)
+    inventory_item_id = Column(Integer, ForeignKey("inventory_items.id"), nullable=False, index=True)
 
     transaction_type = Column(
         Enum("IN", "OUT", "REVERSAL", name="inventory_transaction_type"),
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, Boolean, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, Boolean, ForeignKey, Numeric, Index
 from sqlalchemy.orm import relationship
 from app.core.db import Base
 from datetime import datetime
@@ -47,6 +47,18 @@ class MaterialDispatch(Base):
     # Relationships
     line_items = relationship("MaterialDispatchLineItem", back_populates="dispatch", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Dispatches issued against a PO / SO / transfer
+        Index(
+            "idx_dispatch_reference",
+            "reference_type",
+            "reference_id",
+            "dispatch_status",
+        ),
+        # Active dispatch list in keyset order, newest first
+        Index("idx_dispatch_active_created", "is_active", "created_at", "id"),
+    )
+
 class MaterialDispatchLineItem(Base):
     __tablename__ = "material_dispatch_line_items"
     
@@ -54,7 +66,7 @@ class MaterialDispatchLineItem(Base):
     id = Column(Integer, primary_key=True, index=True)
     
     # Foreign Key
-    dispatch_id = Column(Integer, ForeignKey("material_dispatches.id"), nullable=False)
+    dispatch_id = Column(Integer, ForeignKey("material_dispatches.id"), nullable=False, index=True)
 
     inventory_item_id = Column(
     Integer,
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Header
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.dependencies import require_store_role
-from app.core.db import get_db
+from app.core.db import get_db, get_read_db
 from app.store.schemas.material_dispatch import MaterialDispatchCreate, MaterialDispatchRead, MaterialDispatchUpdate
 from app.store.services.material_dispatch_service import MaterialDispatchService
 from app.store.schemas.material_dispatch import MaterialDispatchCancel
+from app.utils.pagination import CountMode, set_page_headers
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/store/material-dispatch", tags=["Material Dispatch"])
 
@@ -16,35 +20,42 @@ def create_material_dispatch(
     _: None = Depends(require_store_role)
 ):
     """Create a new material dispatch"""
-    print(f"[DEBUG] Controller hit - creating dispatch: {dispatch.dict()}")
+    logger.debug(f"[CREATE DISPATCH] Request: {dispatch.dict()}")
     try:
-        print(f"[DEBUG] Calling service create_material_dispatch")
         result = MaterialDispatchService.create_material_dispatch(db, dispatch)
-        print(f"[DEBUG] Service returned: {result}")
+        logger.info(f"[CREATE DISPATCH] Created dispatch {result.id}")
         return result
     except ValueError as e:
-        print(f"[DEBUG] ValueError: {str(e)}")
+        logger.info(f"[CREATE DISPATCH] Rejected: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"[DEBUG] Exception: {type(e).__name__}: {str(e)}")
-        import traceback
-        print(f"[DEBUG] Traceback: {traceback.format_exc()}")
+        logger.exception(f"[CREATE DISPATCH] Failed: {type(e).__name__}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to create material dispatch: {str(e)}")
 
 @router.get("/", response_model=List[MaterialDispatchRead])
 def get_material_dispatches(
-    skip: int = Query(0, ge=0),
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    count: CountMode = Query(CountMode.NONE, description="Report total in X-Total-Count"),
+    db: Session = Depends(get_read_db),
     _: None = Depends(require_store_role)
 ):
-    """Get all material dispatches"""
-    return MaterialDispatchService.get_material_dispatches(db, skip, limit)
+    """Get material dispatches, newest first, with cursor pagination"""
+    try:
+        page = MaterialDispatchService.get_material_dispatches(
+            db, cursor=cursor, limit=limit, count_mode=count
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    set_page_headers(response, page)
+    return page["items"]
 
 @router.get("/{dispatch_id}", response_model=MaterialDispatchRead)
 def get_material_dispatch(
     dispatch_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: None = Depends(require_store_role)
 ):
     """Get material dispatch by ID"""
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from app.store.services import StoreService
@@ -13,8 +15,10 @@ from app.store.schemas import (
 )
 from app.store.models.inventory import InventoryItem
 from app.store.models.store import Store, Bin
-from ...core.db import get_db
+from ...core.db import get_async_read_db, get_db, get_read_db
 from app.procurement.models.item import Item
+from app.procurement.services.item_cache import item_cache
+from app.utils.pagination import CountMode, set_page_headers
 
 router = APIRouter(prefix="/store", tags=["Store"])
 
@@ -29,7 +33,7 @@ def receive_gate_pass(
         raise HTTPException(status_code=400, detail=str(e))
     
 @router.get("/stores/{store_id}/pending-gate-passes")
-def get_pending_gate_passes(store_id: int, db: Session = Depends(get_db)):
+def get_pending_gate_passes(store_id: int, db: Session = Depends(get_read_db)):
     from app.quality.models.gate_pass import GatePass
     from app.quality.models.material_receipt import MaterialReceipt
 
@@ -58,7 +62,7 @@ def get_pending_gate_passes(store_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/stores/{store_id}/received-gate-passes")
-def get_received_gate_passes(store_id: int, db: Session = Depends(get_db)):
+def get_received_gate_passes(store_id: int, db: Session = Depends(get_read_db)):
     from app.quality.models.gate_pass import GatePass
     from app.quality.models.material_receipt import MaterialReceipt
 
@@ -90,78 +94,68 @@ def get_received_gate_passes(store_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/gate-passes/{gate_pass_id}")
-def get_gate_pass_detail(gate_pass_id: int, db: Session = Depends(get_db)):
+async def get_gate_pass_detail(gate_pass_id: int, db: AsyncSession = Depends(get_async_read_db)):
     from app.quality.models.gate_pass import GatePass, GatePassItem
     from app.quality.models.material_receipt import MaterialReceipt
     from app.procurement.models.purchase_order import PurchaseOrder
     from app.procurement.models.item import Item
 
-    # 1️⃣ Fetch Gate Pass
-    gp = (
-        db.query(GatePass)
-        .filter(GatePass.id == gate_pass_id)
-        .first()
-    )
+    # 1️⃣ Fetch Gate Pass with its MR and PO numbers
+    header = (
+        await db.execute(
+            select(
+                GatePass.id,
+                GatePass.gate_pass_number,
+                MaterialReceipt.mr_number,
+                MaterialReceipt.vendor_name,
+                PurchaseOrder.po_number,
+            )
+            .outerjoin(MaterialReceipt, MaterialReceipt.id == GatePass.mr_id)
+            .outerjoin(PurchaseOrder, PurchaseOrder.id == MaterialReceipt.po_id)
+            .where(GatePass.id == gate_pass_id)
+        )
+    ).first()
 
-    if not gp:
+    if not header:
         raise HTTPException(status_code=404, detail="Gate pass not found")
 
-    # 2️⃣ Fetch MR
-    mr = (
-        db.query(MaterialReceipt)
-        .filter(MaterialReceipt.id == gp.mr_id)
-        .first()
-    )
-
-    # 3️⃣ Fetch PO via MR
-    po = (
-        db.query(PurchaseOrder)
-        .filter(PurchaseOrder.id == mr.po_id)
-        .first()
-        if mr else None
-    )
-
-    # 4️⃣ Fetch items
+    # 2️⃣ Fetch items
     items = (
-        db.query(GatePassItem, Item)
-        .join(Item, Item.id == GatePassItem.item_id)
-        .filter(GatePassItem.gate_pass_id == gate_pass_id)
-        .all()
-    )
+        await db.execute(
+            select(Item.code, Item.description, GatePassItem.accepted_quantity)
+            .join(Item, Item.id == GatePassItem.item_id)
+            .where(GatePassItem.gate_pass_id == gate_pass_id)
+        )
+    ).all()
 
     return {
-        "id": gp.id,
-        "gate_pass_number": gp.gate_pass_number,
-        "mr_number": mr.mr_number if mr else None,
-        "po_number": po.po_number if po else None,   # ✅ FIX
-        "vendor_name": mr.vendor_name if mr else None,
+        "id": header.id,
+        "gate_pass_number": header.gate_pass_number,
+        "mr_number": header.mr_number,
+        "po_number": header.po_number,   # ✅ FIX
+        "vendor_name": header.vendor_name,
         "items": [
             {
                 "item_code": item.code,
                 "description": item.description,
-                "accepted_quantity": gpi.accepted_quantity,
+                "accepted_quantity": item.accepted_quantity,
             }
-            for gpi, item in items
+            for item in items
         ],
     }
 
 
 @router.get("/inventory")
-def get_inventory(
+async def get_inventory(
     store_id: Optional[int] = Query(None),
     bin_id: Optional[int] = Query(None),
     item_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     query = (
-        db.query(
+        select(
             InventoryItem.id,
             InventoryItem.item_id,
-
-            Item.code.label("item_code"),
-            Item.description.label("item_name"),
-            Item.unit.label("unit"),
-
             InventoryItem.quantity,
             InventoryItem.store_id,
             Store.name.label("store_name"),
@@ -169,27 +163,29 @@ def get_inventory(
             Bin.bin_no.label("bin_no"),
             InventoryItem.created_at,
         )
-        .join(Item, Item.id == InventoryItem.item_id)
         .join(Store, Store.id == InventoryItem.store_id)
         .join(Bin, Bin.id == InventoryItem.bin_id)
     )
 
     if store_id:
-        query = query.filter(InventoryItem.store_id == store_id)
+        query = query.where(InventoryItem.store_id == store_id)
     if bin_id:
-        query = query.filter(InventoryItem.bin_id == bin_id)
+        query = query.where(InventoryItem.bin_id == bin_id)
     if item_id:
-        query = query.filter(InventoryItem.item_id == item_id)
+        query = query.where(InventoryItem.item_id == item_id)
+
+    results = (await db.execute(query)).all()
 
-    results = query.all()
+    # Item code/name/unit come from the Item master cache instead of a join
+    items = await db.run_sync(item_cache.get_many, [r.item_id for r in results])
 
     return [
         {
             "id": r.id,
             "item_id": r.item_id,
-            "item_code": r.item_code,
-            "item_name": r.item_name,
-            "unit": r.unit,
+            "item_code": items[r.item_id].code,
+            "item_name": items[r.item_id].description,
+            "unit": items[r.item_id].unit,
             "quantity": r.quantity,
             "store_id": r.store_id,
             "store_name": r.store_name,
@@ -198,11 +194,12 @@ def get_inventory(
             "created_at": r.created_at,
         }
         for r in results
+        if r.item_id in items
     ]
 
 
 @router.get("/po/{po_id}/pending-items")
-def get_po_pending_items(po_id: int, db: Session = Depends(get_db)):
+def get_po_pending_items(po_id: int, db: Session = Depends(get_read_db)):
     return StoreService.get_po_pending_items(db, po_id)
 
 
@@ -210,7 +207,7 @@ def get_po_pending_items(po_id: int, db: Session = Depends(get_db)):
 @router.get("/inventory/{id}", response_model=InventoryRead)
 def get_inventory_item(
     id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Get inventory item details by ID."""
     item = db.query(InventoryItem).filter(InventoryItem.id == id).first()
@@ -237,18 +234,26 @@ def create_store(
 
 @router.get("/stores", response_model=List[StoreRead])
 def list_stores(
-    page: int = Query(0, ge=0),
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    count: CountMode = Query(CountMode.NONE, description="Report total in X-Total-Count"),
+    db: Session = Depends(get_read_db),
 ):
-    """List all stores with pagination."""
-    return StoreService.get_all_stores(db, page * limit, limit)
+    """List stores with cursor pagination."""
+    try:
+        page = StoreService.get_all_stores(db, cursor=cursor, limit=limit, count_mode=count)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    set_page_headers(response, page)
+    return page["items"]
 
 
 @router.get("/stores/{store_id}", response_model=StoreDetailRead)
 def get_store_details(
     store_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Get store details including all bins."""
     store = StoreService.get_store_by_id(db, store_id)
@@ -300,7 +305,7 @@ def add_bin(
 @router.get("/stores/{store_id}/bins", response_model=List[BinRead])
 def get_bins(
     store_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Get all bins for a store."""
     store = StoreService.get_store_by_id(db, store_id)
@@ -1,3 +1,4 @@
 from .store_service import StoreService
+from .inventory_service import InventoryService
 
-__all__ = ["StoreService"]
+__all__ = ["StoreService", "InventoryService"]
@@ -0,0 +1,106 @@
+from typing import Dict, Iterable, List
+
+from sqlalchemy import case, select, update
+from sqlalchemy.orm import Session
+
+from app.store.models.inventory import InventoryItem
+
+_inventory = InventoryItem.__table__
+
+
+class InventoryService:
+    """
+    Guarded stock mutations on inventory_items.
+
+    Quantities are changed with `UPDATE ... SET quantity = quantity + :delta
+    WHERE id = :id AND quantity + :delta >= 0`, so the check and the write
+    are one atomic statement on every backend (SQLite ignores FOR UPDATE,
+    so read-check-write is not safe there). The ck_inventory_quantity_non_negative
+    constraint backs this up at the database level.
+    """
+
+    @staticmethod
+    def lock_inventory_rows(db: Session, inventory_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Lock the given inventory rows until the transaction ends.
+
+        All rows of an operation are locked by one
+        SELECT ... WHERE id IN (...) ORDER BY id FOR UPDATE, so concurrent
+        multi-line operations always acquire them in the same order and
+        cannot deadlock on each other. Operations that also update
+        po_line_balances must lock those rows first
+        (POLineLedger.get_po_balances(..., for_update=True)). Missing ids are
+        simply absent from the result.
+
+        Returns:
+            {inventory_item_id: quantity} of the locked rows
+        """
+        inventory_ids = sorted(set(inventory_ids))
+        if not inventory_ids:
+            return {}
+
+        rows = db.execute(
+            select(_inventory.c.id, _inventory.c.quantity)
+            .where(_inventory.c.id.in_(inventory_ids))
+            .order_by(_inventory.c.id)
+            .with_for_update()
+        ).all()
+        return {inventory_id: quantity for inventory_id, quantity in rows}
+
+    @staticmethod
+    def adjust_stock(db: Session, deltas: Dict[int, int]) -> List[int]:
+        """
+        Add {inventory_item_id: delta} to stock; negative deltas decrement.
+
+        All rows are updated in one statement (UPDATE ... RETURNING where
+        supported, otherwise one guarded UPDATE per row). Callers changing
+        several rows lock them first with `lock_inventory_rows`. Rows that do not
+        exist or would go negative are left untouched and reported; the
+        others are already changed, so the caller must roll back when the
+        result is not empty.
+
+        Returns:
+            Sorted ids of the inventory items that could not be adjusted
+        """
+        deltas = {inventory_id: int(qty) for inventory_id, qty in deltas.items() if qty}
+        if not deltas:
+            return []
+
+        if db.get_bind().dialect.update_returning:
+            delta = case(deltas, value=_inventory.c.id, else_=0)
+            updated = db.execute(
+                update(_inventory)
+                .where(
+                    _inventory.c.id.in_(deltas),
+                    _inventory.c.quantity + delta >= 0,
+                )
+                .values(quantity=_inventory.c.quantity + delta)
+                .returning(_inventory.c.id)
+            ).scalars().all()
+            return sorted(set(deltas) - set(updated))
+
+        failed = []
+        for inventory_id, qty in deltas.items():
+            result = db.execute(
+                update(_inventory)
+                .where(
+                    _inventory.c.id == inventory_id,
+                    _inventory.c.quantity + qty >= 0,
+                )
+                .values(quantity=_inventory.c.quantity + qty)
+            )
+            if result.rowcount != 1:
+                failed.append(inventory_id)
+        return sorted(failed)
+
+    @staticmethod
+    def decrement_stock(db: Session, quantities: Dict[int, int]) -> List[int]:
+        """Remove {inventory_item_id: quantity} from stock. See `adjust_stock`."""
+        return InventoryService.adjust_stock(
+            db, {inventory_id: -int(qty) for inventory_id, qty in quantities.items()}
+        )
+
+    @staticmethod
+    def increment_stock(db: Session, quantities: Dict[int, int]) -> List[int]:
+        """Return {inventory_item_id: quantity} to stock. See `adjust_stock`."""
+        return InventoryService.adjust_stock(db, quantities)
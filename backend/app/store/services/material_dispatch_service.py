@@ -1,15 +1,22 @@
+import logging
 import random
 import string
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional
 from sqlalchemy.orm import Session
+from app.core.transactions import is_retryable, transactional_retry
+from app.core import metrics
 from app.store.models.material_dispatch import MaterialDispatch, MaterialDispatchLineItem, DispatchStatus, ReferenceType
 from app.store.schemas.material_dispatch import MaterialDispatchCreate, MaterialDispatchRead, MaterialDispatchUpdate
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError
 from app.store.models.inventory import InventoryItem
 from app.store.models.inventory_transaction import InventoryTransaction
-from app.store.services.store_service import StoreService
+from app.store.services.inventory_service import InventoryService
+from app.procurement.services.po_line_ledger import POLineLedger
+from app.utils.pagination import CountMode, paginate
 
+logger = logging.getLogger(__name__)
 
 
 class MaterialDispatchService:
@@ -22,6 +29,7 @@ class MaterialDispatchService:
         return f"MD-{timestamp}-{random_suffix}"
     
     @staticmethod
+    @transactional_retry("create_material_dispatch")
     def create_material_dispatch(db: Session, dispatch_create: MaterialDispatchCreate):
         try:
             db.begin()
@@ -47,15 +55,13 @@ class MaterialDispatchService:
             db.add(dispatch)
             db.flush()
 
-            for line in dispatch_create.line_items:
-                inventory = (
-                    db.query(InventoryItem)
-                    .filter(InventoryItem.id == line.inventory_item_id)
-                    .with_for_update()
-                    .first()
-                )
+            # 🔒 Lock all referenced inventory rows at once, in id order
+            locked = InventoryService.lock_inventory_rows(
+                db, [line.inventory_item_id for line in dispatch_create.line_items]
+            )
 
-                if not inventory:
+            for line in dispatch_create.line_items:
+                if line.inventory_item_id not in locked:
                     raise ValueError(
                         f"Inventory item not found (ID: {line.inventory_item_id})"
                     )
@@ -63,7 +69,7 @@ class MaterialDispatchService:
                 # ✅ ALWAYS create line item (draft or issued)
                 dispatch_line = MaterialDispatchLineItem(
                     dispatch_id=dispatch.id,
-                    inventory_item_id=inventory.id,
+                    inventory_item_id=line.inventory_item_id,
                     item_id=line.item_id,
                     item_code=line.item_code,
                     item_name=line.item_name,
@@ -86,6 +92,7 @@ class MaterialDispatchService:
 
         
     @staticmethod
+    @transactional_retry("cancel_material_dispatch")
     def cancel_material_dispatch(db: Session, dispatch_id: int, cancelled_by: str, cancel_reason: str):
         dispatch = (
             db.query(MaterialDispatch)
@@ -101,34 +108,36 @@ class MaterialDispatchService:
             raise ValueError("Only DISPATCHED dispatches can be cancelled")
 
         try:
+            # 🔁 Restore inventory
+            stock_in = {}
             for line in dispatch.line_items:
-                inventory = (
-                    db.query(InventoryItem)
-                    .filter(InventoryItem.id == line.inventory_item_id)
-                    .with_for_update()
-                    .first()
-                )
-
-                if not inventory:
-                    raise ValueError("Inventory item not found during reversal")
-
-                reversal_qty = int(line.quantity_dispatched)
-
-                # 🔁 Restore inventory
-                inventory.quantity += reversal_qty
-
-                # 🔁 Log REVERSAL transaction
-                txn = InventoryTransaction(
-                    inventory_item_id=inventory.id,
-                    transaction_type="REVERSAL",
-                    quantity=reversal_qty,
-                    reference_type="DISPATCH_CANCEL",
-                    reference_id=dispatch.id,
-                    remarks=f"Dispatch cancelled: {cancel_reason}",
-                    created_by=cancelled_by
+                stock_in[line.inventory_item_id] = (
+                    stock_in.get(line.inventory_item_id, 0) + int(line.quantity_dispatched)
                 )
 
-                db.add(txn)
+            # 🔒 Same lock order as issue: PO line balances first, then
+            # inventory rows, so an issue and a cancel cannot deadlock
+            if dispatch.reference_type == ReferenceType.PO:
+                POLineLedger.get_po_balances(db, int(dispatch.reference_id), for_update=True)
+
+            InventoryService.lock_inventory_rows(db, stock_in)
+            if InventoryService.increment_stock(db, stock_in):
+                raise ValueError("Inventory item not found during reversal")
+
+            # 🔁 Log REVERSAL transactions
+            if dispatch.line_items:
+                db.execute(insert(InventoryTransaction), [
+                    {
+                        "inventory_item_id": line.inventory_item_id,
+                        "transaction_type": "REVERSAL",
+                        "quantity": int(line.quantity_dispatched),
+                        "reference_type": "DISPATCH_CANCEL",
+                        "reference_id": dispatch.id,
+                        "remarks": f"Dispatch cancelled: {cancel_reason}",
+                        "created_by": cancelled_by,
+                    }
+                    for line in dispatch.line_items
+                ])
 
             dispatch.dispatch_status = DispatchStatus.CANCELLED
             dispatch.remarks = (
@@ -136,6 +145,15 @@ class MaterialDispatchService:
                 f"Reason: {cancel_reason}"
             )
 
+            # 🔁 Give the quantities back to the PO lines
+            if dispatch.reference_type == ReferenceType.PO:
+                returned = {}
+                for line in dispatch.line_items:
+                    returned[line.item_id] = returned.get(line.item_id, 0) - line.quantity_dispatched
+                POLineLedger.add_for_items(
+                    db, int(dispatch.reference_id), "dispatched_qty", returned
+                )
+
             db.commit()
             db.refresh(dispatch)
             return dispatch
@@ -146,13 +164,27 @@ class MaterialDispatchService:
 
     
     @staticmethod
-    def get_material_dispatches(db: Session, skip: int = 0, limit: int = 100) -> List[MaterialDispatchRead]:
-        """Get all material dispatches"""
-        dispatches = db.query(MaterialDispatch).filter(
+    def get_material_dispatches(
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        count_mode: CountMode = CountMode.NONE,
+    ) -> dict:
+        """Get active material dispatches, newest first, with cursor pagination"""
+        query = db.query(MaterialDispatch).filter(
             MaterialDispatch.is_active == True
-        ).offset(skip).limit(limit).all()
-        
-        return [MaterialDispatchRead.from_orm(dispatch) for dispatch in dispatches]
+        )
+
+        page = paginate(
+            query,
+            MaterialDispatch.created_at,
+            MaterialDispatch.id,
+            cursor=cursor,
+            limit=limit,
+            count_mode=count_mode,
+        )
+        page["items"] = [MaterialDispatchRead.from_orm(dispatch) for dispatch in page["items"]]
+        return page
     
     @staticmethod
     def get_material_dispatch(db: Session, dispatch_id: int) -> Optional[MaterialDispatchRead]:
@@ -208,21 +240,24 @@ class MaterialDispatchService:
                 dispatch.line_items.clear()
                 db.flush()
 
-                for line in dispatch_update.line_items:
-                    inventory = (
-                        db.query(InventoryItem)
-                        .filter(InventoryItem.id == line.inventory_item_id)
-                        .first()
+                existing_ids = {
+                    inventory_id for (inventory_id,) in
+                    db.query(InventoryItem.id).filter(
+                        InventoryItem.id.in_(
+                            [line.inventory_item_id for line in dispatch_update.line_items]
+                        )
                     )
+                }
 
-                    if not inventory:
+                for line in dispatch_update.line_items:
+                    if line.inventory_item_id not in existing_ids:
                         raise ValueError(
                             f"Inventory item not found (ID: {line.inventory_item_id})"
                         )
 
                     new_line = MaterialDispatchLineItem(
                         dispatch_id=dispatch.id,
-                        inventory_item_id=inventory.id,
+                        inventory_item_id=line.inventory_item_id,
                         item_id=line.item_id,
                         item_code=line.item_code,
                         item_name=line.item_name,
@@ -246,6 +281,7 @@ class MaterialDispatchService:
             raise e
 
     @staticmethod
+    @transactional_retry("issue_material_dispatch")
     def issue_material_dispatch(db: Session, dispatch_id: int) -> MaterialDispatchRead:
         dispatch = (
             db.query(MaterialDispatch)
@@ -261,111 +297,124 @@ class MaterialDispatchService:
             raise ValueError("Only DRAFT dispatches can be issued")
 
         try:
-            print(f"\n[ISSUE DISPATCH] Dispatch ID: {dispatch.id}")
-            print(f"[ISSUE DISPATCH] Reference: {dispatch.reference_type} {dispatch.reference_id}")
+            logger.info(
+                f"[ISSUE DISPATCH] Dispatch {dispatch.id} "
+                f"(reference {dispatch.reference_type} {dispatch.reference_id})"
+            )
 
-            # 🔒 Fetch PO pending items ONCE
-            pending_items = []
+            # 🔒 Lock the PO line balances ONCE (keyed by item_id)
+            pending_items = {}
+            dispatched_by_item = {}
             if dispatch.reference_type == ReferenceType.PO:
-                pending_items = StoreService.get_po_pending_items(
-                    db, int(dispatch.reference_id)
-                )
+                po_id = int(dispatch.reference_id)
+                pending_items = {
+                    b.item_id: float(b.ordered_qty) - float(b.dispatched_qty or 0)
+                    for b in POLineLedger.get_po_balances(db, po_id, for_update=True)
+                }
 
-                print("[ISSUE DISPATCH] PO Pending Items:")
-                for p in pending_items:
-                    print(
-                        f"  - item_code={p.get('item_code')} | "
-                        f"item_id={p.get('item_id')} | "
-                        f"pending_qty={p.get('pending_qty')}"
-                    )
+                logger.debug("[ISSUE DISPATCH] PO pending items: %s", pending_items)
 
+            stock_out = {}
             for line in dispatch.line_items:
-                print(
-                    f"\n[ISSUE DISPATCH] Processing line item:"
-                    f" item_code={line.item_code},"
-                    f" item_id={line.item_id},"
-                    f" qty={line.quantity_dispatched}"
-                )
-
-                inventory = (
-                    db.query(InventoryItem)
-                    .filter(InventoryItem.id == line.inventory_item_id)
-                    .with_for_update()
-                    .first()
+                logger.debug(
+                    "[ISSUE DISPATCH] Line item_code=%s item_id=%s qty=%s",
+                    line.item_code, line.item_id, line.quantity_dispatched,
                 )
 
-                if not inventory:
-                    raise ValueError(
-                        f"Inventory item not found for item {line.item_code}"
-                    )
-
                 dispatch_qty = int(line.quantity_dispatched)
 
                 # ==================================================
                 # ✅ RECOMMENDED FIX — MATCH BY item_code (NOT item_id)
                 # ==================================================
                 if dispatch.reference_type == ReferenceType.PO:
-                    po_item = next(
-                        (p for p in pending_items if p["item_id"] == line.item_id),
-                        None
-                    )
+                    pending_qty = pending_items.get(line.item_id)
 
-                    if not po_item:
+                    if pending_qty is None:
                         raise ValueError(
                             f"Item {line.item_code} not part of PO {dispatch.reference_id}"
                         )
 
-                    if dispatch_qty > po_item["pending_qty"]:
+                    if dispatch_qty > pending_qty:
                         raise ValueError(
                             f"Dispatch qty exceeds PO pending qty for item {line.item_code}. "
-                            f"Pending: {po_item['pending_qty']}, Requested: {dispatch_qty}"
+                            f"Pending: {pending_qty}, Requested: {dispatch_qty}"
                         )
 
-                    print(
-                        f"[ISSUE DISPATCH] PO validation passed "
-                        f"(pending={po_item['pending_qty']}, dispatching={dispatch_qty})"
+                    # Lines of the same item share the PO pending quantity
+                    pending_items[line.item_id] = pending_qty - dispatch_qty
+                    dispatched_by_item[line.item_id] = (
+                        dispatched_by_item.get(line.item_id, 0) + line.quantity_dispatched
                     )
 
-                # 🔻 Inventory validation
-                if inventory.quantity < dispatch_qty:
-                    raise ValueError(
-                        f"Insufficient stock for item {line.item_code}. "
-                        f"Available: {inventory.quantity}, Requested: {dispatch_qty}"
+                    logger.debug(
+                        "[ISSUE DISPATCH] PO validation passed (pending=%s, dispatching=%s)",
+                        pending_qty, dispatch_qty,
                     )
 
-                # 🔻 Deduct inventory
-                inventory.quantity -= dispatch_qty
-
-                txn = InventoryTransaction(
-                    inventory_item_id=inventory.id,
-                    transaction_type="OUT",
-                    quantity=dispatch_qty,
-                    reference_type="DISPATCH",
-                    reference_id=dispatch.id,
-                    remarks="Material dispatched",
-                    created_by=dispatch.created_by
+                stock_out[line.inventory_item_id] = (
+                    stock_out.get(line.inventory_item_id, 0) + dispatch_qty
                 )
 
-                db.add(txn)
-
-                print(
-                    f"[ISSUE DISPATCH] Inventory deducted. "
-                    f"Remaining stock: {inventory.quantity}"
+            # 🔻 Lock (in id order) and deduct inventory for all lines at once
+            InventoryService.lock_inventory_rows(db, stock_out)
+            failed = InventoryService.decrement_stock(db, stock_out)
+            if failed:
+                available = dict(
+                    db.query(InventoryItem.id, InventoryItem.quantity)
+                    .filter(InventoryItem.id.in_(failed))
+                    .all()
+                )
+                line = next(l for l in dispatch.line_items if l.inventory_item_id == failed[0])
+                if failed[0] not in available:
+                    raise ValueError(
+                        f"Inventory item not found for item {line.item_code}"
+                    )
+                raise ValueError(
+                    f"Insufficient stock for item {line.item_code}. "
+                    f"Available: {available[failed[0]]}, Requested: {stock_out[failed[0]]}"
                 )
 
+            if dispatch.line_items:
+                db.execute(insert(InventoryTransaction), [
+                    {
+                        "inventory_item_id": line.inventory_item_id,
+                        "transaction_type": "OUT",
+                        "quantity": int(line.quantity_dispatched),
+                        "reference_type": "DISPATCH",
+                        "reference_id": dispatch.id,
+                        "remarks": "Material dispatched",
+                        "created_by": dispatch.created_by,
+                    }
+                    for line in dispatch.line_items
+                ])
+
+            logger.debug(f"[ISSUE DISPATCH] Inventory deducted for {len(stock_out)} inventory item(s)")
+
             # ✅ Finalize dispatch
             dispatch.dispatch_status = DispatchStatus.DISPATCHED
             dispatch.updated_at = datetime.utcnow()
 
+            if dispatched_by_item:
+                POLineLedger.add_for_items(
+                    db, int(dispatch.reference_id), "dispatched_qty", dispatched_by_item
+                )
+
             db.commit()
+            metrics.DISPATCHES_ISSUED.inc()
             db.refresh(dispatch)
 
-            print(f"[ISSUE DISPATCH] Dispatch {dispatch.id} successfully ISSUED\n")
+            logger.info(f"[ISSUE DISPATCH] Dispatch {dispatch.id} successfully ISSUED")
 
             return MaterialDispatchRead.from_orm(dispatch)
 
         except Exception as e:
             db.rollback()
-            print(f"[ISSUE DISPATCH][ERROR] {str(e)}")
+            if isinstance(e, ValueError):
+                logger.info(f"[ISSUE DISPATCH] Dispatch {dispatch_id} rejected: {e}")
+            elif is_retryable(e):
+                # transactional_retry reruns it and reports it once retries run out
+                logger.debug(f"[ISSUE DISPATCH] Dispatch {dispatch_id} hit a transient lock error: {e}")
+            else:
+                logger.exception(f"[ISSUE DISPATCH] Dispatch {dispatch_id} failed: {e}")
             raise e
 
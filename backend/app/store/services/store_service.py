@@ -1,4 +1,6 @@
 from sqlalchemy.orm import Session
+from app.core.transactions import transactional_retry
+from app.core import metrics
 from sqlalchemy import and_
 from typing import Optional, Dict, Any, List
 from app.store.models.inventory import InventoryItem
@@ -10,21 +12,107 @@ from app.store.models.inventory_transaction import InventoryTransaction
 from datetime import datetime
 import uuid
 from app.store.models.store import Store, Bin
-from sqlalchemy import func
-from app.procurement.models.purchase_order_line import PurchaseOrderLine
-from app.store.models.material_dispatch import MaterialDispatch, MaterialDispatchLineItem, DispatchStatus
+from sqlalchemy import bindparam, insert, update
+from app.utils.pagination import CountMode, paginate
+from app.procurement.services.po_line_ledger import POLineLedger
 
 class StoreService:
     
     @staticmethod
+    def _post_inventory_in(
+        db: Session,
+        store_id: int,
+        bin_id: int,
+        gate_pass_id: int,
+        quantities: Dict[int, int],
+    ) -> Dict[int, int]:
+        """
+        Add {item_id: quantity} to the inventory of one store bin.
+
+        Existing rows are locked with one keyed SELECT ... FOR UPDATE and
+        incremented with a single executemany UPDATE; missing rows are
+        created with one executemany INSERT.
+
+        Returns:
+            {item_id: inventory_item_id}
+        """
+        if not quantities:
+            return {}
+
+        existing = {}
+        rows = (
+            db.query(InventoryItem.id, InventoryItem.item_id)
+            .filter(
+                InventoryItem.store_id == store_id,
+                InventoryItem.bin_id == bin_id,
+                InventoryItem.item_id.in_(quantities),
+            )
+            .order_by(InventoryItem.id)
+            .with_for_update()
+            .all()
+        )
+        for inventory_id, item_id in rows:
+            existing.setdefault(item_id, inventory_id)
+
+        if existing:
+            db.execute(
+                update(InventoryItem.__table__)
+                .where(InventoryItem.__table__.c.id == bindparam("b_id"))
+                .values(quantity=InventoryItem.__table__.c.quantity + bindparam("b_qty")),
+                [
+                    {"b_id": inventory_id, "b_qty": quantities[item_id]}
+                    for item_id, inventory_id in existing.items()
+                ],
+            )
+
+        # Not an ON CONFLICT upsert: the unique key includes gate_pass_id,
+        # so a new gate pass would never conflict with the existing bin row.
+        new_rows = [
+            {
+                "item_id": item_id,
+                "store_id": store_id,
+                "bin_id": bin_id,
+                "quantity": qty,
+                "gate_pass_id": gate_pass_id,
+                "created_at": datetime.utcnow(),
+            }
+            for item_id, qty in quantities.items()
+            if item_id not in existing
+        ]
+        if new_rows:
+            if db.get_bind().dialect.insert_executemany_returning:
+                created = db.execute(
+                    insert(InventoryItem).returning(
+                        InventoryItem.id, InventoryItem.item_id, sort_by_parameter_order=True
+                    ),
+                    new_rows,
+                ).all()
+            else:
+                db.execute(insert(InventoryItem), new_rows)
+                created = (
+                    db.query(InventoryItem.id, InventoryItem.item_id)
+                    .filter(
+                        InventoryItem.store_id == store_id,
+                        InventoryItem.bin_id == bin_id,
+                        InventoryItem.gate_pass_id == gate_pass_id,
+                        InventoryItem.item_id.in_([row["item_id"] for row in new_rows]),
+                    )
+                    .all()
+                )
+            existing.update({item_id: inventory_id for inventory_id, item_id in created})
+
+        return existing
+
+    @staticmethod
+    @transactional_retry("receive_gate_pass")
     def receive_gate_pass(db: Session, gate_pass_id: int):
-        from app.quality.models.gate_pass import GatePass
+        from app.quality.models.gate_pass import GatePass, GatePassItem
         from app.quality.models.material_receipt import MaterialReceipt
 
-        # 1️⃣ Fetch Gate Pass
+        # 1️⃣ Fetch Gate Pass (locked so it cannot be received twice concurrently)
         gate_pass = db.query(GatePass).filter(
             GatePass.id == gate_pass_id
-        ).first()
+        ).with_for_update().first()
 
         if not gate_pass:
             raise ValueError("Gate Pass not found")
@@ -47,51 +135,38 @@ class StoreService:
             raise ValueError("Invalid Store assigned in Material Receipt")
 
 
-        # 3️⃣ Receive inventory (IN)
-        for item in gate_pass.items:
-            received_qty = int(item.accepted_quantity)
-
-            inventory = (
-                db.query(InventoryItem)
-                .filter(
-                    InventoryItem.item_id == item.item_id,
-                    InventoryItem.store_id == mr.store_id,
-                    InventoryItem.bin_id == mr.bin_id, 
-                )
-                .with_for_update()
-                .first()
-            )
-
-            if inventory:
-                inventory.quantity += received_qty
-            else:
-                inventory = InventoryItem(
-                    item_id=item.item_id,
-                    store_id=mr.store_id,
-                    bin_id=mr.bin_id,
-                    quantity=received_qty,
-                    gate_pass_id=gate_pass.id
-                )
-                db.add(inventory)
-                db.flush()
-
-            # 🔹 INVENTORY TRANSACTION (IN)
-            txn = InventoryTransaction(
-                inventory_item_id=inventory.id,
-                transaction_type="IN",
-                quantity=received_qty,
-                reference_type="GATE_PASS",
-                reference_id=gate_pass.id,
-                remarks="Material received into store",
-                created_by="system"
-            )
-            db.add(txn)
+        # 3️⃣ Aggregate gate pass lines per item
+        quantities: Dict[int, int] = {}
+        for item_id, accepted_qty in db.query(
+            GatePassItem.item_id, GatePassItem.accepted_quantity
+        ).filter(GatePassItem.gate_pass_id == gate_pass.id):
+            quantities[item_id] = quantities.get(item_id, 0) + int(accepted_qty)
 
+        # 4️⃣ Receive inventory (IN) in bulk
+        inventory_ids = StoreService._post_inventory_in(
+            db, mr.store_id, mr.bin_id, gate_pass.id, quantities
+        )
 
-        # 4️⃣ Lock gate pass
+        # 🔹 INVENTORY TRANSACTIONS (IN), one per received item
+        if inventory_ids:
+            db.execute(insert(InventoryTransaction), [
+                {
+                    "inventory_item_id": inventory_ids[item_id],
+                    "transaction_type": "IN",
+                    "quantity": qty,
+                    "reference_type": "GATE_PASS",
+                    "reference_id": gate_pass.id,
+                    "remarks": "Material received into store",
+                    "created_by": "system",
+                }
+                for item_id, qty in quantities.items()
+            ])
+
+        # 5️⃣ Lock gate pass
         gate_pass.store_status = "RECEIVED"
 
         db.commit()
+        metrics.GATE_PASSES_RECEIVED.inc()
 
         return {
             "message": "Inventory received successfully",
@@ -128,9 +203,21 @@ class StoreService:
         return store
 
     @staticmethod
-    def get_all_stores(db: Session, skip: int = 0, limit: int = 100) -> List[Store]:
-        """Get all stores with pagination."""
-        return db.query(Store).offset(skip).limit(limit).all()
+    def get_all_stores(
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        count_mode: CountMode = CountMode.NONE,
+    ) -> dict:
+        """Get stores, newest first, with cursor pagination (by id: created_at is nullable)."""
+        return paginate(
+            db.query(Store),
+            None,
+            Store.id,
+            cursor=cursor,
+            limit=limit,
+            count_mode=count_mode,
+        )
 
     @staticmethod
     def get_store_by_id(db: Session, store_id: int) -> Optional[Store]:
@@ -188,49 +275,19 @@ class StoreService:
         pending = ordered - dispatched
         """
 
-        # 1️⃣ Get PO lines
-        po_lines = (
-            db.query(
-                PurchaseOrderLine.item_id,
-                PurchaseOrderLine.quantity.label("ordered_qty"),
-            )
-            .filter(PurchaseOrderLine.po_id == po_id)
-            .all()
-        )
-
-        if not po_lines:
-            return []
-
-        # 2️⃣ Get already dispatched qty per item
-        dispatched = (
-            db.query(
-                MaterialDispatchLineItem.item_id,
-                func.coalesce(func.sum(MaterialDispatchLineItem.quantity_dispatched), 0)
-                .label("dispatched_qty")
-            )
-            .join(MaterialDispatch)
-            .filter(
-                MaterialDispatch.reference_type == "PO",
-                MaterialDispatch.reference_id == str(po_id),
-                MaterialDispatch.dispatch_status == DispatchStatus.DISPATCHED
-            )
-            .group_by(MaterialDispatchLineItem.item_id)
-            .all()
-        )
-
-        dispatched_map = {
-            d.item_id: float(d.dispatched_qty) for d in dispatched
-        }
+        # 1️⃣ Ordered / dispatched quantities from the PO line ledger
+        balances = POLineLedger.get_po_balances(db, po_id)
 
-        # 3️⃣ Build response
+        # 2️⃣ Build response
         result = []
-        for line in po_lines:
-            pending = float(line.ordered_qty) - dispatched_map.get(line.item_id, 0)
+        for b in balances:
+            dispatched = float(b.dispatched_qty or 0)
+            pending = float(b.ordered_qty) - dispatched
             if pending > 0:
                 result.append({
-                    "item_id": line.item_id,
-                    "ordered_qty": float(line.ordered_qty),
-                    "dispatched_qty": dispatched_map.get(line.item_id, 0),
+                    "item_id": b.item_id,
+                    "ordered_qty": float(b.ordered_qty),
+                    "dispatched_qty": dispatched,
                     "pending_qty": pending
                 })
 
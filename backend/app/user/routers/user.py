@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from app.core.db import get_db
+from app.core.db import get_db, get_read_db
 from app.user.schemas.user import UserCreate, UserUpdate, UserResponse
 from app.user.services.user_service import UserService
+from app.utils.pagination import CountMode, set_page_headers
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -18,7 +19,7 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+def get_user(user_id: int, db: Session = Depends(get_read_db)):
     """Get user by ID."""
     user = UserService.get_user_by_id(db, user_id)
     if not user:
@@ -27,7 +28,7 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/email/{email}", response_model=UserResponse)
-def get_user_by_email(email: str, db: Session = Depends(get_db)):
+def get_user_by_email(email: str, db: Session = Depends(get_read_db)):
     """Get user by email."""
     user = UserService.get_user_by_email(db, email)
     if not user:
@@ -36,10 +37,21 @@ def get_user_by_email(email: str, db: Session = Depends(get_db)):
 
 
 @router.get("", response_model=list[UserResponse])
-def get_all_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all users."""
-    users = UserService.get_all_users(db, skip, limit)
-    return users
+def get_all_users(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    count: CountMode = Query(CountMode.NONE, description="Report total in X-Total-Count"),
+    db: Session = Depends(get_read_db),
+):
+    """Get users with cursor pagination."""
+    try:
+        page = UserService.get_all_users(db, cursor=cursor, limit=limit, count_mode=count)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    set_page_headers(response, page)
+    return page["items"]
 
 
 @router.put("/{user_id}", response_model=UserResponse)
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.user.models.user import User
 from app.user.schemas.user import UserCreate, UserUpdate
+from app.utils.pagination import CountMode, paginate
 
 
 class UserService:
@@ -36,9 +37,21 @@ class UserService:
         return db.query(User).filter(User.employee_id == employee_id).first()
     
     @staticmethod
-    def get_all_users(db: Session, skip: int = 0, limit: int = 100) -> list[User]:
-        """Get all users."""
-        return db.query(User).offset(skip).limit(limit).all()
+    def get_all_users(
+        db: Session,
+        cursor: str | None = None,
+        limit: int = 100,
+        count_mode: CountMode = CountMode.NONE,
+    ) -> dict:
+        """Get users, newest first, with cursor pagination."""
+        return paginate(
+            db.query(User),
+            User.created_at,
+            User.id,
+            cursor=cursor,
+            limit=limit,
+            count_mode=count_mode,
+        )
     
     @staticmethod
     def update_user(db: Session, user_id: int, user_update: UserUpdate) -> User | None:
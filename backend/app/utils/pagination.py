@@ -0,0 +1,187 @@
+import base64
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, List, Optional, Tuple
+
+from fastapi import Response
+from sqlalchemy import func, literal_column, tuple_
+from sqlalchemy.orm import Query
+
+# Approximate counts on non-PostgreSQL backends stop counting here
+APPROX_COUNT_CAP = 10000
+
+
+class CountMode(str, Enum):
+    """How (and whether) a paginated list reports its total size."""
+    NONE = "none"
+    EXACT = "exact"
+    APPROX = "approx"
+
+
+def _encode_value(value: Any) -> list:
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    return ["v", value]
+
+
+def _decode_value(tagged: list) -> Any:
+    kind, value = tagged
+    if kind == "dt":
+        return datetime.fromisoformat(value)
+    if kind == "d":
+        return date.fromisoformat(value)
+    return value
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Encode the (sort key, id) of the last row of a page as an opaque token."""
+    payload = json.dumps([_encode_value(sort_value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        tagged, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return _decode_value(tagged), int(row_id)
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+def keyset_paginate(
+    query: Query,
+    sort_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = True,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Apply keyset (seek) pagination over (sort_column, id_column).
+
+    Instead of OFFSET, the page starts strictly after the row identified
+    by `cursor`, so every page costs the same as the first one. Pass
+    sort_column=None to page by id alone.
+
+    Returns:
+        (rows, next_cursor) — next_cursor is None on the last page
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if sort_column is None:
+            query = query.filter(id_column < row_id if descending else id_column > row_id)
+        else:
+            key = tuple_(sort_column, id_column)
+            query = query.filter(key < (sort_value, row_id) if descending else key > (sort_value, row_id))
+
+    order_columns = [id_column] if sort_column is None else [sort_column, id_column]
+    query = query.order_by(*[
+        column.desc() if descending else column.asc() for column in order_columns
+    ])
+
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, sort_column.key) if sort_column is not None else None,
+            getattr(last, id_column.key),
+        )
+
+    return rows, next_cursor
+
+
+def _planner_row_estimate(query: Query) -> int:
+    """Ask the PostgreSQL planner how many rows the query will return."""
+    compiled = query.statement.compile(
+        dialect=query.session.get_bind().dialect,
+        compile_kwargs={"render_postcompile": True},
+    )
+    plan = query.session.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(query: Query, mode: CountMode) -> Tuple[Optional[int], bool]:
+    """
+    Count the rows matched by a (filtered, unordered) query.
+
+    - NONE:   skip counting
+    - EXACT:  COUNT(*) over the whole result
+    - APPROX: planner estimate on PostgreSQL; elsewhere a COUNT(*) that
+              stops at APPROX_COUNT_CAP rows, so it never scans the table
+
+    Returns:
+        (count, is_approximate)
+    """
+    if mode == CountMode.NONE:
+        return None, False
+
+    query = query.order_by(None)
+
+    if mode == CountMode.EXACT:
+        return query.count(), False
+
+    if query.session.get_bind().dialect.name == "postgresql":
+        return _planner_row_estimate(query), True
+
+    capped = (
+        query.statement
+        .with_only_columns(literal_column("1"), maintain_column_froms=True)
+        .limit(APPROX_COUNT_CAP)
+        .subquery()
+    )
+    count = query.session.query(func.count()).select_from(capped).scalar()
+    return count, count >= APPROX_COUNT_CAP
+
+
+def paginate(
+    query: Query,
+    sort_column,
+    id_column,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    count_mode: CountMode = CountMode.NONE,
+    descending: bool = True,
+) -> dict:
+    """
+    Keyset-paginate a query and optionally count its total size.
+
+    Returns:
+        Dictionary with items, next_cursor, total and total_is_approximate
+    """
+    total, total_is_approximate = count_rows(query, count_mode)
+    rows, next_cursor = keyset_paginate(
+        query, sort_column, id_column, cursor, limit, descending=descending
+    )
+    return {
+        "items": rows,
+        "next_cursor": next_cursor,
+        "total": total,
+        "total_is_approximate": total_is_approximate,
+    }
+
+
+def set_page_headers(response: Response, page: dict) -> None:
+    """Expose pagination metadata as headers so list bodies stay plain arrays."""
+    if page.get("next_cursor"):
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    if page.get("total") is not None:
+        response.headers["X-Total-Count"] = str(page["total"])
+        response.headers["X-Total-Count-Approximate"] = (
+            "true" if page["total_is_approximate"] else "false"
+        )
@@ -0,0 +1,191 @@
+"""
+Benchmark: sync (threadpool) vs async (AsyncSession) endpoints under concurrency.
+
+Serves two endpoints that each run one query taking --latency ms in the
+database (SELECT pg_sleep on PostgreSQL, a sleep() SQL function registered
+on SQLite connections), plus a DB-free sync `/ping`:
+
+    sync     def endpoint, Session        -> holds one of AnyIO's 40
+                                             threadpool slots per request
+    async    async def endpoint, AsyncSession -> only a coroutine while the
+                                             query is in flight
+
+For each concurrency level it reports throughput and p50/p95 latency of
+the DB endpoint, and the p50 of `/ping` probes sent during the load: with
+the sync endpoint saturating the threadpool, unrelated sync endpoints queue
+behind it.
+
+Both engines get a --pool-size connection pool (no overflow), so the
+connection pool is not the limit being measured. In production the async
+pool is bounded by DB_POOL_SIZE + DB_MAX_OVERFLOW just like the sync one.
+
+Usage (from backend/):
+
+    python -m benchmarks.async_concurrency
+    python -m benchmarks.async_concurrency --levels 10 40 80 160 320 --latency 50
+    DATABASE_URL=postgresql://... python -m benchmarks.async_concurrency --pool-size 100
+
+Runs in process (httpx.AsyncClient over ASGITransport, no network), so
+the client shares the CPU with the app; keep --latency high enough that
+the database, not the process, is the bottleneck. Without DATABASE_URL a
+throwaway SQLite file is used.
+
+Sample (SQLite, 100ms queries): sync flattens at ~370 req/s from 40
+concurrent requests on (40 threads x 10 req/s) with /ping at 185ms, async
+reaches ~680 req/s at 160 with /ping at 6ms.
+"""
+import argparse
+import asyncio
+import math
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="async_bench_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import create_engine, event, text  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool  # noqa: E402
+
+from app.core import config  # noqa: E402
+from app.core.db import _apply_sqlite_pragmas, async_url  # noqa: E402
+
+
+def _register_sleep(dbapi_connection, connection_record):
+    dbapi_connection.create_function("sleep", 1, lambda ms: time.sleep(ms / 1000) or 0)
+
+
+def build_app(pool_size: int, latency_ms: float) -> FastAPI:
+    url = config.DATABASE_URL
+    sqlite = make_url(url).get_backend_name() == "sqlite"
+
+    sync_engine = create_engine(url, poolclass=QueuePool, pool_size=pool_size, max_overflow=0)
+    async_engine = create_async_engine(
+        async_url(url), poolclass=AsyncAdaptedQueuePool, pool_size=pool_size, max_overflow=0
+    )
+    if sqlite:
+        for target in (sync_engine, async_engine.sync_engine):
+            event.listen(target, "connect", _apply_sqlite_pragmas)
+            event.listen(target, "connect", _register_sleep)
+        statement = text("SELECT sleep(:ms)")
+        params = {"ms": latency_ms}
+    else:
+        statement = text("SELECT pg_sleep(:seconds)")
+        params = {"seconds": latency_ms / 1000}
+
+    SyncSession = sessionmaker(bind=sync_engine)
+    AsyncSessionMaker = async_sessionmaker(async_engine)
+
+    def get_sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionMaker() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_endpoint(db: Session = Depends(get_sync_db)):
+        db.execute(statement, params)
+        return {"ok": True}
+
+    @app.get("/async")
+    async def async_endpoint(db: AsyncSession = Depends(get_async_db)):
+        await db.execute(statement, params)
+        return {"ok": True}
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    app.state.engines = (sync_engine, async_engine)
+    return app
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct * len(ordered)) - 1)]
+
+
+async def run_level(client: httpx.AsyncClient, path: str, concurrency: int, duration: float) -> dict:
+    latencies: List[float] = []
+    probes: List[float] = []
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    async def prober():
+        await asyncio.sleep(duration / 4)        # let the load build up
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            (await client.get("/ping")).raise_for_status()
+            probes.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    await asyncio.gather(prober(), *(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": _percentile(latencies, 0.95),
+        "ping_p50": statistics.median(probes) if probes else float("nan"),
+    }
+
+
+async def main_async(args) -> None:
+    app = build_app(args.pool_size, args.latency)
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits, timeout=120) as client:
+        print(
+            f"query latency {args.latency}ms, pool {args.pool_size}, "
+            f"ideal throughput {1000 / args.latency:.0f} req/s per in-flight request\n"
+        )
+        print(f"{'concurrency':>11} {'endpoint':<6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'/ping p50':>10}")
+        for concurrency in args.levels:
+            for path in ("/sync", "/async"):
+                await client.get(path)          # warm-up
+                r = await run_level(client, path, concurrency, args.duration)
+                print(
+                    f"{concurrency:>11} {path[1:]:<6} {r['rps']:>8.0f} {r['p50']:>8.1f} "
+                    f"{r['p95']:>8.1f} {r['ping_p50']:>10.1f}"
+                )
+
+    sync_engine, async_engine = app.state.engines
+    sync_engine.dispose()
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[10, 40, 80, 160],
+                        help="concurrent requests in flight")
+    parser.add_argument("--latency", type=float, default=100.0, help="simulated query time in ms")
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per level and endpoint")
+    parser.add_argument("--pool-size", type=int, default=400, help="connections per engine")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
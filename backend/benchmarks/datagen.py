@@ -0,0 +1,352 @@
+"""
+Deterministic synthetic data for the procurement -> quality -> store flow.
+
+Generates items, stores and bins, then `pos` purchase orders with
+`lines_per_po` lines each and pushes every PO through the pipeline as far
+as its stage (po_id % 10, see PIPELINE) allows: material receipt,
+inspection, gate pass, receipt into store and dispatch. Each stage also
+leaves ~10% of the POs waiting in front of the next step, so benchmarks
+always find work for every service function.
+
+Row ids are derived from the PO id (MR, inspection, gate pass and dispatch
+N all belong to PO N; line `n` of PO N has id (N - 1) * lines_per_po + n + 1)
+and quantities come from a seeded Random, so the same arguments always
+produce the same database. Everything is bulk-inserted through Core
+executemany in chunks of BATCH POs; PO line balances are rebuilt from the
+generated documents at the end.
+
+Usage (from backend/):
+
+    python -m benchmarks.datagen --pos 10000
+    DATABASE_URL=postgresql://... python -m benchmarks.datagen --pos 100000 --lines 8
+
+Without DATABASE_URL a throwaway SQLite file is used. The target database
+is dropped and re-created, so never point it at real data.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="datagen_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+from sqlalchemy import insert, text  # noqa: E402
+from sqlalchemy.engine import Connection  # noqa: E402
+
+import app.main  # noqa: E402,F401  (registers every model on Base.metadata)
+from app.core.db import SessionLocal, create_tables, drop_tables, engine  # noqa: E402
+from app.procurement.models import Item, POStatus, PurchaseOrder, PurchaseOrderLine  # noqa: E402
+from app.procurement.services.po_line_ledger import POLineLedger  # noqa: E402
+from app.quality.models.gate_pass import GatePass, GatePassItem  # noqa: E402
+from app.quality.models.inspection import QualityInspection, QualityInspectionLine  # noqa: E402
+from app.quality.models.material_receipt import MaterialReceipt, MaterialReceiptLine  # noqa: E402
+from app.store.models.inventory import InventoryItem  # noqa: E402
+from app.store.models.inventory_transaction import InventoryTransaction  # noqa: E402
+from app.store.models.material_dispatch import (  # noqa: E402
+    DispatchStatus,
+    MaterialDispatch,
+    MaterialDispatchLineItem,
+    ReferenceType,
+)
+from app.store.models.store import Bin, Store  # noqa: E402
+
+BATCH = 2000
+VENDORS = 50
+BINS_PER_STORE = 10
+START = datetime(2024, 1, 1)
+
+# Pipeline stages, in order
+SENT, RECEIVED, INSPECTED, GATE_PASSED, STORED, DISPATCH_DRAFT, DISPATCHED = range(7)
+
+# po_id % 10 -> furthest stage reached by that PO's documents
+PIPELINE = (DISPATCHED, DISPATCHED, STORED, DISPATCH_DRAFT, GATE_PASSED, INSPECTED, RECEIVED, SENT, SENT, SENT)
+
+# Tables with explicit ids whose sequences must be moved past them (PostgreSQL)
+_SEQUENCED_TABLES = (
+    Item, Store, Bin, PurchaseOrder, PurchaseOrderLine, MaterialReceipt, MaterialReceiptLine,
+    QualityInspection, QualityInspectionLine, GatePass, GatePassItem, InventoryItem,
+    MaterialDispatch, MaterialDispatchLineItem,
+)
+
+
+def stage_of(po_id: int) -> int:
+    return PIPELINE[po_id % len(PIPELINE)]
+
+
+def item_count(pos: int, lines_per_po: int) -> int:
+    return max(100, lines_per_po * 20, pos // 10)
+
+
+def store_count(pos: int) -> int:
+    return max(2, pos // 5000)
+
+
+def line_id(po_id: int, n: int, lines_per_po: int) -> int:
+    return (po_id - 1) * lines_per_po + n + 1
+
+
+def _masters(conn: Connection, items: int, stores: int) -> None:
+    conn.execute(insert(Item), [
+        {
+            "id": i,
+            "code": f"ITM-{i:06d}",
+            "name": f"Item {i}",
+            "unit": "NOS",
+            "description": f"Synthetic item {i}",
+        }
+        for i in range(1, items + 1)
+    ])
+    conn.execute(insert(Store), [
+        {
+            "id": s,
+            "store_id": f"ST-{s:03d}",
+            "name": f"Store {s}",
+            "plant_name": f"Plant {(s - 1) // 5 + 1}",
+            "in_charge_name": f"In-charge {s}",
+            "in_charge_mobile": f"9{s:09d}",
+            "in_charge_email": f"store{s}@example.com",
+            "created_at": START,
+            "updated_at": START,
+        }
+        for s in range(1, stores + 1)
+    ])
+    conn.execute(insert(Bin), [
+        {
+            "id": (s - 1) * BINS_PER_STORE + b,
+            "store_id": s,
+            "bin_no": f"B-{s:03d}-{b:02d}",
+            "created_at": START,
+            "updated_at": START,
+        }
+        for s in range(1, stores + 1)
+        for b in range(1, BINS_PER_STORE + 1)
+    ])
+
+
+def _chunk(conn: Connection, rng: random.Random, po_ids: range, lines_per_po: int, items: int, stores: int) -> None:
+    """Build and insert every document of the POs in `po_ids`."""
+    rows: Dict[type, list] = {model: [] for model in (
+        PurchaseOrder, PurchaseOrderLine, MaterialReceipt, MaterialReceiptLine,
+        QualityInspection, QualityInspectionLine, GatePass, GatePassItem,
+        InventoryItem, InventoryTransaction, MaterialDispatch, MaterialDispatchLineItem,
+    )}
+
+    for po_id in po_ids:
+        stage = stage_of(po_id)
+        vendor_id = po_id % VENDORS + 1
+        created_at = START + timedelta(minutes=po_id)
+        store_id = po_id % stores + 1
+        bin_id = (store_id - 1) * BINS_PER_STORE + po_id % BINS_PER_STORE + 1
+        first_item = rng.randrange(items)
+
+        rows[PurchaseOrder].append({
+            "id": po_id,
+            "po_number": f"PO-GEN-{po_id:07d}",
+            "vendor_id": vendor_id,
+            "status": POStatus.RECEIVED if stage >= RECEIVED else POStatus.SENT,
+            "created_at": created_at,
+            "po_sent_at": created_at + timedelta(hours=1),
+        })
+
+        rejected_total = 0
+        for n in range(lines_per_po):
+            lid = line_id(po_id, n, lines_per_po)
+            item_id = (first_item + n) % items + 1
+            ordered = rng.randint(10, 200)
+            rejected = rng.randint(0, ordered // 10)
+            accepted = ordered - rejected
+            dispatched = accepted // 2
+
+            rows[PurchaseOrderLine].append({
+                "id": lid,
+                "po_id": po_id,
+                "item_id": item_id,
+                "quantity": ordered,
+                "price": Decimal(rng.randint(100, 50000)) / 100,
+            })
+            if stage >= RECEIVED:
+                rows[MaterialReceiptLine].append({
+                    "id": lid, "mr_id": po_id, "po_line_id": lid,
+                    "ordered_quantity": ordered, "received_quantity": ordered,
+                })
+            if stage >= INSPECTED:
+                rejected_total += rejected
+                rows[QualityInspectionLine].append({
+                    "id": lid, "inspection_id": po_id, "mr_line_id": lid,
+                    "accepted_quantity": accepted, "rejected_quantity": rejected,
+                })
+            if stage >= GATE_PASSED:
+                rows[GatePassItem].append({
+                    "id": lid, "gate_pass_id": po_id, "item_id": item_id, "accepted_quantity": accepted,
+                })
+            if stage >= STORED:
+                rows[InventoryItem].append({
+                    "id": lid,
+                    "item_id": item_id,
+                    "store_id": store_id,
+                    "bin_id": bin_id,
+                    "quantity": accepted - dispatched if stage == DISPATCHED else accepted,
+                    "gate_pass_id": po_id,
+                    "created_at": created_at + timedelta(days=4),
+                })
+                rows[InventoryTransaction].append({
+                    "inventory_item_id": lid, "transaction_type": "IN", "quantity": accepted,
+                    "reference_type": "GATE_PASS", "reference_id": po_id,
+                    "remarks": "Material received into store", "created_by": "system",
+                })
+            if stage >= DISPATCH_DRAFT:
+                rows[MaterialDispatchLineItem].append({
+                    "id": lid,
+                    "dispatch_id": po_id,
+                    "inventory_item_id": lid,
+                    "item_id": item_id,
+                    "item_code": f"ITM-{item_id:06d}",
+                    "item_name": f"Item {item_id}",
+                    "quantity_dispatched": dispatched,
+                    "uom": "NOS",
+                    "created_at": created_at + timedelta(days=5),
+                    "updated_at": created_at + timedelta(days=5),
+                })
+            if stage == DISPATCHED:
+                rows[InventoryTransaction].append({
+                    "inventory_item_id": lid, "transaction_type": "OUT", "quantity": dispatched,
+                    "reference_type": "DISPATCH", "reference_id": po_id,
+                    "remarks": "Material dispatched", "created_by": "datagen",
+                })
+
+        if stage >= RECEIVED:
+            rows[MaterialReceipt].append({
+                "id": po_id,
+                "mr_number": f"MR-GEN-{po_id:07d}",
+                "po_id": po_id,
+                "vendor_id": vendor_id,
+                "vendor_name": f"Vendor {vendor_id}",
+                "bill_no": f"BILL-{po_id}",
+                "receipt_date": date(2024, 1, 1) + timedelta(days=po_id // 1440),
+                "store_id": store_id,
+                "bin_id": bin_id,
+                "received_at": created_at + timedelta(days=1),
+                "status": "GATE_PASSED" if stage >= GATE_PASSED else "INSPECTED" if stage >= INSPECTED else "CREATED",
+            })
+        if stage >= INSPECTED:
+            rows[QualityInspection].append({
+                "id": po_id,
+                "mr_id": po_id,
+                "inspected_by": "datagen",
+                "inspected_at": created_at + timedelta(days=2),
+                "result": "PARTIALLY_ACCEPTED" if rejected_total else "FULLY_ACCEPTED",
+            })
+        if stage >= GATE_PASSED:
+            rows[GatePass].append({
+                "id": po_id,
+                "gate_pass_number": f"GP-GEN-{po_id:07d}",
+                "po_id": po_id,
+                "mr_id": po_id,
+                "inspection_id": po_id,
+                "vendor_name": f"Vendor {vendor_id}",
+                "issued_by": "datagen",
+                "issued_at": created_at + timedelta(days=3),
+                "store_status": "RECEIVED" if stage >= STORED else "PENDING",
+            })
+        if stage >= DISPATCH_DRAFT:
+            rows[MaterialDispatch].append({
+                "id": po_id,
+                "dispatch_number": f"MD-GEN-{po_id:07d}",
+                "dispatch_date": created_at + timedelta(days=5),
+                "dispatch_status": DispatchStatus.DISPATCHED if stage == DISPATCHED else DispatchStatus.DRAFT,
+                "reference_type": ReferenceType.PO,
+                "reference_id": str(po_id),
+                "warehouse_id": store_id,
+                "created_by": "datagen",
+                "receiver_name": f"Receiver {po_id % 97}",
+                "receiver_contact": "9000000000",
+                "delivery_address": f"Site {po_id % 31}",
+                "vehicle_number": f"MH12AB{po_id % 10000:04d}",
+                "driver_name": f"Driver {po_id % 53}",
+                "driver_contact": "9111111111",
+                "created_at": created_at + timedelta(days=5),
+                "updated_at": created_at + timedelta(days=5),
+            })
+
+    # Parents before children
+    for model, batch in rows.items():
+        if batch:
+            conn.execute(insert(model), batch)
+
+
+def _reset_sequences(conn: Connection) -> None:
+    """Move id sequences past the explicit ids (PostgreSQL only)."""
+    if conn.dialect.name != "postgresql":
+        return
+    for model in _SEQUENCED_TABLES:
+        table = model.__tablename__
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        ))
+
+
+def generate(pos: int, lines_per_po: int = 5, seed: int = 42) -> dict:
+    """
+    Drop and re-create the schema and fill it with `pos` purchase orders.
+
+    Returns:
+        Row counts per table
+    """
+    if lines_per_po > item_count(pos, lines_per_po):
+        raise ValueError(f"lines_per_po must not exceed the item count ({item_count(pos, lines_per_po)})")
+
+    drop_tables()
+    create_tables()
+    populate(pos, lines_per_po, seed)
+
+    with engine.connect() as conn:
+        return {
+            model.__tablename__: conn.execute(text(f"SELECT COUNT(*) FROM {model.__tablename__}")).scalar()
+            for model in _SEQUENCED_TABLES + (InventoryTransaction,)
+        }
+
+
+def populate(pos: int, lines_per_po: int = 5, seed: int = 42) -> None:
+    """Fill an existing, empty schema (e.g. after `alembic upgrade head`)."""
+    items = item_count(pos, lines_per_po)
+    stores = store_count(pos)
+
+    rng = random.Random(seed)
+    with engine.begin() as conn:
+        _masters(conn, items, stores)
+        for offset in range(0, pos, BATCH):
+            _chunk(conn, rng, range(offset + 1, min(offset + BATCH, pos) + 1), lines_per_po, items, stores)
+        _reset_sequences(conn)
+
+    db = SessionLocal()
+    try:
+        POLineLedger.rebuild(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pos", type=int, default=10000, help="purchase orders to generate")
+    parser.add_argument("--lines", type=int, default=5, help="lines per purchase order")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    started = time.perf_counter()
+    counts = generate(args.pos, args.lines, args.seed)
+    print(f"Generated in {time.perf_counter() - started:.1f}s")
+    for table, count in counts.items():
+        print(f"  {table:<32} {count:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Concurrency stress check for multi-line inventory operations.
+
+Runs parallel workers that create, issue and cancel material dispatches
+over a small shared set of inventory items, each dispatch listing its
+lines in a random order. Half of the dispatches reference one shared PO,
+so issue and cancel also lock that PO's po_line_balances rows. Exits with
+code 1 if any worker hit a deadlock, if any stock went negative, if the
+final stock does not match the OUT/REVERSAL transaction ledger, or if the
+PO ledger drifted from the dispatches.
+
+The service functions are called without their transactional_retry
+wrapper: the wrapper reruns deadlocked transactions (40P01), which would
+hide exactly what this checks for.
+
+Needs a PostgreSQL database (SQLite serialises writers, so it cannot
+deadlock in the first place). From backend/:
+
+    DATABASE_URL=postgresql://... python -m benchmarks.dispatch_stress
+    DATABASE_URL=postgresql://... python -m benchmarks.dispatch_stress --workers 16 --ops 500
+
+The target database is dropped and re-created, so never point it at real
+data.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import func, insert
+from sqlalchemy.exc import DBAPIError
+
+import app.main  # noqa: F401  (registers every model on Base.metadata)
+from app.core.db import SessionLocal, create_tables, drop_tables, engine
+from app.procurement.models import Item, POStatus, PurchaseOrder, PurchaseOrderLine
+from app.procurement.services.po_line_ledger import POLineLedger
+from app.store.models.inventory import InventoryItem
+from app.store.models.inventory_transaction import InventoryTransaction
+from app.store.models.material_dispatch import ReferenceType
+from app.store.schemas.material_dispatch import MaterialDispatchCreate
+from app.store.services.material_dispatch_service import MaterialDispatchService
+
+_create = MaterialDispatchService.create_material_dispatch.__wrapped__
+_issue = MaterialDispatchService.issue_material_dispatch.__wrapped__
+_cancel = MaterialDispatchService.cancel_material_dispatch.__wrapped__
+
+DEADLOCK_DETECTED = "40P01"
+
+
+def seed(items: int, stock: int) -> tuple:
+    """
+    Create one inventory row per item and a SENT PO ordering every item.
+
+    Returns:
+        ([(inventory_id, item_id, stock)], po_id)
+    """
+    drop_tables()
+    create_tables()
+
+    db = SessionLocal()
+    try:
+        db.execute(insert(Item), [
+            {"id": item_id, "code": f"ITEM-{item_id}", "name": f"Item {item_id}", "unit": "Nos"}
+            for item_id in range(1, items + 1)
+        ])
+        po = PurchaseOrder(po_number="PO-STRESS", vendor_id=1, status=POStatus.SENT)
+        po.lines = [
+            # More than the stock, so PO dispatches are limited by inventory
+            PurchaseOrderLine(item_id=item_id, quantity=stock * 2, price=Decimal("1.00"))
+            for item_id in range(1, items + 1)
+        ]
+        db.add(po)
+        db.flush()
+        POLineLedger.rebuild(db, [po.id])
+
+        db.execute(insert(InventoryItem), [
+            {
+                "item_id": item_id,
+                "store_id": 1,
+                "bin_id": 1,
+                "quantity": stock,
+                "gate_pass_id": 0,
+                "created_at": datetime.utcnow(),
+            }
+            for item_id in range(1, items + 1)
+        ])
+        db.commit()
+        rows = db.query(InventoryItem.id, InventoryItem.item_id, InventoryItem.quantity).all()
+        return rows, po.id
+    finally:
+        db.close()
+
+
+def _dispatch_payload(worker: int, lines: list, po_id: int = None) -> MaterialDispatchCreate:
+    return MaterialDispatchCreate(
+        dispatch_date=datetime.utcnow(),
+        reference_type=ReferenceType.PO if po_id else ReferenceType.TRANSFER,
+        reference_id=str(po_id) if po_id else f"STRESS-{worker}",
+        warehouse_id=1,
+        created_by=f"worker-{worker}",
+        receiver_name="stress",
+        receiver_contact="0",
+        delivery_address="stress",
+        vehicle_number="STRESS",
+        driver_name="stress",
+        driver_contact="0",
+        line_items=[
+            {
+                "inventory_item_id": inventory_id,
+                "item_id": item_id,
+                "item_code": f"ITEM-{item_id}",
+                "item_name": f"Item {item_id}",
+                "quantity_dispatched": Decimal(qty),
+                "uom": "Nos",
+            }
+            for inventory_id, item_id, qty in lines
+        ],
+    )
+
+
+def worker(number: int, ops: int, inventory: list, max_lines: int, po_id: int, outcome: Counter, lock):
+    rng = random.Random(number)
+    issued = []
+
+    for _ in range(ops):
+        db = SessionLocal()
+        try:
+            if issued and rng.random() < 0.4:
+                _cancel(db, issued.pop(rng.randrange(len(issued))), f"worker-{number}", "stress")
+                result = "cancelled"
+            else:
+                picked = rng.sample(inventory, rng.randint(2, max_lines))
+                rng.shuffle(picked)
+                lines = [(inventory_id, item_id, rng.randint(1, 5)) for inventory_id, item_id in picked]
+
+                dispatch = _create(
+                    db, _dispatch_payload(number, lines, po_id if rng.random() < 0.5 else None)
+                )
+                _issue(db, dispatch.id)
+                issued.append(dispatch.id)
+                result = "issued"
+
+        except ValueError:
+            result = "rejected"          # e.g. insufficient stock: expected
+        except DBAPIError as e:
+            db.rollback()
+            code = getattr(e.orig, "pgcode", None)
+            result = "deadlock" if code == DEADLOCK_DETECTED else "db_error"
+            if result == "db_error":
+                print(f"[worker {number}] {e.orig}")
+        finally:
+            db.close()
+
+        with lock:
+            outcome[result] += 1
+
+
+def check_po_ledger(po_id: int) -> list:
+    """Return drift between the PO's stored balances and its dispatches."""
+    db = SessionLocal()
+    try:
+        return [
+            f"PO line {p['po_line_id']}: {p['counter'] or 'row'} stored={p['stored']} actual={p['actual']}"
+            for p in POLineLedger.verify(db, [po_id])
+        ]
+    finally:
+        db.close()
+
+
+def check_stock(initial: dict) -> list:
+    """Return a list of human-readable problems with the final stock."""
+    db = SessionLocal()
+    try:
+        problems = []
+        final = dict(db.query(InventoryItem.id, InventoryItem.quantity).all())
+
+        negative = {inventory_id: qty for inventory_id, qty in final.items() if qty < 0}
+        if negative:
+            problems.append(f"negative stock: {negative}")
+
+        moved = {}
+        for inventory_id, txn_type, qty in (
+            db.query(
+                InventoryTransaction.inventory_item_id,
+                InventoryTransaction.transaction_type,
+                func.sum(InventoryTransaction.quantity),
+            )
+            .group_by(InventoryTransaction.inventory_item_id, InventoryTransaction.transaction_type)
+        ):
+            sign = -1 if txn_type == "OUT" else 1
+            moved[inventory_id] = moved.get(inventory_id, 0) + sign * int(qty)
+
+        for inventory_id, start in initial.items():
+            expected = start + moved.get(inventory_id, 0)
+            if final[inventory_id] != expected:
+                problems.append(
+                    f"inventory {inventory_id}: stock {final[inventory_id]} != ledger {expected}"
+                )
+
+        return problems
+    finally:
+        db.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=200, help="operations per worker")
+    parser.add_argument("--items", type=int, default=12, help="shared inventory rows")
+    parser.add_argument("--stock", type=int, default=400, help="initial stock per row")
+    parser.add_argument("--max-lines", type=int, default=6)
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("dispatch_stress needs DATABASE_URL pointing at a PostgreSQL database")
+        return 2
+
+    rows, po_id = seed(args.items, args.stock)
+    initial = {inventory_id: qty for inventory_id, _, qty in rows}
+    inventory = [(inventory_id, item_id) for inventory_id, item_id, _ in rows]
+
+    outcome, lock = Counter(), threading.Lock()
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(n, args.ops, inventory, min(args.max_lines, len(inventory)), po_id, outcome, lock),
+        )
+        for n in range(args.workers)
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    problems = check_stock(initial) + check_po_ledger(po_id)
+    if outcome["deadlock"]:
+        problems.insert(0, f"{outcome['deadlock']} deadlock(s)")
+    if outcome["db_error"]:
+        problems.insert(0, f"{outcome['db_error']} unexpected database error(s)")
+
+    print(
+        f"{args.workers} workers x {args.ops} ops in {elapsed:.1f}s: "
+        + ", ".join(f"{key}={value}" for key, value in sorted(outcome.items()))
+    )
+    for problem in problems:
+        print(f"FAIL {problem}")
+    if not problems:
+        print("OK no deadlocks, no negative stock, stock and PO ledger match the documents")
+
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
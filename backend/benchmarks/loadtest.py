@@ -0,0 +1,409 @@
+"""
+Load test: concurrent procurement -> store lifecycles or access-log replay.
+
+Drives a running server over HTTP (asyncio + httpx). In `lifecycle` mode
+each virtual user loops through the full document flow:
+
+    POST /procurement/                       create PO
+    POST /procurement/{po_id}/send
+    POST /quality/material-receipt/
+    POST /quality/inspection/
+    POST /quality/gate-pass/
+    POST /quality/gate-pass/{id}/dispatch    dispatch to store
+    POST /store/receive-gate-pass/{id}
+    GET  /store/inventory                    pick stock, oldest row first
+    POST /store/material-dispatch/
+    POST /store/material-dispatch/{id}/issue
+
+POs draw from a small item pool (--items), so concurrent dispatches pick
+the same inventory rows and contend on their locks the way a busy store
+does. A failed step ends that user's lifecycle; the user starts a new one.
+
+In `replay` mode the GET requests of a recorded access log (the JSON lines
+written by app.access, LOG_FORMAT=json or text) are replayed with their
+original spacing divided by --speed, or back to back with --speed 0.
+Writes are skipped: their bodies are not logged. The log is streamed
+through a bounded queue to --users workers, so its size does not matter;
+when the server falls behind, the replay falls behind with it instead of
+piling up requests. Results are grouped by the logged route template
+(GET /api/v1/procurement/{po_id}); the text format has no route, so its
+numeric path segments are folded into {id}. Only the JSON format records
+query strings and routes, so prefer it for replay.
+
+Reports p50/p95/p99 latency, throughput and 4xx/5xx/transport error rates
+per endpoint, plus completed lifecycles per second.
+
+Usage (from backend/, against a server started separately):
+
+    gunicorn -c gunicorn.conf.py app.main:app
+    python -m benchmarks.loadtest lifecycle --users 50 --duration 60
+    python -m benchmarks.loadtest replay access.log --speed 2 --users 100
+    python -m benchmarks.loadtest lifecycle --base-url http://staging:8000 --output run.json
+
+The lifecycle mode creates items, a store, POs and stock on the target;
+never point it at production.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+API = "/api/v1"
+ITEM_PREFIX = "LT-ITEM-"
+STORE_CODE = "LT-STORE"
+
+_TEXT_ACCESS_LINE = re.compile(
+    r"^(?P<ts>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}) \w+ app\.access \[[^\]]*\] "
+    r"(?P<method>[A-Z]+) (?P<path>\S+) (?P<status>\d{3}) "
+)
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct * len(ordered)) - 1)]
+
+
+class Stats:
+    """Latencies and outcomes per endpoint label."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.outcomes: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.lifecycles: List[float] = []
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+
+    def record(self, label: str, seconds: float, outcome: str) -> None:
+        self.latencies[label].append(seconds * 1000)
+        self.outcomes[label][outcome] += 1
+
+    def report(self) -> dict:
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        endpoints = {}
+        for label, latencies in sorted(self.latencies.items()):
+            outcomes = self.outcomes[label]
+            total = len(latencies)
+            endpoints[label] = {
+                "requests": total,
+                "rps": round(total / elapsed, 2),
+                "p50_ms": round(percentile(latencies, 0.50), 2),
+                "p95_ms": round(percentile(latencies, 0.95), 2),
+                "p99_ms": round(percentile(latencies, 0.99), 2),
+                "max_ms": round(max(latencies), 2),
+                "4xx": outcomes["4xx"],
+                "5xx": outcomes["5xx"],
+                "transport_errors": outcomes["transport"],
+                "error_rate": round((total - outcomes["ok"]) / total, 4),
+            }
+        report = {"elapsed_seconds": round(elapsed, 2), "endpoints": endpoints}
+        if self.lifecycles:
+            report["lifecycles"] = {
+                "completed": len(self.lifecycles),
+                "per_second": round(len(self.lifecycles) / elapsed, 2),
+                "p50_ms": round(percentile(self.lifecycles, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(self.lifecycles, 0.95) * 1000, 2),
+            }
+        return report
+
+
+class StepFailed(Exception):
+    pass
+
+
+async def call(client: httpx.AsyncClient, stats: Stats, label: str, method: str, path: str, **kwargs):
+    """Send one request, record it under `label` and return the decoded body."""
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, path, **kwargs)
+    except httpx.HTTPError as e:
+        stats.record(label, time.perf_counter() - started, "transport")
+        raise StepFailed(f"{label}: {e!r}") from e
+
+    elapsed = time.perf_counter() - started
+    if response.status_code >= 500:
+        stats.record(label, elapsed, "5xx")
+    elif response.status_code >= 400:
+        stats.record(label, elapsed, "4xx")
+    else:
+        stats.record(label, elapsed, "ok")
+        return response.json() if response.content else None
+    raise StepFailed(f"{label}: {response.status_code} {response.text[:200]}")
+
+
+# ---------- Lifecycle mode ----------
+
+async def prepare(client: httpx.AsyncClient, item_count: int) -> dict:
+    """Create (or reuse) the item pool, a store and a bin for the run."""
+    existing = {
+        item["code"]: item["id"]
+        for item in (await client.get(f"{API}/procurement/items")).raise_for_status().json()
+    }
+    item_ids = []
+    for n in range(1, item_count + 1):
+        code = f"{ITEM_PREFIX}{n:03d}"
+        if code not in existing:
+            response = await client.post(f"{API}/procurement/items", json={
+                "name": f"Load test item {n}", "code": code, "unit": "NOS",
+                "description": f"Load test item {n}",
+            })
+            existing[code] = response.raise_for_status().json()["id"]
+        item_ids.append(existing[code])
+
+    stores = (await client.get(f"{API}/store/stores", params={"limit": 1000})).raise_for_status().json()
+    store = next((s for s in stores if s["store_id"] == STORE_CODE), None)
+    if store is None:
+        store = (await client.post(f"{API}/store/stores", json={
+            "store_id": STORE_CODE, "name": "Load test store", "plant_name": "Load test",
+            "in_charge_name": "Load test", "in_charge_mobile": "0000000000",
+            "in_charge_email": "loadtest@example.com",
+        })).raise_for_status().json()
+
+    bins = (await client.get(f"{API}/store/stores/{store['id']}/bins")).raise_for_status().json()
+    if bins:
+        bin_id = bins[0]["id"]
+    else:
+        bin_id = (await client.post(
+            f"{API}/store/stores/{store['id']}/bins", json={"bin_no": "LT-BIN-1"}
+        )).raise_for_status().json()["id"]
+
+    return {"item_ids": item_ids, "store_id": store["id"], "bin_id": bin_id}
+
+
+async def lifecycle(client: httpx.AsyncClient, stats: Stats, rng: random.Random, fixture: dict, lines: int) -> None:
+    item_ids = rng.sample(fixture["item_ids"], min(lines, len(fixture["item_ids"])))
+    store_id, bin_id = fixture["store_id"], fixture["bin_id"]
+
+    # 1️⃣ Purchase order
+    po = await call(client, stats, "POST /procurement/", "POST", f"{API}/procurement/", json={
+        "vendor_id": rng.randint(1, 50),
+        "lines": [{"item_id": i, "quantity": rng.randint(5, 20), "price": "10.00"} for i in item_ids],
+    })
+    await call(client, stats, "POST /procurement/{po_id}/send", "POST", f"{API}/procurement/{po['id']}/send")
+
+    # 2️⃣ Material receipt -> inspection -> gate pass
+    mr = await call(client, stats, "POST /quality/material-receipt/", "POST", f"{API}/quality/material-receipt/", json={
+        "po_id": po["id"], "vendor_id": po["vendor_id"], "store_id": store_id, "bin_id": bin_id,
+        "lines": [{"po_line_id": line["id"], "received_quantity": line["quantity"]} for line in po["lines"]],
+    })
+    inspection = await call(client, stats, "POST /quality/inspection/", "POST", f"{API}/quality/inspection/", json={
+        "mr_id": mr["id"], "inspected_by": "loadtest",
+        "lines": [
+            {"mr_line_id": line["id"], "accepted_quantity": line["received_quantity"] - 1, "rejected_quantity": 1}
+            for line in mr["lines"]
+        ],
+    })
+    gate_pass = await call(client, stats, "POST /quality/gate-pass/", "POST", f"{API}/quality/gate-pass/", json={
+        "inspection_id": inspection["id"], "issued_by": "loadtest",
+    })
+    await call(
+        client, stats, "POST /quality/gate-pass/{id}/dispatch", "POST",
+        f"{API}/quality/gate-pass/{gate_pass['id']}/dispatch",
+    )
+
+    # 3️⃣ Receive into store
+    await call(
+        client, stats, "POST /store/receive-gate-pass/{id}", "POST",
+        f"{API}/store/receive-gate-pass/{gate_pass['id']}",
+    )
+
+    # 4️⃣ Dispatch against the PO, oldest stock of each item first
+    line_items = []
+    for line in po["lines"]:
+        quantity = rng.randint(1, 3)
+        stock = await call(
+            client, stats, "GET /store/inventory", "GET", f"{API}/store/inventory",
+            params={"store_id": store_id, "item_id": line["item_id"]},
+        )
+        row = min((r for r in stock if r["quantity"] >= quantity), key=lambda r: r["id"], default=None)
+        if row is None:
+            continue
+        line_items.append({
+            "inventory_item_id": row["id"], "item_id": row["item_id"], "item_code": row["item_code"],
+            "item_name": row["item_name"] or row["item_code"], "quantity_dispatched": str(quantity),
+            "uom": row["unit"],
+        })
+    if not line_items:
+        raise StepFailed("no stock to dispatch")
+
+    dispatch = await call(client, stats, "POST /store/material-dispatch/", "POST", f"{API}/store/material-dispatch/", json={
+        "dispatch_date": datetime.utcnow().isoformat(), "reference_type": "PO", "reference_id": str(po["id"]),
+        "warehouse_id": store_id, "created_by": "loadtest", "receiver_name": "Load test",
+        "receiver_contact": "0000000000", "delivery_address": "Load test site", "vehicle_number": "LT-0001",
+        "driver_name": "Load test", "driver_contact": "0000000000", "line_items": line_items,
+    })
+    await call(
+        client, stats, "POST /store/material-dispatch/{id}/issue", "POST",
+        f"{API}/store/material-dispatch/{dispatch['id']}/issue",
+    )
+
+
+async def run_lifecycles(client: httpx.AsyncClient, args) -> Stats:
+    fixture = await prepare(client, args.items)
+    stats = Stats()
+    deadline = stats.started_at + args.duration
+    failures: Dict[str, int] = defaultdict(int)
+
+    async def user(n: int) -> None:
+        rng = random.Random(args.seed + n)
+        await asyncio.sleep(args.ramp_up * n / args.users)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                await lifecycle(client, stats, rng, fixture, args.lines)
+                stats.lifecycles.append(time.perf_counter() - started)
+            except StepFailed as e:
+                failures[str(e).split(":")[0]] += 1
+
+    await asyncio.gather(*(user(n) for n in range(args.users)))
+    stats.finished_at = time.perf_counter()
+
+    for step, count in sorted(failures.items(), key=lambda f: -f[1]):
+        print(f"  lifecycle aborted at {step}: {count}x")
+    return stats
+
+
+# ---------- Replay mode ----------
+
+def read_access_log(path: str) -> Iterator[dict]:
+    """
+    Stream the access log: {offset, method, path, route} per request line,
+    offset in seconds since the first timestamped line (in file order).
+    """
+    first = None
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("{"):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("logger") != "app.access" or "path" not in record:
+                    continue
+                ts = datetime.fromisoformat(record["ts"]).timestamp() if record.get("ts") else None
+                method, route = record["method"], record.get("route")
+                path = record["path"] + (f"?{record['query']}" if record.get("query") else "")
+            else:
+                match = _TEXT_ACCESS_LINE.match(line)
+                if not match:
+                    continue
+                ts = datetime.strptime(match["ts"], "%Y-%m-%d %H:%M:%S,%f").timestamp()
+                method, path, route = match["method"], match["path"], None
+
+            if not route or route == "unmatched":
+                route = _NUMERIC_SEGMENT.sub("/{id}", path.split("?", 1)[0])
+            if first is None and ts is not None:
+                first = ts
+            offset = ts - first if ts is not None and first is not None else 0.0
+            yield {"offset": offset, "method": method, "path": path, "route": route}
+
+
+async def run_replay(client: httpx.AsyncClient, args) -> Stats:
+    stats = Stats()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=args.users * 2)
+    skipped = replayed = 0
+
+    async def worker() -> None:
+        while True:
+            entry = await queue.get()
+            if entry is None:
+                return
+            try:
+                await call(client, stats, f"{entry['method']} {entry['route']}", entry["method"], entry["path"])
+            except StepFailed:
+                pass
+
+    workers = [asyncio.create_task(worker()) for _ in range(args.users)]
+    try:
+        for entry in read_access_log(args.log):
+            if entry["method"] not in ("GET", "HEAD"):
+                skipped += 1
+                continue
+            if args.speed > 0:
+                await asyncio.sleep(max(0.0, entry["offset"] / args.speed - (time.perf_counter() - stats.started_at)))
+            await queue.put(entry)          # blocks while all workers are busy
+            replayed += 1
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    stats.finished_at = time.perf_counter()
+
+    print(f"Replayed {replayed} of {replayed + skipped} requests ({skipped} writes skipped)")
+    return stats
+
+
+# ---------- Output ----------
+
+def print_report(report: dict) -> None:
+    print(f"\n{'endpoint':<44} {'reqs':>6} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'4xx':>5} {'5xx':>5} {'net':>4} {'err%':>6}")
+    for label, s in report["endpoints"].items():
+        print(
+            f"{label[:44]:<44} {s['requests']:>6} {s['rps']:>7.1f} {s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} "
+            f"{s['p99_ms']:>8.1f} {s['4xx']:>5} {s['5xx']:>5} {s['transport_errors']:>4} {s['error_rate']:>6.1%}"
+        )
+    total = sum(s["requests"] for s in report["endpoints"].values())
+    print(f"\n{total} requests in {report['elapsed_seconds']}s ({total / max(report['elapsed_seconds'], 1e-9):.1f} req/s)")
+    if "lifecycles" in report:
+        lc = report["lifecycles"]
+        print(f"{lc['completed']} lifecycles ({lc['per_second']}/s), p50 {lc['p50_ms']}ms, p95 {lc['p95_ms']}ms")
+
+
+async def main_async(args) -> dict:
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        if args.mode == "lifecycle":
+            stats = await run_lifecycles(client, args)
+        else:
+            stats = await run_replay(client, args)
+    return stats.report()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users / in-flight requests")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--output", help="write the report to this JSON file")
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    lifecycle_parser = modes.add_parser("lifecycle", help="run PO -> dispatch lifecycles")
+    lifecycle_parser.add_argument("--duration", type=float, default=60.0, help="seconds to run")
+    lifecycle_parser.add_argument("--ramp-up", type=float, default=5.0, help="seconds until all users are running")
+    lifecycle_parser.add_argument("--items", type=int, default=10, help="size of the shared item pool")
+    lifecycle_parser.add_argument("--lines", type=int, default=3, help="lines per PO")
+    lifecycle_parser.add_argument("--seed", type=int, default=42)
+
+    replay_parser = modes.add_parser("replay", help="replay the GETs of an access log")
+    replay_parser.add_argument("log", help="access log file (JSON lines or text format)")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="time compression; 0 = no delays")
+
+    args = parser.parse_args()
+    report = asyncio.run(main_async(args))
+    report.update({"mode": args.mode, "base_url": args.base_url, "users": args.users})
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if any(s["5xx"] or s["transport_errors"] for s in report["endpoints"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
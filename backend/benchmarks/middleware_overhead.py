@@ -0,0 +1,148 @@
+"""
+Micro-benchmark: request middleware overhead.
+
+Measures requests/sec for GET /health and GET /api/v1/store/inventory on
+the in-process ASGI app (httpx.AsyncClient over ASGITransport, no network)
+with three middleware stacks:
+
+    none          CORS only, no request middleware
+    pure_asgi     the current stack (RequestContextMiddleware)
+    base_http     the same stack behind a pass-through @app.middleware("http")
+                  (BaseHTTPMiddleware), i.e. the previous structure
+
+Usage (from backend/):
+
+    python -m benchmarks.middleware_overhead
+    python -m benchmarks.middleware_overhead --requests 5000 --concurrency 20
+
+Without DATABASE_URL a throwaway SQLite file seeded with a few hundred
+inventory rows is used. Logging is sent to a null handler so the numbers
+measure the middleware, not stdout.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="mw_bench_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from starlette.middleware import Middleware  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.core.db import SessionLocal, create_tables  # noqa: E402
+from app.core.middleware import RequestContextMiddleware  # noqa: E402
+from app.store.models.inventory import InventoryItem  # noqa: E402
+from app.store.models.store import Bin, Store  # noqa: E402
+
+ENDPOINTS = ("/health", "/api/v1/store/inventory?store_id=1")
+
+
+def seed(rows: int) -> None:
+    create_tables()
+    db = SessionLocal()
+    try:
+        if db.query(InventoryItem.id).first() is not None:
+            return
+        store = Store(
+            store_id="BENCH-1",
+            name="Bench store",
+            plant_name="Bench plant",
+            in_charge_name="Bench",
+            in_charge_mobile="0000000000",
+            in_charge_email="bench@example.com",
+        )
+        db.add(store)
+        db.flush()
+        bin_ = Bin(store_id=store.id, bin_no="B-1")
+        db.add(bin_)
+        db.flush()
+        db.execute(insert(InventoryItem), [
+            {
+                "item_id": item_id,
+                "store_id": store.id,
+                "bin_id": bin_.id,
+                "quantity": 100,
+                "gate_pass_id": 0,
+                "created_at": datetime.utcnow(),
+            }
+            for item_id in range(1, rows + 1)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _pass_through(request, call_next):
+    return await call_next(request)
+
+
+def use_stack(kind: str, original: list) -> None:
+    """Swap the app's middleware stack; Starlette rebuilds it on the next request."""
+    if kind == "none":
+        stack = [m for m in original if m.cls is not RequestContextMiddleware]
+    elif kind == "pure_asgi":
+        stack = list(original)
+    else:
+        stack = [Middleware(BaseHTTPMiddleware, dispatch=_pass_through)] + list(original)
+    app.user_middleware = stack
+    app.middleware_stack = None
+
+
+async def run(path: str, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)          # warm-up / build the middleware stack
+
+        remaining = total
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                response = await client.get(path)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=200, help="inventory rows to seed")
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    args = parser.parse_args()
+
+    root = logging.getLogger()
+    root.handlers = [logging.NullHandler()]
+
+    seed(args.rows)
+    original = list(app.user_middleware)
+
+    print(f"{'endpoint':<42} {'stack':<10} {'req/s':>9}")
+    for path in ENDPOINTS:
+        baseline = None
+        for kind in ("none", "pure_asgi", "base_http"):
+            use_stack(kind, original)
+            best = max(
+                asyncio.run(run(path, args.requests, args.concurrency))
+                for _ in range(args.repeat)
+            )
+            baseline = baseline or best
+            print(f"{path:<42} {kind:<10} {best:>9.0f}  ({best / baseline:.0%} of none)")
+
+    use_stack("pure_asgi", original)
+
+
+if __name__ == "__main__":
+    main()
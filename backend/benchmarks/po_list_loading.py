@@ -0,0 +1,184 @@
+"""
+Benchmark: loader strategy for PurchaseOrder.lines on list/detail paths.
+
+Seeds 10k purchase orders with 50 lines each (500k lines) and times
+ProcurementService list/detail reads under each LineLoading strategy,
+reporting the number of SQL statements, the rows the database returned
+for them and the latency.
+
+Usage (from backend/):
+
+    python -m benchmarks.po_list_loading
+    python -m benchmarks.po_list_loading --pos 2000 --lines 20 --repeat 3
+    DATABASE_URL=postgresql://... python -m benchmarks.po_list_loading --keep
+
+Without DATABASE_URL a throwaway SQLite file is used. The target database
+is dropped and re-created, so never point it at real data.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="po_bench_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+from sqlalchemy import event, insert  # noqa: E402
+
+import app.main  # noqa: E402,F401  (registers every model on Base.metadata)
+from app.core.db import SessionLocal, create_tables, drop_tables, engine  # noqa: E402
+from app.procurement.models import Item, POStatus, PurchaseOrder, PurchaseOrderLine  # noqa: E402
+from app.procurement.services import LineLoading, ProcurementService  # noqa: E402
+
+VENDORS = 20
+ITEMS = 500
+BATCH = 5000
+
+
+def seed(pos: int, lines: int) -> None:
+    """Bulk-insert items, POs and PO lines through Core executemany."""
+    drop_tables()
+    create_tables()
+
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Item), [
+            {
+                "id": i,
+                "code": f"ITM-{i:05d}",
+                "name": f"Item {i}",
+                "unit": "NOS",
+                "description": f"Benchmark item {i}",
+            }
+            for i in range(1, ITEMS + 1)
+        ])
+
+        for offset in range(0, pos, BATCH):
+            ids = range(offset + 1, min(offset + BATCH, pos) + 1)
+            conn.execute(insert(PurchaseOrder), [
+                {
+                    "id": po_id,
+                    "po_number": f"PO-BENCH-{po_id:06d}",
+                    "vendor_id": po_id % VENDORS + 1,
+                    "status": POStatus.SENT,
+                    "created_at": start + timedelta(minutes=po_id),
+                }
+                for po_id in ids
+            ])
+            conn.execute(insert(PurchaseOrderLine), [
+                {
+                    "po_id": po_id,
+                    "item_id": (po_id * lines + n) % ITEMS + 1,
+                    "quantity": 10 + n,
+                    "price": Decimal("12.50"),
+                }
+                for po_id in ids
+                for n in range(lines)
+            ])
+
+
+class StatementRecorder:
+    """Capture the SELECTs a block of ORM code sends to the database."""
+
+    def __init__(self):
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._record)
+
+    def rows_fetched(self) -> int:
+        """Replay the captured statements and count the rows they return."""
+        total = 0
+        with engine.connect() as conn:
+            for statement, parameters in self.statements:
+                total += len(conn.exec_driver_sql(statement, parameters).fetchall())
+        return total
+
+
+def run_case(label: str, fn, repeat: int) -> None:
+    timings = []
+    recorder = StatementRecorder()
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            with recorder:
+                started = time.perf_counter()
+                fn(db)
+                timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            db.close()
+
+    print(
+        f"{label:<42} statements={len(recorder.statements):>3} "
+        f"rows={recorder.rows_fetched():>8} "
+        f"median={statistics.median(timings):>9.1f}ms "
+        f"max={max(timings):>9.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pos", type=int, default=10000, help="purchase orders to seed")
+    parser.add_argument("--lines", type=int, default=50, help="lines per purchase order")
+    parser.add_argument("--page-size", type=int, default=100, help="limit for list pages")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case")
+    parser.add_argument("--keep", action="store_true", help="reuse already seeded data")
+    args = parser.parse_args()
+
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    if not args.keep:
+        started = time.perf_counter()
+        seed(args.pos, args.lines)
+        print(f"Seeded {args.pos} POs x {args.lines} lines in {time.perf_counter() - started:.1f}s")
+
+    vendor_id = 1
+    vendor_pos = args.pos // VENDORS
+    detail_id = args.pos // 2
+
+    for strategy in LineLoading:
+        print(f"\n-- lines loaded with {strategy.value}")
+        run_case(
+            f"list page (limit={args.page_size})",
+            lambda db: ProcurementService.get_purchase_orders(
+                db, limit=args.page_size, line_loading=strategy
+            ),
+            args.repeat,
+        )
+        run_case(
+            f"vendor page (limit={args.page_size})",
+            lambda db: ProcurementService.get_purchase_orders_by_vendor(
+                db, vendor_id, limit=args.page_size, line_loading=strategy
+            ),
+            args.repeat,
+        )
+        run_case(
+            f"vendor, all ~{vendor_pos} POs in one page",
+            lambda db: ProcurementService.get_purchase_orders_by_vendor(
+                db, vendor_id, limit=vendor_pos, line_loading=strategy
+            ),
+            args.repeat,
+        )
+        run_case(
+            "single PO detail",
+            lambda db: ProcurementService.get_purchase_order(
+                db, detail_id, line_loading=strategy
+            ),
+            args.repeat,
+        )
+
+
+if __name__ == "__main__":
+    main()
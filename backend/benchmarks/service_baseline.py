@@ -0,0 +1,338 @@
+"""
+Benchmark: hot service functions of the procurement -> store flow at scale.
+
+For each scale (number of purchase orders) the database is filled by
+benchmarks.datagen, then every service function below is called --rounds
+times, each call on a fresh session and on a document it has not seen yet
+(a SENT PO without receipt, a CREATED MR, ...). Latency and SQL statement
+counts are reported per function and can be written to a JSON baseline and
+compared against a previous one.
+
+    create_purchase_order      get_purchase_orders      create_material_receipt
+    inspect_material           generate_gate_pass       receive_gate_pass
+    issue_material_dispatch
+
+Usage (from backend/):
+
+    python -m benchmarks.service_baseline --output baseline.json
+    python -m benchmarks.service_baseline --compare baseline.json
+    python -m benchmarks.service_baseline --scales 1000 10000 100000 --rounds 50
+    DATABASE_URL=postgresql://... python -m benchmarks.service_baseline --output pg.json
+
+--compare exits with code 1 when a function's median is more than
+--tolerance (default 25%) slower than in the baseline at the same scale.
+
+Without DATABASE_URL a throwaway SQLite file is used. The target database
+is dropped and re-created, so never point it at real data.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable, List, NamedTuple, Optional
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="service_bench_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core import instrumentation  # noqa: E402
+from app.core.db import SessionLocal, engine  # noqa: E402
+from app.procurement.models import POStatus, PurchaseOrder  # noqa: E402
+from app.procurement.schemas.purchase_order import PurchaseOrderCreate, PurchaseOrderLineCreate  # noqa: E402
+from app.procurement.services import ProcurementService  # noqa: E402
+from app.quality.models.gate_pass import GatePass  # noqa: E402
+from app.quality.models.inspection import QualityInspection  # noqa: E402
+from app.quality.models.material_receipt import MaterialReceipt  # noqa: E402
+from app.quality.schemas.inspection import InspectionCreate, InspectionLineCreate  # noqa: E402
+from app.quality.schemas.material_receipt import MaterialReceiptCreate, MaterialReceiptLineCreate  # noqa: E402
+from app.quality.services.gate_pass_service import GatePassService  # noqa: E402
+from app.quality.services.inspection_service import InspectionService  # noqa: E402
+from app.quality.services.material_receipt_service import MaterialReceiptService  # noqa: E402
+from app.store.models.material_dispatch import DispatchStatus, MaterialDispatch  # noqa: E402
+from app.store.services import StoreService  # noqa: E402
+from app.store.services.material_dispatch_service import MaterialDispatchService  # noqa: E402
+
+from benchmarks import datagen  # noqa: E402
+
+
+class Operation(NamedTuple):
+    name: str
+    # (db, rounds, scale) -> one argument per round
+    targets: Callable[[Session, int, int], list]
+    call: Callable[[Session, object], object]
+
+
+# ---------- Targets ----------
+
+def _new_po_payloads(db: Session, rounds: int, scale: int) -> list:
+    rng = random.Random(rounds)
+    items = datagen.item_count(scale, 5)
+    payloads = []
+    for _ in range(rounds):
+        first = rng.randrange(items)
+        payloads.append(PurchaseOrderCreate(
+            vendor_id=rng.randint(1, datagen.VENDORS),
+            lines=[
+                PurchaseOrderLineCreate(
+                    item_id=(first + n) % items + 1,
+                    quantity=rng.randint(10, 200),
+                    price=Decimal("12.50"),
+                )
+                for n in range(5)
+            ],
+        ))
+    return payloads
+
+
+def _list_pages(db: Session, rounds: int, scale: int) -> list:
+    return [None] * rounds
+
+
+def _receipt_payloads(db: Session, rounds: int, scale: int) -> list:
+    received = db.query(MaterialReceipt.po_id)
+    pos = (
+        db.query(PurchaseOrder)
+        .filter(PurchaseOrder.status == POStatus.SENT, PurchaseOrder.id.notin_(received))
+        .order_by(PurchaseOrder.id)
+        .limit(rounds)
+        .all()
+    )
+    payloads = []
+    for po in pos:
+        store_id = po.id % datagen.store_count(scale) + 1
+        payloads.append(MaterialReceiptCreate(
+            po_id=po.id,
+            vendor_id=po.vendor_id,
+            vendor_name=f"Vendor {po.vendor_id}",
+            bill_no=f"BILL-BENCH-{po.id}",
+            store_id=store_id,
+            bin_id=(store_id - 1) * datagen.BINS_PER_STORE + 1,
+            lines=[
+                MaterialReceiptLineCreate(po_line_id=line.id, received_quantity=line.quantity)
+                for line in po.lines
+            ],
+        ))
+    return payloads
+
+
+def _inspection_payloads(db: Session, rounds: int, scale: int) -> list:
+    receipts = (
+        db.query(MaterialReceipt)
+        .filter(MaterialReceipt.status == "CREATED")
+        .order_by(MaterialReceipt.id)
+        .limit(rounds)
+        .all()
+    )
+    return [
+        InspectionCreate(
+            mr_id=mr.id,
+            inspected_by="bench",
+            lines=[
+                InspectionLineCreate(
+                    mr_line_id=line.id,
+                    accepted_quantity=line.received_quantity - line.received_quantity // 10,
+                    rejected_quantity=line.received_quantity // 10,
+                )
+                for line in mr.lines
+            ],
+        )
+        for mr in receipts
+    ]
+
+
+def _inspections_without_gate_pass(db: Session, rounds: int, scale: int) -> list:
+    passed = db.query(GatePass.inspection_id)
+    return [
+        row.id for row in
+        db.query(QualityInspection.id)
+        .filter(QualityInspection.id.notin_(passed))
+        .order_by(QualityInspection.id)
+        .limit(rounds)
+    ]
+
+
+def _pending_gate_passes(db: Session, rounds: int, scale: int) -> list:
+    return [
+        row.id for row in
+        db.query(GatePass.id)
+        .filter(GatePass.store_status == "PENDING")
+        .order_by(GatePass.id)
+        .limit(rounds)
+    ]
+
+
+def _draft_dispatches(db: Session, rounds: int, scale: int) -> list:
+    return [
+        row.id for row in
+        db.query(MaterialDispatch.id)
+        .filter(MaterialDispatch.dispatch_status == DispatchStatus.DRAFT)
+        .order_by(MaterialDispatch.id)
+        .limit(rounds)
+    ]
+
+
+OPERATIONS = (
+    Operation(
+        "create_purchase_order", _new_po_payloads,
+        lambda db, payload: ProcurementService.create_purchase_order(db, payload),
+    ),
+    Operation(
+        "get_purchase_orders", _list_pages,
+        lambda db, _: ProcurementService.get_purchase_orders(db, limit=25),
+    ),
+    Operation(
+        "create_material_receipt", _receipt_payloads,
+        lambda db, payload: MaterialReceiptService.create_material_receipt(db, payload),
+    ),
+    Operation(
+        "inspect_material", _inspection_payloads,
+        lambda db, payload: InspectionService.inspect_material(db, payload),
+    ),
+    Operation(
+        "generate_gate_pass", _inspections_without_gate_pass,
+        lambda db, inspection_id: GatePassService.generate_gate_pass(db, inspection_id, issued_by="bench"),
+    ),
+    Operation(
+        "receive_gate_pass", _pending_gate_passes,
+        lambda db, gate_pass_id: StoreService.receive_gate_pass(db, gate_pass_id),
+    ),
+    Operation(
+        "issue_material_dispatch", _draft_dispatches,
+        lambda db, dispatch_id: MaterialDispatchService.issue_material_dispatch(db, dispatch_id),
+    ),
+)
+
+
+# ---------- Runner ----------
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))]
+
+
+def run_operation(op: Operation, rounds: int, scale: int) -> Optional[dict]:
+    db = SessionLocal()
+    try:
+        targets = op.targets(db, rounds, scale)
+    finally:
+        db.close()
+    if not targets:
+        return None
+
+    timings, queries = [], []
+    for target in targets:
+        db = SessionLocal()
+        try:
+            stats = instrumentation.start_request()
+            started = time.perf_counter()
+            op.call(db, target)
+            timings.append((time.perf_counter() - started) * 1000)
+            instrumentation.finish_request(stats, "BENCH", op.name)
+            if stats is not None:
+                queries.append(stats.query_count)
+        finally:
+            db.close()
+
+    return {
+        "rounds": len(timings),
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(_percentile(timings, 0.95), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "queries": int(statistics.median(queries)) if queries else None,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> int:
+    """Print median deltas against a baseline; returns the number of regressions."""
+    regressions = 0
+    print(f"\nCompared with baseline from {baseline.get('created_at')} (tolerance {tolerance:.0%})")
+    for scale, ops in results.items():
+        previous_ops = baseline.get("results", {}).get(scale)
+        if not previous_ops:
+            print(f"  scale {scale}: not in baseline")
+            continue
+        for name, current in ops.items():
+            previous = previous_ops.get(name)
+            if not previous or not current:
+                continue
+            ratio = current["median_ms"] / previous["median_ms"] if previous["median_ms"] else 1.0
+            regressed = ratio > 1 + tolerance
+            regressions += regressed
+            print(
+                f"  {scale:>7} {name:<26} {previous['median_ms']:>9.2f}ms -> {current['median_ms']:>9.2f}ms "
+                f"({ratio - 1:+.0%}){'  REGRESSION' if regressed else ''}"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="purchase orders to generate per run")
+    parser.add_argument("--rounds", type=int, default=30, help="calls per function and scale")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON to compare medians against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed median slowdown (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    # Keep service logging out of the numbers
+    logging.getLogger().handlers = [logging.NullHandler()]
+    instrumentation.install()
+
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    results = {}
+    generation = {}
+    for scale in args.scales:
+        started = time.perf_counter()
+        datagen.generate(scale, seed=args.seed)
+        generation[str(scale)] = round(time.perf_counter() - started, 1)
+        print(f"\n-- {scale} purchase orders (generated in {generation[str(scale)]}s)")
+
+        ops = results[str(scale)] = {}
+        for op in OPERATIONS:
+            stats = ops[op.name] = run_operation(op, args.rounds, scale)
+            if stats is None:
+                print(f"  {op.name:<26} no targets")
+                continue
+            print(
+                f"  {op.name:<26} n={stats['rounds']:>3} queries={stats['queries'] or 0:>3} "
+                f"median={stats['median_ms']:>8.2f}ms p95={stats['p95_ms']:>8.2f}ms "
+                f"min={stats['min_ms']:>8.2f}ms"
+            )
+
+    report = {
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "database": engine.dialect.name,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "rounds": args.rounds,
+        "generation_seconds": generation,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
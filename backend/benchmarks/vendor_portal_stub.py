@@ -0,0 +1,346 @@
+"""
+Local stand-in for the Vendor Portal (VENDOR_PORTAL_URL).
+
+Serves GET /api/vendors/<id>: 200 with a vendor for ids 1..--vendors, 404
+above that, and the paged list GET /api/vendors?limit=&cursor=&updated_since=
+used by app.procurement.sync_vendors. Each answer is delayed by --latency
+ms; --error-rate answers a fraction of requests with 503.
+
+Usage (from backend/), pointing the app at it while developing:
+
+    python -m benchmarks.vendor_portal_stub --port 9000 --latency 200
+    VENDOR_PORTAL_URL=http://localhost:9000/api/vendors uvicorn app.main:app
+
+--check instead starts the stub on a free port and exercises
+app.procurement.services.vendor_client against it (connection reuse, cache,
+stale-while-revalidate, negative caching, circuit breakers, concurrent
+batch, bounded cache)
+and the vendor mirror sync (full and incremental sync, search, PO vendor
+names), printing each result; exits with code 1 when one of them fails.
+Without DATABASE_URL the mirror checks use a throwaway SQLite file:
+
+    python -m benchmarks.vendor_portal_stub --check
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="vendor_stub_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+import app.main  # noqa: E402,F401  (registers every model on Base.metadata)
+from app.core.db import SessionLocal, create_tables, drop_tables  # noqa: E402
+from app.procurement.models import Item, PurchaseOrder, PurchaseOrderLine  # noqa: E402
+from app.procurement.services import ProcurementService, VendorService  # noqa: E402
+from app.procurement.services.vendor_client import (  # noqa: E402
+    CircuitBreaker,
+    VendorClient,
+    VendorPortalError,
+    vendor_client,
+)
+from app.procurement.sync_vendors import sync_vendors  # noqa: E402
+
+_VENDOR_PATH = re.compile(r"^/api/vendors/(\d+)$")
+_LIST_PATH = "/api/vendors"
+# Vendor n was last changed n hours after this, unless touched since
+_BASE_UPDATED_AT = datetime(2026, 1, 1)
+
+
+class StubPortal(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int, vendors: int, latency_ms: float, error_rate: float):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.vendors = vendors
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.requests = 0
+        self.connections: Set[Tuple[str, int]] = set()
+        self.touched: Dict[int, datetime] = {}
+        self.fail_next_pages = False            # 503 for list pages after the first
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/api/vendors"
+
+    def record(self, peer: Tuple[str, int]) -> None:
+        with self._lock:
+            self.requests += 1
+            self.connections.add(peer)
+
+    def touch(self, vendor_id: int) -> None:
+        """Simulate an edit on the portal."""
+        self.touched[vendor_id] = datetime.utcnow()
+
+    def vendor(self, vendor_id: int) -> dict:
+        updated_at = self.touched.get(vendor_id, _BASE_UPDATED_AT + timedelta(hours=vendor_id))
+        return {
+            "id": vendor_id,
+            "name": f"Vendor {vendor_id}",
+            "contact": f"vendor{vendor_id}@example.com",
+            "status": "ACTIVE",
+            "updated_at": updated_at.isoformat() + "Z",
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"           # keep-alive, so reuse is observable
+    server: StubPortal
+
+    def do_GET(self):
+        self.server.record(self.client_address)
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+
+        url = urlsplit(self.path)
+        match = _VENDOR_PATH.match(url.path)
+        paging = "cursor" in parse_qs(url.query)
+        if random.random() < self.server.error_rate or (paging and self.server.fail_next_pages):
+            self._reply(503, {"detail": "Vendor portal unavailable"})
+        elif url.path == _LIST_PATH:
+            self._reply(200, self._list(parse_qs(url.query)))
+        elif not match or not 1 <= int(match.group(1)) <= self.server.vendors:
+            self._reply(404, {"detail": "Vendor not found"})
+        else:
+            self._reply(200, self.server.vendor(int(match.group(1))))
+
+    def _list(self, params: dict) -> dict:
+        limit = int(params.get("limit", ["100"])[0])
+        offset = int(params.get("cursor", ["0"])[0])
+        vendors = [self.server.vendor(vendor_id) for vendor_id in range(1, self.server.vendors + 1)]
+        if "updated_since" in params:
+            since = datetime.fromisoformat(params["updated_since"][0]).replace(tzinfo=None)
+            vendors = [v for v in vendors if datetime.fromisoformat(v["updated_at"][:-1]) > since]
+        page = vendors[offset:offset + limit]
+        more = offset + limit < len(vendors)
+        return {"items": page, "next_cursor": str(offset + limit) if more else None}
+
+    def _reply(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(vendors: int = 1000, latency_ms: float = 0, error_rate: float = 0, port: int = 0) -> StubPortal:
+    server = StubPortal(port, vendors, latency_ms, error_rate)
+    threading.Thread(target=server.serve_forever, name="vendor-stub", daemon=True).start()
+    return server
+
+
+# ---------- Checks ----------
+
+async def run_checks() -> bool:
+    stub = start_stub(vendors=100, latency_ms=50)
+    client = VendorClient(
+        base_url=stub.url,
+        timeout=1.0,
+        max_connections=10,
+        ttl_seconds=1,
+        stale_seconds=60,
+        negative_ttl_seconds=1,
+        breaker=CircuitBreaker(failure_threshold=3, reset_timeout=1.0),
+    )
+    failed = 0
+
+    def check(name: str, ok: bool, detail: str = "") -> None:
+        nonlocal failed
+        failed += not ok
+        print(f"  {'ok  ' if ok else 'FAIL'} {name}{f' ({detail})' if detail else ''}")
+
+    async def timed(coro):
+        started = time.perf_counter()
+        result = await coro
+        return result, (time.perf_counter() - started) * 1000
+
+    try:
+        vendor, ms = await timed(client.get_vendor(1))
+        check("cold lookup hits the portal", vendor.name == "Vendor 1" and stub.requests == 1, f"{ms:.0f}ms")
+
+        vendor, ms = await timed(client.get_vendor(1))
+        check("fresh lookup is served from cache", stub.requests == 1 and ms < 5, f"{ms:.2f}ms")
+
+        sequential = 5
+        for vendor_id in range(2, 2 + sequential):
+            await client.get_vendor(vendor_id)
+        check("sequential lookups reuse one connection", len(stub.connections) == 1,
+              f"{sequential + 1} requests, {len(stub.connections)} connection(s)")
+
+        before = stub.requests
+        vendors, ms = await timed(client.get_vendors(range(10, 30)))
+        check("batch of 20 fetches concurrently", len(vendors) == 20 and ms < 20 * 50 / 2,
+              f"{ms:.0f}ms for {stub.requests - before} requests at 50ms each, pool of 10")
+
+        before = stub.requests
+        results = await asyncio.gather(*(client.get_vendor(40) for _ in range(10)))
+        check("concurrent lookups of one vendor share a request",
+              stub.requests - before == 1 and all(v.id == 40 for v in results))
+
+        vendor = await client.get_vendor(500)
+        before = stub.requests
+        vendor_again = await client.get_vendor(500)
+        check("404 is negatively cached", vendor.status == "UNKNOWN" and vendor_again.status == "UNKNOWN"
+              and stub.requests == before)
+
+        stub.error_rate = 1.0
+        for _ in range(3):
+            try:
+                await client.list_vendors(100)
+            except VendorPortalError:
+                pass
+        check("failing vendor list opens only the list breaker",
+              client.list_breaker.state == CircuitBreaker.OPEN and client.breaker.state == CircuitBreaker.CLOSED)
+        stub.error_rate = 0.0
+
+        await asyncio.sleep(1.1)                # past the 1s TTL
+        before = stub.requests
+        vendor, ms = await timed(client.get_vendor(1))
+        await asyncio.sleep(0.1)                # let the background refresh land
+        check("expired entry is served stale and refreshed in the background",
+              vendor.name == "Vendor 1" and ms < 5 and stub.requests == before + 1, f"{ms:.2f}ms")
+
+        stub.error_rate = 1.0
+        client.invalidate()
+        for vendor_id in (60, 61, 62):
+            await client.get_vendor(vendor_id)
+        before = stub.requests
+        vendor, ms = await timed(client.get_vendor(63))
+        check("breaker opens after 3 failures and short-circuits to the fallback",
+              client.breaker.state == CircuitBreaker.OPEN and stub.requests == before
+              and vendor.status == "UNKNOWN", f"{ms:.2f}ms")
+
+        stub.error_rate = 0.0
+        await asyncio.sleep(1.1)                # past the 1s reset timeout
+        vendor = await client.get_vendor(64)
+        check("half-open trial closes the breaker once the portal recovers",
+              client.breaker.state == CircuitBreaker.CLOSED and vendor.name == "Vendor 64")
+
+        for ttl, vendor_ids, expected in (
+            (60, (1, 2, 3, 1, 4), [3, 1, 4]),   # 2 is the least recently used
+            (0, (1, 2, 3), []),                 # already past stale_until: dropped
+        ):
+            small = VendorClient(
+                base_url=stub.url, timeout=1.0, max_connections=2, ttl_seconds=ttl, stale_seconds=0,
+                negative_ttl_seconds=60, breaker=CircuitBreaker(3, 1.0), max_entries=3,
+            )
+            for vendor_id in vendor_ids:
+                await small.get_vendor(vendor_id)
+            await small.aclose()
+            check(f"cache of 3 after lookups {vendor_ids} with ttl {ttl}s holds {expected}",
+                  list(small._entries) == expected, str(list(small._entries)))
+    finally:
+        await client.aclose()
+        stub.shutdown()
+
+    print("Vendor mirror:")
+    failed += not await run_mirror_checks()
+    return not failed
+
+
+async def run_mirror_checks() -> bool:
+    stub = start_stub(vendors=1200)
+    vendor_client.base_url = stub.url
+    drop_tables()
+    create_tables()
+    failed = 0
+
+    def check(name: str, ok: bool, detail: str = "") -> None:
+        nonlocal failed
+        failed += not ok
+        print(f"  {'ok  ' if ok else 'FAIL'} {name}{f' ({detail})' if detail else ''}")
+
+    try:
+        before = stub.requests
+        upserted = await sync_vendors(full=True, page_size=500)
+        check("full sync pulls every vendor in pages", upserted == 1200 and stub.requests - before == 3,
+              f"{upserted} vendors, {stub.requests - before} requests")
+
+        for vendor_id in (5, 77, 900):
+            stub.touch(vendor_id)
+        upserted = await sync_vendors()
+        check("incremental sync pulls only changed vendors", upserted == 3, f"{upserted} vendors")
+
+        for vendor_id in (6, 78, 901):
+            stub.touch(vendor_id)
+        stub.fail_next_pages = True
+        try:
+            await sync_vendors(page_size=2)
+            failed_midway = False
+        except VendorPortalError:
+            failed_midway = True
+        stub.fail_next_pages = False
+        upserted = await sync_vendors(page_size=2)
+        # 3 new changes, plus the previous 3 again: they are inside the overlap
+        check("a sync that fails after its first page is repeated in full by the next one",
+              failed_midway and upserted == 6, f"{upserted} vendors")
+
+        db = SessionLocal()
+        try:
+            page = VendorService.search_vendors(db, q="vendor 11", limit=5)
+            names = [v.name for v in page["items"]]
+            check("search is served from the mirror, ordered by name",
+                  names == sorted(names) and all("Vendor 11" in n for n in names) and page["next_cursor"],
+                  ", ".join(names))
+
+            item = Item(code="STUB-1", name="Stub item", unit="NOS")
+            db.add(item)
+            db.flush()
+            for vendor_id in (11, 2000):        # 2000 is not on the portal
+                po = PurchaseOrder(po_number=f"PO-STUB-{vendor_id}", vendor_id=vendor_id)
+                po.lines = [PurchaseOrderLine(item_id=item.id, quantity=1, price=Decimal("1.00"))]
+                db.add(po)
+            db.commit()
+
+            names = {po.vendor_id: po.vendor_name for po in ProcurementService.get_purchase_orders(db)["items"]}
+            check("PO list carries vendor names from the mirror", names == {11: "Vendor 11", 2000: None},
+                  str(names))
+        finally:
+            db.close()
+    finally:
+        await vendor_client.aclose()
+        stub.shutdown()
+
+    return not failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--vendors", type=int, default=1000, help="ids 1..N exist, others are 404")
+    parser.add_argument("--latency", type=float, default=0.0, help="delay per answer in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503 answers")
+    parser.add_argument("--check", action="store_true", help="run the client checks against a private stub")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(0 if asyncio.run(run_checks()) else 1)
+
+    server = StubPortal(args.port, args.vendors, args.latency, args.error_rate)
+    print(f"Vendor portal stub on {server.url} ({args.vendors} vendors)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
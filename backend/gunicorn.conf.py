@@ -0,0 +1,37 @@
+"""
+Gunicorn settings for running the API with several uvicorn workers:
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+Prometheus metrics are collected per worker process into
+PROMETHEUS_MULTIPROC_DIR and aggregated by GET /metrics, so the directory
+is reset when the master starts and dead workers are marked on exit.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", str(multiprocessing.cpu_count() * 2 + 1)))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+accesslog = None
+
+
+def on_starting(server):
+    # Must be set before any worker imports prometheus_client
+    metrics_dir = os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR",
+        os.path.join(tempfile.gettempdir(), "prometheus_multiproc"),
+    )
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,196 @@
+"""
+Query-plan regression test for the hot filter/join paths.
+
+Migrates a throwaway database with `alembic upgrade head`, fills it with
+benchmarks.datagen, then calls the real service functions and endpoint
+handlers while recording every SELECT they run (including relationship
+loads). Each recorded statement is EXPLAINed with its own parameters and
+the test fails if any table is read with a full scan instead of an index.
+Run it after schema or query changes (from backend/):
+
+    python -m pytest tests/test_query_plans.py
+    DATABASE_URL=postgresql://.../empty_db python -m pytest tests/test_query_plans.py
+
+SQLite: a plan step "SCAN <table>" without an index is a full scan, except
+for an unfiltered first page (ORDER BY in index order + LIMIT, no sort).
+PostgreSQL: any "Seq Scan" node; enable_seqscan is switched off so small
+test tables do not hide a missing index. Point DATABASE_URL at an empty
+database: the test migrates and fills it.
+"""
+import asyncio
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="plan_check_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'plans.db')}"
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.sql.expression import ClauseElement, Executable  # noqa: E402
+
+from app.core.db import AsyncSessionLocal, Base, SessionLocal, async_engine, drop_tables, engine  # noqa: E402
+from app.procurement.services.po_line_ledger import POLineLedger  # noqa: E402
+from app.procurement.services.procurement_service import ProcurementService  # noqa: E402
+from app.quality.services.gate_pass_service import GatePassService  # noqa: E402
+from app.quality.services.inspection_service import InspectionService  # noqa: E402
+from app.quality.services.material_receipt_service import MaterialReceiptService  # noqa: E402
+from app.store.routers import store as store_router  # noqa: E402
+from app.store.services.material_dispatch_service import MaterialDispatchService  # noqa: E402
+from app.store.services.store_service import StoreService  # noqa: E402
+from benchmarks import datagen  # noqa: E402
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Enough POs for every pipeline stage (po_id % 10) and several pages per list
+POS = 60
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN of a captured statement, compiled and bound like the original."""
+
+    inherit_cache = False
+
+    def __init__(self, statement, prefix: str):
+        self.statement = statement
+        self.prefix = prefix
+
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kw):
+    return f"{element.prefix} {compiler.process(element.statement, **kw)}"
+
+
+def _pages(list_fn, **filters):
+    """First and second page, so both keyset query shapes are planned."""
+    def run(db):
+        page = list_fn(db, limit=5, **filters)
+        assert page["next_cursor"], "need more than one page"
+        list_fn(db, limit=5, cursor=page["next_cursor"], **filters)
+    return run
+
+
+def _inventory_by_store(db):
+    async def run():
+        async with AsyncSessionLocal() as async_db:
+            await store_router.get_inventory(store_id=1, bin_id=None, item_id=None, db=async_db)
+        await async_engine.dispose()
+    asyncio.run(run())
+
+
+# (name, call) — ids follow benchmarks.datagen: every document N belongs to
+# PO N, and po_id % 10 picks how far it went (1: dispatched, 3: dispatch
+# draft, 4: gate pass waiting for the store)
+HOT_PATHS = [
+    ("PO list", _pages(ProcurementService.get_purchase_orders)),
+    ("PO detail", lambda db: ProcurementService.get_purchase_order(db, 1)),
+    ("PO pending quantities", lambda db: ProcurementService.get_po_items_with_pending_qty(db, 1)),
+    ("PO tracking summary", lambda db: ProcurementService.get_po_tracking_summary(db, 1)),
+    ("PO line ledger recompute", lambda db: POLineLedger.compute(db, [1, 3, 4])),
+    ("material receipt list", _pages(MaterialReceiptService.list_material_receipts)),
+    ("material receipt detail", lambda db: MaterialReceiptService.get_material_receipt(db, 1)),
+    ("inspection detail", lambda db: InspectionService.get_inspection(db, 1)),
+    ("gate pass list by status", _pages(GatePassService.list_gate_passes, store_status="RECEIVED")),
+    ("store: pending gate passes", lambda db: store_router.get_pending_gate_passes(store_id=1, db=db)),
+    ("store: received gate passes", lambda db: store_router.get_received_gate_passes(store_id=1, db=db)),
+    ("store: receive gate pass", lambda db: StoreService.receive_gate_pass(db, 4)),
+    ("store: inventory by store", _inventory_by_store),
+    ("store: PO pending items", lambda db: StoreService.get_po_pending_items(db, 1)),
+    ("dispatch list", _pages(MaterialDispatchService.get_material_dispatches)),
+    ("dispatch detail", lambda db: MaterialDispatchService.get_material_dispatch(db, 1)),
+    ("issue dispatch", lambda db: MaterialDispatchService.issue_material_dispatch(db, 3)),
+]
+
+
+@pytest.fixture(scope="module")
+def migrated_db():
+    # Importing app.main ran create_all; the schema under test is the migrated one
+    drop_tables()
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    command.upgrade(config, "head")
+    datagen.populate(POS)
+    yield
+    engine.dispose()
+
+
+def capture_selects(call):
+    """Run call(db) and return the (statement, parameters) of every SELECT it ran."""
+    captured = []
+
+    def record(state):
+        if state.is_select:
+            captured.append((state.statement, dict(state.parameters or {})))
+
+    event.listen(Session, "do_orm_execute", record)
+    db = SessionLocal()
+    try:
+        call(db)
+    finally:
+        event.remove(Session, "do_orm_execute", record)
+        db.close()
+    return captured
+
+
+def sqlite_full_scans(db, statement, parameters):
+    details = [row[-1] for row in db.execute(Explain(statement, "EXPLAIN QUERY PLAN"), parameters)]
+    sql = str(statement.compile(dialect=engine.dialect)).upper()
+    first_page = " LIMIT " in sql and " WHERE " not in sql and not any("TEMP B-TREE" in d for d in details)
+
+    scans = [
+        d for d in details
+        if d.startswith("SCAN ") and "USING" not in d
+        and d.split()[1] in Base.metadata.tables and not first_page
+    ]
+    return scans, details
+
+
+def postgres_full_scans(db, statement, parameters):
+    db.connection().exec_driver_sql("SET LOCAL enable_seqscan = off")
+    plan = db.execute(Explain(statement, "EXPLAIN (FORMAT JSON)"), parameters).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    details, scans = [], []
+
+    def walk(node):
+        label = f"{node['Node Type']} {node.get('Relation Name', '')} {node.get('Index Name', '')}".strip()
+        details.append(label)
+        if node["Node Type"] == "Seq Scan":
+            scans.append(label)
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return scans, details
+
+
+@pytest.mark.parametrize("name, call", HOT_PATHS, ids=[name for name, _ in HOT_PATHS])
+def test_hot_path_uses_indexes(migrated_db, name, call):
+    check = {"sqlite": sqlite_full_scans, "postgresql": postgres_full_scans}.get(engine.dialect.name)
+    if check is None:
+        pytest.skip(f"no plan check for {engine.dialect.name}")
+
+    captured = capture_selects(call)
+    assert captured, f"{name} ran no SELECT"
+
+    problems = []
+    db = SessionLocal()
+    try:
+        for statement, parameters in captured:
+            scans, details = check(db, statement, parameters)
+            if scans:
+                sql = str(statement.compile(dialect=engine.dialect))
+                problems.append(f"{', '.join(scans)}\n  {' '.join(sql.split())[:300]}\n  plan: {details}")
+    finally:
+        db.rollback()
+        db.close()
+
+    assert not problems, f"{name}: full scans in\n" + "\n".join(problems)
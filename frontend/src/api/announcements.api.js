@@ -1,12 +1,15 @@
-import api from './api';
+import api, { getAllPages } from './api';
 
 /* =======================
    FETCH (NON-DELETED)
 ======================= */
 
+// Events are paginated by id: fetch all pages, then order by event date (newest first)
 export const fetchEvents = async () => {
-  const res = await api.get('/api/v1/announcements/events/');
-  return res.data;
+  const res = await getAllPages('/api/v1/announcements/events/', { limit: 500 });
+  return res.data.sort((a, b) =>
+    (b.event_date || '').localeCompare(a.event_date || '')
+  );
 };
 
 export const fetchTrainings = async () => {
@@ -13,4 +13,18 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// GET every page of a cursor-paginated list (follows X-Next-Cursor)
+export const getAllPages = async (url, params = {}) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const response = await api.get(url, {
+      params: cursor ? { ...params, cursor } : params,
+    });
+    items.push(...response.data);
+    cursor = response.headers["x-next-cursor"];
+  } while (cursor);
+  return { data: items };
+};
+
 export default api;
@@ -1,8 +1,8 @@
-import api from "./api";
+import api, { getAllPages } from "./api";
 
-// Get all contractors
+// Get all contractors (the list is paginated: fetch all pages)
 export const fetchContractors = async () => {
-  const res = await api.get("/api/v1/contractors/");
+  const res = await getAllPages("/api/v1/contractors/", { limit: 500 });
   return res.data;
 };
 
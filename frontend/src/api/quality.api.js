@@ -1,12 +1,13 @@
-import api from "./api";
+import api, { getAllPages } from "./api";
 
 /* Material Receipt */
 
 export const createMaterialReceipt = (data) =>
   api.post("/api/v1/quality/material-receipt/", data);
 
+// The list is paginated (100 per page by default): fetch all pages
 export const getMaterialReceipts = () =>
-  api.get("/api/v1/quality/material-receipt/");
+  getAllPages("/api/v1/quality/material-receipt/", { limit: 500 });
 
 export const getMaterialReceiptDetails = (id) =>
   api.get(`/api/v1/quality/material-receipt/${id}`);
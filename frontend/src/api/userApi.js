@@ -1,4 +1,4 @@
-import api from './api';
+import api, { getAllPages } from './api';
 
 const USER_API = '/api/v1/users';
 
@@ -21,11 +21,9 @@ export const userApi = {
     return response.data;
   },
 
-  // Get all users
-  getAllUsers: async (skip = 0, limit = 100) => {
-    const response = await api.get(USER_API, {
-      params: { skip, limit },
-    });
+  // Get all users (the list is paginated: fetch all pages)
+  getAllUsers: async () => {
+    const response = await getAllPages(USER_API, { limit: 1000 });
     return response.data;
   },
 
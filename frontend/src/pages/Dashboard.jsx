@@ -53,7 +53,7 @@ export default function Dashboard() {
 
       // Fetch total employees
       try {
-        const employeesData = await userApi.getAllUsers(0, 1000);
+        const employeesData = await userApi.getAllUsers();
         const employees = Array.isArray(employeesData) ? employeesData : employeesData.data || employeesData.items || [];
         const totalEmployeeCount = employees.length || 0;
         setTotalEmployees(totalEmployeeCount);